@@ -0,0 +1,115 @@
+"""
+Repaint benchmark of a Scene with many Edges.
+
+Renders the whole Scene into an image several times and prints the time per frame and how many times the edge
+paths were calculated, then times hit tests at random points of the Scene, like hovering does. With ``--uncached``
+the edge paths are invalidated before every frame, which is how the edges behaved before they cached their
+geometry::
+
+    python examples/example_benchmark/edge_repaint.py --edges 10000 --frames 20
+    python examples/example_benchmark/edge_repaint.py --edges 10000 --frames 20 --uncached
+
+With ``--batched`` the idle edges are drawn by edge layers instead of one item per edge, see
+:mod:`nodeeditor.node_graphics_edge_layer`.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))  # noqa
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+from qtpy.QtGui import QImage, QPainter
+from qtpy.QtCore import Qt, QPointF
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge, EDGE_TYPE_BEZIER
+from nodeeditor.node_graphics_edge import QDMGraphicsEdge
+
+
+SOCKETS_PER_NODE = 50
+
+
+def createScene(edge_count: int) -> Scene:
+    """Create two columns of `Nodes`, every output of the left column is connected to inputs of the right column"""
+    scene = Scene()
+    node_count = max(1, -(-edge_count // SOCKETS_PER_NODE))
+    sources = [Node(scene, "Source %d" % i, inputs=[], outputs=[1]) for i in range(node_count)]
+    targets = [Node(scene, "Target %d" % i, inputs=[1] * SOCKETS_PER_NODE, outputs=[]) for i in range(node_count)]
+    for i, node in enumerate(sources):
+        node.setPos(-400, i * 150)
+    for i, node in enumerate(targets):
+        node.setPos(400, i * 150 * 0.5)
+
+    for i in range(edge_count):
+        target = targets[i // SOCKETS_PER_NODE]
+        Edge(scene, sources[i % node_count].outputs[0], target.inputs[i % SOCKETS_PER_NODE], edge_type=EDGE_TYPE_BEZIER)
+    return scene
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark repainting of a Scene with many Edges")
+    parser.add_argument("--edges", type=int, default=10000, help="number of edges")
+    parser.add_argument("--frames", type=int, default=10, help="number of rendered frames")
+    parser.add_argument("--size", type=int, default=1024, help="width and height of the rendered image")
+    parser.add_argument("--hit-tests", type=int, default=1000, help="number of hit tests at random points")
+    parser.add_argument("--batched", action="store_true", help="draw the edges in batched edge layers")
+    parser.add_argument("--uncached", action="store_true", help="recalculate the edge paths on every frame")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+
+    start = time.perf_counter()
+    scene = createScene(args.edges)
+    print("created %d edges in %.2fs" % (len(scene.edges), time.perf_counter() - start))
+    if args.batched:
+        start = time.perf_counter()
+        scene.grScene.setEdgeBatching(True)
+        print("batched edges in %.2fs" % (time.perf_counter() - start))
+
+    # count path calculations
+    calculations = [0]
+    calcPath = QDMGraphicsEdge.calcPath
+
+    def countedCalcPath(self):
+        calculations[0] += 1
+        return calcPath(self)
+    QDMGraphicsEdge.calcPath = countedCalcPath
+
+    image = QImage(args.size, args.size, QImage.Format.Format_ARGB32_Premultiplied)
+    source = scene.grScene.itemsBoundingRect()
+    times = []
+    for _ in range(args.frames):
+        if args.uncached:
+            for edge in scene.edges:
+                edge.grEdge.invalidatePath()
+        calculations[0] = 0
+        image.fill(Qt.GlobalColor.transparent)
+        start = time.perf_counter()
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        scene.grScene.render(painter, source=source)
+        painter.end()
+        times.append(time.perf_counter() - start)
+        print("frame: %7.1fms, %d path calculations" % (times[-1] * 1000, calculations[0]))
+
+    steady = times[1:] or times
+    print("average frame after the first one: %.1fms" % (sum(steady) / len(steady) * 1000))
+
+    random.seed(0)
+    points = [QPointF(random.uniform(source.left(), source.right()), random.uniform(source.top(), source.bottom()))
+              for _ in range(args.hit_tests)]
+    hits = 0
+    start = time.perf_counter()
+    for point in points:
+        hits += len(scene.grScene.items(point))
+    duration = time.perf_counter() - start
+    print("hit tests: %.3fms per point, %.1f items per point" % (
+        duration / max(1, len(points)) * 1000, hits / max(1, len(points))))
+
+
+if __name__ == '__main__':
+    main()
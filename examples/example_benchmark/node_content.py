@@ -0,0 +1,86 @@
+"""
+Construction benchmark of a Scene with many Nodes showing a label.
+
+Creates the Nodes and prints the construction time and how much the memory of the process grew. By default the
+label is painted by :class:`~nodeeditor.node_painted_content.QDMPaintedContent`, with ``--widgets`` every Node
+gets a ``QLabel`` in a :class:`~nodeeditor.node_content_widget.QDMNodeContentWidget` embedded by a proxy::
+
+    python examples/example_benchmark/node_content.py --nodes 10000
+    python examples/example_benchmark/node_content.py --nodes 10000 --widgets
+
+Run each variant in its own process, the memory is measured for the whole process.
+"""
+import os
+import sys
+import time
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))  # noqa
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication, QLabel, QVBoxLayout
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_content_widget import QDMNodeContentWidget
+from nodeeditor.node_painted_content import QDMPaintedContent
+
+
+COLUMNS = 100
+
+
+class LabelContentWidget(QDMNodeContentWidget):
+    def initUI(self):
+        self.layout = QVBoxLayout()
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self.layout)
+        self.lbl = QLabel("42")
+        self.layout.addWidget(self.lbl)
+
+
+class LabelPaintedContent(QDMPaintedContent):
+    def initUI(self):
+        self.setText("42")
+
+
+class WidgetNode(Node):
+    NodeContent_class = LabelContentWidget
+
+
+class PaintedNode(Node):
+    NodeContent_class = LabelPaintedContent
+
+
+def getMemory() -> int:
+    """Return resident memory of this process in bytes, or 0 if it is not known"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark construction of many Nodes with widget or painted content")
+    parser.add_argument("--nodes", type=int, default=10000, help="number of nodes")
+    parser.add_argument("--widgets", action="store_true", help="use a content widget instead of painted content")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    node_class = WidgetNode if args.widgets else PaintedNode
+    scene = Scene()
+    memory = getMemory()
+    start = time.perf_counter()
+    for i in range(args.nodes):
+        node = node_class(scene, "Node %d" % i, inputs=[1], outputs=[1])
+        node.setPos((i % COLUMNS) * 250, (i // COLUMNS) * 300)
+    elapsed = time.perf_counter() - start
+    grown = getMemory() - memory
+
+    print("%d nodes, %s content: construction %.2fs (%.3fms per node), memory %s" % (
+        len(scene.nodes), "widget" if args.widgets else "painted", elapsed, elapsed / args.nodes * 1000,
+        "+%.1fMB (%.1fkB per node)" % (grown / 2**20, grown / args.nodes / 1024) if memory else "unknown"))
+
+
+if __name__ == '__main__':
+    main()
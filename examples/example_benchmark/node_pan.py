@@ -0,0 +1,86 @@
+"""
+Pan benchmark of a Scene with many Nodes.
+
+Shows the Scene in a view, scrolls it by a few pixels per frame and prints the time per repaint of the viewport.
+Without ``--uncached`` the Nodes and their content are painted into a ``DeviceCoordinateCache``, so panning only
+blits the cached pixmaps, see :func:`~nodeeditor.node_graphics_scene.QDMGraphicsScene.setNodeCaching`. Without
+``--live-content`` idle content widgets are painted from snapshots and culled outside of the view, see
+:func:`~nodeeditor.node_graphics_scene.QDMGraphicsScene.setContentSnapshots`::
+
+    python examples/example_benchmark/node_pan.py --nodes 400 --frames 50
+    python examples/example_benchmark/node_pan.py --nodes 400 --frames 50 --uncached
+    python examples/example_benchmark/node_pan.py --nodes 400 --frames 50 --uncached --live-content
+"""
+import os
+import sys
+import time
+import argparse
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))  # noqa
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge, EDGE_TYPE_BEZIER
+from nodeeditor.node_graphics_view import QDMGraphicsView
+
+
+COLUMNS = 20
+
+
+def createScene(node_count: int) -> Scene:
+    """Create a grid of `Nodes`, each connected to the `Node` on its left"""
+    scene = Scene()
+    nodes = []
+    for i in range(node_count):
+        node = Node(scene, "Node %d" % i, inputs=[1, 1], outputs=[1])
+        node.setPos((i % COLUMNS) * 250, (i // COLUMNS) * 300)
+        if i % COLUMNS:
+            Edge(scene, nodes[-1].outputs[0], node.inputs[0], edge_type=EDGE_TYPE_BEZIER)
+        nodes.append(node)
+    return scene
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark panning of a view with many Nodes")
+    parser.add_argument("--nodes", type=int, default=400, help="number of nodes")
+    parser.add_argument("--frames", type=int, default=50, help="number of panned frames")
+    parser.add_argument("--size", type=int, default=1600, help="width and height of the view")
+    parser.add_argument("--step", type=int, default=10, help="pixels scrolled per frame")
+    parser.add_argument("--uncached", action="store_true", help="repaint the nodes on every frame")
+    parser.add_argument("--live-content", action="store_true",
+                        help="keep all content widgets live instead of painting snapshots of them")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    scene = createScene(args.nodes)
+    scene.grScene.setNodeCaching(not args.uncached)
+    scene.grScene.setContentSnapshots(not args.live_content)
+
+    view = QDMGraphicsView(scene.grScene)
+    view.resize(args.size, args.size)
+    view.show()
+    view.centerOn(scene.grScene.itemsBoundingRect().center())
+    app.processEvents()
+    view.viewport().repaint()
+
+    scrollbar = view.horizontalScrollBar()
+    times = []
+    for frame in range(args.frames):
+        # pan back and forth, so the view stays over the nodes
+        direction = 1 if (frame // 20) % 2 == 0 else -1
+        scrollbar.setValue(scrollbar.value() + direction * args.step)
+        start = time.perf_counter()
+        view.viewport().repaint()
+        times.append(time.perf_counter() - start)
+
+    steady = times[1:] or times
+    print("%d nodes, %s, %s content: average pan frame %.2fms, slowest %.2fms" % (
+        len(scene.nodes), "uncached" if args.uncached else "cached", "live" if args.live_content else "snapshot",
+        sum(steady) / len(steady) * 1000, max(steady) * 1000))
+
+
+if __name__ == '__main__':
+    main()
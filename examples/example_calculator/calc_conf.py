@@ -1,3 +1,6 @@
+from nodeeditor.node_node import Node
+
+
 LISTBOX_MIMETYPE = "application/x-item"
 
 OP_NODE_INPUT = 1
@@ -7,6 +10,10 @@ OP_NODE_SUB = 4
 OP_NODE_MUL = 5
 OP_NODE_DIV = 6
 OP_NODE_CHECK = 7
+OP_NODE_ARRAY_INPUT = 8
+OP_NODE_ARRAY_ADD = 9
+OP_NODE_ARRAY_SUB = 10
+OP_NODE_ARRAY_MUL = 11
 
 
 CALC_NODES = {
@@ -46,5 +53,12 @@ def get_class_from_opcode(op_code):
     return CALC_NODES[op_code]
 
 
+def get_class_from_data(data):
+    """Node class selector for the calculator Scene, usable also for headless loading"""
+    if 'op_code' not in data:
+        return Node
+    return get_class_from_opcode(data['op_code'])
+
+
 # import all nodes and register them
 from examples.example_calculator.nodes import *  # noqa
@@ -1,16 +1,21 @@
-from qtpy.QtGui import QImage, QPixmap
+from qtpy.QtGui import QImage, QPixmap, QFont, QColor
 from qtpy.QtCore import QRectF
-from qtpy.QtWidgets import QLabel
 
 from nodeeditor.node_node import Node
 from nodeeditor.node_content_widget import QDMNodeContentWidget
 from nodeeditor.node_graphics_node import QDMGraphicsNode
 
-from nodeeditor.node_icon_content_widget import QDMNodeIconContentWidget
 from nodeeditor.node_icon_graphics_node import QDMIconGraphicsNode
+from nodeeditor.node_painted_content import QDMPaintedContent
 
 from nodeeditor.node_socket import LEFT_CENTER, RIGHT_CENTER
+from nodeeditor.node_cancellation import EvaluationInterrupted
 from nodeeditor.utils import dumpException
+from nodeeditor.utils_no_qt import readOnlyView
+
+
+# evaluation tracing, use scene.evaluator.profiler to measure the evaluation
+DEBUG = False
 
 
 class CalcGraphicsNode(QDMIconGraphicsNode):
@@ -29,6 +34,12 @@ class CalcGraphicsNode(QDMIconGraphicsNode):
         self.icons = QImage(
             "examples/example_calculator/icons/status_icons.png")
 
+    def getPaintMargins(self):
+        margins = super().getPaintMargins()
+        # the status icon overlaps the bottom edge by half of its height
+        margins.setBottom(max(margins.bottom(), 12.0))
+        return margins
+
     def paint(self, painter, QStyleOptionGraphicsItem, widget=None):
         super().paint(painter, QStyleOptionGraphicsItem, widget)
 
@@ -57,10 +68,14 @@ class CalcGraphicsNode(QDMIconGraphicsNode):
         )
 
 
-class CalcContent(QDMNodeIconContentWidget):
+class CalcContent(QDMPaintedContent):
     def initUI(self):
-        lbl = QLabel(self.node.content_label, self)
-        lbl.setObjectName(self.node.content_label_objname)
+        # painted, so the operation symbol needs no QLabel in every node
+        self.color = QColor("#373737")
+        font = QFont()
+        font.setPixelSize(72)
+        self.setFont(font)
+        self.setText(self.node.content_label)
 
 
 class CalcNode(Node):
@@ -111,11 +126,59 @@ class CalcNode(Node):
                 return value
         return val
 
+    def getOutputValue(self, index=0):
+        """Return the value of output `index` unwrapped from the nested lists and dict records. Arrays and
+        buffers are returned as read-only views, so they are passed to other nodes by reference"""
+        if index >= len(self.values):
+            return None
+        value = self.values[index]
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get('value', None)
+        return readOnlyView(value)
+
+    def getInputValue(self, index=0):
+        """Evaluate the node connected to input `index` and return the value of the connected output"""
+        node, socket_index = self.getInputWithSocketIndex(index)
+        if node is None or node.eval() is None or node.isInvalid():
+            return None
+        return node.getOutputValue(socket_index)
+
+    def setOutputValues(self, val):
+        """Store the result of `evalOperation` to `self.values`"""
+        if isinstance(val, list):
+            if len(val) == len(self.outputs):
+                # Wrap each value in a list
+                self.values = [[v] for v in val]
+            else:
+                # If lengths don't match, fill with None
+                self.values = [[None]] * len(self.outputs)
+        else:
+            # Single value case - all outputs get the same value
+            self.values = [[val]] * len(self.outputs)
+
     def evalOperation(self, input1, input2):
         return 123
 
+    def getCompiledOperation(self):
+        def operation(input1, input2):
+            val = self.evalOperation(input1, input2)
+            if isinstance(val, list):
+                # multiple outputs, unwrap the values from dicts (see Div)
+                val = [v.get('value') if isinstance(v, dict) else v for v in val]
+            if not self.outputs:
+                # one value, like Node.getCompiledOperation returns for nodes without outputs
+                return [val]
+            # the same values as setOutputValues stores
+            if isinstance(val, list):
+                return val if len(val) == len(self.outputs) else [None] * len(self.outputs)
+            return [val] * len(self.outputs)
+        return operation
+
     def evalImplementation(self):
-        print(" _> evaluating %s" % self.__class__.__name__)
+        if DEBUG:
+            print(" _> evaluating %s" % self.__class__.__name__)
         i1 = self.getInput(0)
         i2 = self.getInput(1)
 
@@ -125,34 +188,18 @@ class CalcNode(Node):
             self.grNode.setToolTip("Connect all inputs")
             return [None] * len(self.outputs)
 
-        val1 = i1.eval()
-        val2 = i2.eval()
+        input1 = self.getInputValue(0)
+        input2 = self.getInputValue(1)
 
         # Handle None values from input evaluations
-        if val1 is None or val2 is None:
+        if input1 is None or input2 is None:
             self.markInvalid()
             self.markDescendantsDirty()
             self.grNode.setToolTip("Invalid input values")
             return [None] * len(self.outputs)
 
-        # Extract first value from lists if necessary
-        input1 = val1[0] if isinstance(val1, list) else val1
-        input2 = val2[0] if isinstance(val2, list) else val2
-
         try:
-            val = self.evalOperation(input1, input2)
-
-            # Handle multiple outputs
-            if isinstance(val, list):
-                if len(val) == len(self.outputs):
-                    # Wrap each value in a list
-                    self.values = [[v] for v in val]
-                else:
-                    # If lengths don't match, fill with None
-                    self.values = [[None]] * len(self.outputs)
-            else:
-                # Single value case - all outputs get the same value
-                self.values = [[val]] * len(self.outputs)
+            self.setOutputValues(self.evalOperation(input1, input2))
 
             self.markDirty(False)
             self.markInvalid(False)
@@ -163,6 +210,9 @@ class CalcNode(Node):
 
             return self.values
 
+        except EvaluationInterrupted:
+            # cancelled or timed out, the evaluator decides what happens with the node
+            raise
         except Exception as e:
             self.markInvalid()
             self.grNode.setToolTip(str(e))
@@ -171,13 +221,16 @@ class CalcNode(Node):
 
     def eval(self):
         if not self.isDirty() and not self.isInvalid():
-            print(" _> returning cached %s value:" %
-                  self.__class__.__name__, self.values)
+            if DEBUG:
+                print(" _> returning cached %s value:" %
+                      self.__class__.__name__, self.values)
             return self.values
 
         try:
             val = self.evalImplementation()
             return val
+        except EvaluationInterrupted:
+            raise
         except ValueError as e:
             self.markInvalid()
             self.grNode.setToolTip(str(e))
@@ -188,9 +241,17 @@ class CalcNode(Node):
             dumpException(e)
 
     def onInputChanged(self, socket=None):
-        print("%s::__onInputChanged" % self.__class__.__name__)
+        if DEBUG:
+            print("%s::__onInputChanged" % self.__class__.__name__)
         self.markDirty()
-        self.eval()
+        self.scene.evaluator.evaluate([self])
+
+    def serializeValues(self):
+        return self.values
+
+    def deserializeValues(self, values):
+        self.values = values
+        return True
 
     def serialize(self):
         res = super().serialize()
@@ -199,6 +260,7 @@ class CalcNode(Node):
 
     def deserialize(self, data, hashmap={}, restore_id=True):
         res = super().deserialize(data, hashmap, restore_id)
-        print("Deserialized CalcNode '%s'" %
-              self.__class__.__name__, "res:", res)
+        if DEBUG:
+            print("Deserialized CalcNode '%s'" %
+                  self.__class__.__name__, "res:", res)
         return res
@@ -2,7 +2,7 @@ from qtpy.QtGui import QIcon, QPixmap
 from qtpy.QtCore import QDataStream, QIODevice, Qt
 from qtpy.QtWidgets import QAction, QGraphicsProxyWidget, QMenu
 
-from examples.example_calculator.calc_conf import CALC_NODES, get_class_from_opcode, LISTBOX_MIMETYPE
+from examples.example_calculator.calc_conf import CALC_NODES, get_class_from_opcode, get_class_from_data, LISTBOX_MIMETYPE
 from nodeeditor.node_editor_widget import NodeEditorWidget
 from nodeeditor.node_edge import EDGE_TYPE_DIRECT, EDGE_TYPE_BEZIER, EDGE_TYPE_SQUARE
 from nodeeditor.node_graphics_view import MODE_EDGE_DRAG
@@ -31,6 +31,9 @@ class CalculatorSubWindow(NodeEditorWidget):
         self.scene.addDragEnterListener(self.onDragEnter)
         self.scene.addDropListener(self.onDrop)
         self.scene.setNodeClassSelector(self.getNodeClassFromData)
+        self.scene.evaluator.persist_results = True
+        # evaluate only what the Output nodes need, dangling branches stay dirty
+        self.scene.evaluator.lazy = True
 
         self.scene.grScene.socketClicked.connect(self.onSocketClicked)
 
@@ -62,17 +65,17 @@ class CalculatorSubWindow(NodeEditorWidget):
         # print(f"Socket data: {socket_data}")
 
     def getNodeClassFromData(self, data):
-        if 'op_code' not in data:
-            return Node
-        return get_class_from_opcode(data['op_code'])
+        return get_class_from_data(data)
 
     def doEvalOutputs(self):
-        # eval all output nodes
-        for node in self.scene.nodes:
-            if node.__class__.__name__ == "CalcNode_Output":
-                node.eval()
+        # eval all dirty and invalid nodes, values restored from the results file are kept
+        self.scene.evaluator.evaluate()
 
     def onHistoryRestored(self):
+        # the graph could have changed in any way, so re-evaluate everything.
+        # Unchanged nodes are restored from the evaluator's result cache
+        for node in self.scene.nodes:
+            node.markDirty()
         self.doEvalOutputs()
 
     def fileLoad(self, filename):
@@ -172,15 +175,6 @@ class CalculatorSubWindow(NodeEditorWidget):
     def handleNodeContextMenu(self, event):
         if DEBUG_CONTEXT:
             print("CONTEXT: NODE")
-        context_menu = QMenu(self)
-        markDirtyAct = context_menu.addAction("Mark Dirty")
-        markDirtyDescendantsAct = context_menu.addAction(
-            "Mark Descendant Dirty")
-        markInvalidAct = context_menu.addAction("Mark Invalid")
-        unmarkInvalidAct = context_menu.addAction("Unmark Invalid")
-        evalAct = context_menu.addAction("Eval")
-        action = context_menu.exec_(self.mapToGlobal(event.pos()))
-
         selected = None
         item = self.scene.getItemAt(event.pos())
         if type(item) == QGraphicsProxyWidget:
@@ -191,6 +185,18 @@ class CalculatorSubWindow(NodeEditorWidget):
         if hasattr(item, 'socket'):
             selected = item.socket.node
 
+        context_menu = QMenu(self)
+        markDirtyAct = context_menu.addAction("Mark Dirty")
+        markDirtyDescendantsAct = context_menu.addAction(
+            "Mark Descendant Dirty")
+        markInvalidAct = context_menu.addAction("Mark Invalid")
+        unmarkInvalidAct = context_menu.addAction("Unmark Invalid")
+        evalAct = context_menu.addAction("Eval")
+        context_menu.addSeparator()
+        freezeAct = context_menu.addAction(
+            "Unfreeze" if selected and selected.isFrozen() else "Freeze")
+        action = context_menu.exec_(self.mapToGlobal(event.pos()))
+
         if DEBUG_CONTEXT:
             print("got item:", selected)
         if selected and action == markDirtyAct:
@@ -203,8 +209,19 @@ class CalculatorSubWindow(NodeEditorWidget):
             selected.markInvalid(False)
         if selected and action == evalAct:
             val = selected.eval()
+            # children are not pushed in lazy mode, let the evaluator refresh what the outputs need
+            self.scene.evaluator.evaluate()
             if DEBUG_CONTEXT:
                 print("EVALUATED:", val)
+        if selected and action == freezeAct:
+            if selected.isFrozen():
+                selected.setFrozen(False)
+                # catch up with the changes the node missed while frozen
+                self.scene.evaluator.evaluate([selected])
+                self.scene.history.storeHistory("Node unfrozen", setModified=True)
+            else:
+                selected.setFrozen()
+                self.scene.history.storeHistory("Node frozen", setModified=True)
 
     def handleEdgeContextMenu(self, event):
         if DEBUG_CONTEXT:
@@ -214,10 +214,44 @@ class CalculatorWindow(NodeEditorWindow):
         gridAct = self.viewMenu.addAction("Show &Grid")
         gridAct.setCheckable(True)
 
+        # option to draw idle edges in batched layers, for very large graphs
+        batchedEdgesAct = self.viewMenu.addAction("&Batched Edges")
+        batchedEdgesAct.setCheckable(True)
+
+        # option to keep painted nodes in a pixmap cache, so panning does not repaint them
+        cachedNodesAct = self.viewMenu.addAction("&Cached Nodes")
+        cachedNodesAct.setCheckable(True)
+
+        # option to highlight identical subgraphs, which are evaluated only once
+        identicalAct = self.viewMenu.addAction("Highlight &Identical Subgraphs")
+        identicalAct.setCheckable(True)
+
+        # evaluation profiling
+        self.viewMenu.addSeparator()
+        heatmapAct = self.viewMenu.addAction("Evaluation &Heatmap")
+        heatmapAct.setCheckable(True)
+        exportProfileAct = self.viewMenu.addAction("&Export Evaluation Profile...")
+
         active: 'NodeEditorWidget' = self.getCurrentNodeEditorWidget()
         if active:
             gridAct.setChecked(active.scene.grScene.showGrid)
             gridAct.triggered.connect(self.onShowGrid)
+            batchedEdgesAct.setChecked(active.scene.grScene.isEdgeBatching())
+            batchedEdgesAct.triggered.connect(self.onBatchedEdges)
+            cachedNodesAct.setChecked(active.scene.grScene.node_caching)
+            cachedNodesAct.triggered.connect(self.onCachedNodes)
+            identicalAct.setChecked(active.scene.evaluator.highlight_identical)
+            identicalAct.triggered.connect(self.onHighlightIdentical)
+            heatmapAct.setChecked(active.scene.evaluator.profiler.show_heatmap)
+            heatmapAct.triggered.connect(self.onEvaluationHeatmap)
+            exportProfileAct.setEnabled(bool(active.scene.evaluator.profiler.runs))
+            exportProfileAct.triggered.connect(self.onExportProfile)
+        else:
+            batchedEdgesAct.setEnabled(False)
+            cachedNodesAct.setEnabled(False)
+            identicalAct.setEnabled(False)
+            heatmapAct.setEnabled(False)
+            exportProfileAct.setEnabled(False)
         # gridAct.setChecked(self.scene.grScene.showGrid)
         # gridAct.triggered.connect(self.onShowGrid)
 
@@ -233,6 +267,68 @@ class CalculatorWindow(NodeEditorWindow):
             if window and window.widget():
                 window.widget().scene.grScene.showGrid = checked
 
+    def onBatchedEdges(self, checked: bool) -> None:
+        """
+        Toggle batched rendering of the edges in the active subwindow
+
+        Args:
+            checked: True to draw idle edges in layers, False to draw every edge as its own item
+        """
+        active = self.getCurrentNodeEditorWidget()
+        if active:
+            active.scene.grScene.setEdgeBatching(checked)
+
+    def onCachedNodes(self, checked: bool) -> None:
+        """
+        Toggle cached painting of the nodes in the active subwindow
+
+        Args:
+            checked: True to paint nodes into a pixmap cache, False to repaint them with every frame
+        """
+        active = self.getCurrentNodeEditorWidget()
+        if active:
+            active.scene.grScene.setNodeCaching(checked)
+
+    def onHighlightIdentical(self, checked: bool) -> None:
+        """
+        Toggle the highlight of identical subgraphs in the active subwindow
+
+        Args:
+            checked: True to highlight identical subgraphs, False to clear the highlight
+        """
+        active = self.getCurrentNodeEditorWidget()
+        if active:
+            active.scene.evaluator.highlight_identical = checked
+            active.scene.evaluator.updateIdenticalHighlight()
+
+    def onEvaluationHeatmap(self, checked: bool) -> None:
+        """
+        Start profiling the evaluation of the active subwindow and tint its nodes by their evaluation time
+
+        Args:
+            checked: True to profile and show the heatmap, False to hide it
+        """
+        active = self.getCurrentNodeEditorWidget()
+        if active:
+            active.scene.evaluator.profiler.enabled = checked
+            active.scene.evaluator.profiler.show_heatmap = checked
+
+    def onExportProfile(self) -> None:
+        """Save the recorded evaluation runs of the active subwindow as JSON or Chrome trace"""
+        active = self.getCurrentNodeEditorWidget()
+        if not active:
+            return
+        fname, filter = QFileDialog.getSaveFileName(
+            self, 'Export evaluation profile', self.getFileDialogDirectory(),
+            'Chrome trace (*.trace.json);;Node statistics (*.json)')
+        if not fname:
+            return
+        if filter.startswith('Chrome'):
+            active.scene.evaluator.profiler.saveChromeTrace(fname)
+        else:
+            active.scene.evaluator.profiler.saveJson(fname)
+        self.statusBar().showMessage("Evaluation profile exported to %s" % fname, 5000)
+
     def updateWindowMenu(self):
         self.windowMenu.clear()
 
@@ -0,0 +1,100 @@
+from qtpy.QtWidgets import QLineEdit
+from qtpy.QtCore import Qt
+from examples.example_calculator.calc_conf import register_node_now, OP_NODE_ARRAY_INPUT, OP_NODE_ARRAY_ADD, \
+    OP_NODE_ARRAY_SUB, OP_NODE_ARRAY_MUL
+from examples.example_calculator.calc_node_base import CalcNode
+from examples.example_calculator.nodes.input import CalcInputContent, CalcNode_Input
+from nodeeditor.utils_no_qt import readOnlyView
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def parse_array(text):
+    """Parse ``start:stop[:step]`` range or comma separated list of numbers into read-only array"""
+    if ':' in text:
+        return readOnlyView(np.arange(*[float(part) if '.' in part else int(part) for part in text.split(':')]))
+    return readOnlyView(np.array([float(item) if '.' in item else int(item) for item in text.split(',')]))
+
+
+class CalcArrayInputContent(CalcInputContent):
+    def initUI(self):
+        self.edit = QLineEdit("0:10", self)
+        self.edit.setAlignment(Qt.AlignRight)
+        self.edit.setObjectName(self.node.content_label_objname)
+
+
+class CalcNode_ArrayInput(CalcNode_Input):
+    icon = "icons/in.png"
+    op_code = OP_NODE_ARRAY_INPUT
+    op_title = "Array Input"
+    content_label_objname = "calc_node_input"
+    invalid_value_tooltip = "Invalid array, use start:stop[:step] or comma separated numbers"
+
+    NodeContent_class = CalcArrayInputContent
+
+    def parseValue(self, text):
+        return parse_array(text)
+
+    def deserializeValues(self, values):
+        self.values = [readOnlyView(np.asarray(value)) for value in values]
+        return True
+
+
+class CalcArrayNode(CalcNode):
+    """Arithmetic on whole arrays. Inputs are taken by reference as read-only views and results are stored
+    as read-only arrays, so no node can modify values shared with other nodes"""
+    array_safe = True
+
+    def setOutputValues(self, val):
+        self.values = [readOnlyView(val)] * len(self.outputs)
+
+    def deserializeValues(self, values):
+        self.values = [readOnlyView(np.asarray(value)) for value in values]
+        return True
+
+
+class CalcNode_ArrayAdd(CalcArrayNode):
+    icon = "icons/add.png"
+    op_code = OP_NODE_ARRAY_ADD
+    op_title = "Array Add"
+    content_label = "+"
+    compile_expression = "{0} + {1}"
+    content_label_objname = "calc_node_bg"
+
+    def evalOperation(self, input1, input2):
+        return np.add(np.asarray(input1), np.asarray(input2))
+
+
+class CalcNode_ArraySub(CalcArrayNode):
+    icon = "icons/sub.png"
+    op_code = OP_NODE_ARRAY_SUB
+    op_title = "Array Substract"
+    content_label = "-"
+    compile_expression = "{0} - {1}"
+    content_label_objname = "calc_node_bg"
+
+    def evalOperation(self, input1, input2):
+        return np.subtract(np.asarray(input1), np.asarray(input2))
+
+
+class CalcNode_ArrayMul(CalcArrayNode):
+    icon = "icons/mul.png"
+    op_code = OP_NODE_ARRAY_MUL
+    op_title = "Array Multiply"
+    content_label = "*"
+    compile_expression = "{0} * {1}"
+    content_label_objname = "calc_node_mul"
+
+    def evalOperation(self, input1, input2):
+        return np.multiply(np.asarray(input1), np.asarray(input2))
+
+
+# array nodes need NumPy, register them only when it is available
+if np is not None:
+    register_node_now(OP_NODE_ARRAY_INPUT, CalcNode_ArrayInput)
+    register_node_now(OP_NODE_ARRAY_ADD, CalcNode_ArrayAdd)
+    register_node_now(OP_NODE_ARRAY_SUB, CalcNode_ArraySub)
+    register_node_now(OP_NODE_ARRAY_MUL, CalcNode_ArrayMul)
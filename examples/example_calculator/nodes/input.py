@@ -1,7 +1,7 @@
 from qtpy.QtWidgets import QLineEdit
 from qtpy.QtCore import Qt
 from examples.example_calculator.calc_conf import register_node, OP_NODE_INPUT
-from examples.example_calculator.calc_node_base import CalcNode, CalcGraphicsNode
+from examples.example_calculator.calc_node_base import CalcNode
 from nodeeditor.node_content_widget import QDMNodeContentWidget
 from nodeeditor.utils import dumpException
 
@@ -34,20 +34,37 @@ class CalcNode_Input(CalcNode):
     op_code = OP_NODE_INPUT
     op_title = "Input"
     content_label_objname = "calc_node_input"
+    invalid_value_tooltip = "Invalid input value"
+
+    NodeContent_class = CalcInputContent
 
     def __init__(self, scene):
         super().__init__(scene, inputs=[], outputs=[3], output_text=["o"])
         self.eval()
 
     def initInnerClasses(self):
-        self.content = CalcInputContent(self)
-        self.grNode = CalcGraphicsNode(self)
-        self.content.edit.textChanged.connect(self.onInputChanged)
+        super().initInnerClasses()
+        self.content.edit.textChanged.connect(self.onContentChanged)
+
+    def parseValue(self, text):
+        """Return the value of the text typed into the content, raise ``ValueError`` if it is not valid"""
+        return int(text)
+
+    def setValue(self, value):
+        self.content.edit.setText(str(value))
+        return True
+
+    def getCompiledOperation(self):
+        try:
+            value = self.parseValue(self.content.edit.text())
+        except ValueError:
+            return None
+        return lambda: [value]
 
     def evalImplementation(self):
         u_value = self.content.edit.text()
         try:
-            s_value = int(u_value)
+            s_value = self.parseValue(u_value)
             self.values = [s_value]  # Store value in list format
             self.markDirty(False)
             self.markInvalid(False)
@@ -58,5 +75,5 @@ class CalcNode_Input(CalcNode):
             return self.values
         except ValueError:
             self.markInvalid(True)
-            self.grNode.setToolTip("Invalid input value")
+            self.grNode.setToolTip(self.invalid_value_tooltip)
             return [None]
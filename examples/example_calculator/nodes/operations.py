@@ -8,6 +8,8 @@ class CalcNode_Add(CalcNode):
     op_code = OP_NODE_ADD
     op_title = "Add"
     content_label = "+"
+    compile_expression = "{0} + {1}"
+    array_safe = True
     content_label_objname = "calc_node_bg"
 
     def evalOperation(self, input1, input2):
@@ -20,6 +22,8 @@ class CalcNode_Sub(CalcNode):
     op_code = OP_NODE_SUB
     op_title = "Substract"
     content_label = "-"
+    compile_expression = "{0} - {1}"
+    array_safe = True
     content_label_objname = "calc_node_bg"
 
     def evalOperation(self, input1, input2):
@@ -32,10 +36,11 @@ class CalcNode_Mul(CalcNode):
     op_code = OP_NODE_MUL
     op_title = "Multiply"
     content_label = "*"
+    compile_expression = "{0} * {1}"
+    array_safe = True
     content_label_objname = "calc_node_mul"
 
     def evalOperation(self, input1, input2):
-        print('foo')
         return input1 * input2
 
 
@@ -46,6 +51,7 @@ class CalcNode_Div(CalcNode):
     op_title = "Divide and Mod"
     content_label = "/"
     content_label_objname = "calc_node_div"
+    array_safe = True
 
     def __init__(self, scene):
         # Two inputs, two outputs (quotient and remainder)
@@ -67,6 +73,16 @@ class CalcNode_Div(CalcNode):
             {'value': input1 % input2, 'type': 'remainder'}
         ]
 
+    def getCompiledOperation(self):
+        # works with NumPy arrays too
+        def operation(input1, input2):
+            zero = input2 == 0
+            # NumPy only warns and returns 0, raise for any zero divisor like evalOperation does
+            if zero.any() if hasattr(zero, 'any') else zero:
+                raise ValueError("Division by zero!")
+            return [input1 // input2, input1 % input2]
+        return operation
+
     # def evalOperation(self, input1, input2):
     #     return input1 / input2
 
@@ -1,15 +1,18 @@
-from qtpy.QtWidgets import QLabel
-from qtpy.QtCore import Qt
+from qtpy.QtGui import QFont
+from qtpy.QtCore import Qt, QMarginsF
 from examples.example_calculator.calc_conf import register_node, OP_NODE_OUTPUT
 from examples.example_calculator.calc_node_base import CalcNode, CalcGraphicsNode
-from nodeeditor.node_content_widget import QDMNodeContentWidget
+from nodeeditor.node_painted_content import QDMPaintedContent
 
 
-class CalcOutputContent(QDMNodeContentWidget):
+class CalcOutputContent(QDMPaintedContent):
     def initUI(self):
-        self.lbl = QLabel("42", self)
-        self.lbl.setAlignment(Qt.AlignLeft)
-        self.lbl.setObjectName(self.node.content_label_objname)
+        self.alignment = Qt.AlignLeft | Qt.AlignTop
+        self.margins = QMarginsF(18, 5, 0, 0)
+        font = QFont()
+        font.setPixelSize(28)
+        self.setFont(font)
+        self.setText("42")
 
 
 @register_node(OP_NODE_OUTPUT)
@@ -18,6 +21,9 @@ class CalcNode_Output(CalcNode):
     op_code = OP_NODE_OUTPUT
     op_title = "Output"
     content_label_objname = "calc_node_output"
+    eval_sink = True
+    compile_expression = "{0}"
+    array_safe = True
 
     def __init__(self, scene):
         super().__init__(scene, inputs=[1], outputs=[])
@@ -52,12 +58,18 @@ class CalcNode_Output(CalcNode):
             self.grNode.setToolTip("")
 
         # Update display
-        self.content.lbl.setText(str(display_val))
+        self.values = [display_val]
+        self.content.setText(str(display_val))
         self.markInvalid(False)
         self.markDirty(False)
 
         return display_val
 
+    def deserializeValues(self, values):
+        res = super().deserializeValues(values)
+        self.content.setText(str(values[0]))
+        return res
+
     # def evalImplementation(self):
     #     input_node = self.getInput(0)
     #     if not input_node:
@@ -77,7 +89,7 @@ class CalcNode_Output(CalcNode):
     #     display_val = self.handleInputValue(val, socket_index)
 
     #     # Update display
-    #     self.content.lbl.setText(str(display_val))
+    #     self.content.setText(str(display_val))
     #     self.markInvalid(False)
     #     self.markDirty(False)
     #     self.grNode.setToolTip("")
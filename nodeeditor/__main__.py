@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+Command line interface of the node editor::
+
+    python -m nodeeditor run graph.json --set 1234=5 --out results.json --jobs 4
+    python -m nodeeditor sweep graph.json --set 1234=0:100 --out results.csv --jobs 4
+
+See :mod:`nodeeditor.node_headless` and :mod:`nodeeditor.node_sweep`
+"""
+import sys
+
+from typing import List, Optional
+
+
+COMMANDS = {
+    'run': "nodeeditor.node_headless",
+    'sweep': "nodeeditor.node_sweep",
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print("usage: python -m nodeeditor {%s} ..." % ",".join(COMMANDS), file=sys.stderr)
+        return 2
+
+    from nodeeditor.utils_no_qt import importObject
+    result = importObject(COMMANDS[argv[0]] + ":main")(argv[1:])
+    return result or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
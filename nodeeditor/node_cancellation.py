@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the cancellation token of an evaluation run and exceptions used to interrupt long running
+`Node` evaluations.
+
+Python can't stop a running function from outside, so the cancellation is cooperative: long running `Nodes` call
+:func:`~nodeeditor.node_node.Node.checkCancelled` from time to time, which raises an exception when the run was
+cancelled or when the time budget of the `Node` or of the whole run is exhausted.
+"""
+import time
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from nodeeditor.node_node import Node
+
+
+class EvaluationInterrupted(Exception):
+    """Base class for exceptions interrupting `Node` evaluation"""
+    pass
+
+
+class EvaluationCancelled(EvaluationInterrupted):
+    """Raised when the evaluation run was cancelled, i.e. because the inputs changed again"""
+    pass
+
+
+class EvaluationTimeout(EvaluationInterrupted):
+    """Raised when a `Node` or the whole evaluation run exceeded its time budget"""
+    pass
+
+
+class CancellationToken():
+    """Cancellation state and time budgets of one evaluation run"""
+
+    def __init__(self, nodes: Iterable['Node'] = (), timeout: Optional[float] = None, serial: int = 0) -> None:
+        """
+        :param nodes: `Nodes` evaluated in the run
+        :param timeout: time budget of the whole run in seconds. ``None`` means no limit
+        :param serial: increasing number of the run, newer runs have higher numbers
+
+        :Instance Attributes:
+
+        - **nodes** - set of `Nodes` evaluated in the run
+        - **timeout** - time budget of the whole run in seconds
+        - **deadline** - ``time.monotonic()`` value at which the run times out or ``None``
+        - **is_cancelled** - ``True`` if the run was cancelled
+        - **running** - `Nodes` of the run being evaluated right now
+        - **serial** - increasing number of the run
+        """
+        self.nodes: Set['Node'] = set(nodes)
+        self.timeout = timeout
+        self.serial = serial
+        self.deadline: Optional[float] = None if timeout is None else time.monotonic() + timeout
+        self.is_cancelled: bool = False
+        self.running: Set['Node'] = set()
+
+        self._node_deadlines: Dict['Node', float] = {}
+        self._futures: List[Any] = []
+
+    def cancel(self) -> None:
+        """Cancel the run. Running `Nodes` are interrupted at their next :func:`check`, pending asynchronous
+        evaluations are cancelled"""
+        self.is_cancelled = True
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+
+    def addFuture(self, future: Any) -> None:
+        """Register ``asyncio`` future of the run, which is cancelled together with the run"""
+        self._futures.append(future)
+
+    def isRunTimedOut(self) -> bool:
+        """``True`` if the time budget of the whole run is exhausted"""
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def startNode(self, node: 'Node') -> None:
+        """Start measuring the time budget of `node`. See :attr:`~nodeeditor.node_node.Node.eval_timeout`"""
+        self.running.add(node)
+        if node.eval_timeout is not None:
+            self._node_deadlines[node] = time.monotonic() + node.eval_timeout
+
+    def finishNode(self, node: 'Node') -> None:
+        """Stop measuring the time budget of `node`"""
+        self.running.discard(node)
+        self._node_deadlines.pop(node, None)
+
+    def check(self, node: Optional['Node'] = None) -> None:
+        """Raise an exception if the run was cancelled or `node` or the run exceeded its time budget
+
+        :param node: evaluated `Node` whose budget is checked
+        :raises EvaluationCancelled: if the run was cancelled
+        :raises EvaluationTimeout: if the time budget is exhausted
+        """
+        if self.is_cancelled:
+            raise EvaluationCancelled("Evaluation was cancelled")
+        if self.isRunTimedOut():
+            raise EvaluationTimeout("Evaluation run timed out after %gs" % self.timeout)
+        deadline = self._node_deadlines.get(node)
+        if deadline is not None and time.monotonic() > deadline:
+            raise EvaluationTimeout("Evaluation timed out after %gs" % node.eval_timeout)
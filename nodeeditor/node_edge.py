@@ -94,6 +94,7 @@ class Edge(Serializable):
         # addEdge to the Socket class
         if self.start_socket is not None:
             self.start_socket.addEdge(self)
+        self.invalidatePath()
 
     @property
     def end_socket(self):
@@ -117,6 +118,13 @@ class Edge(Serializable):
         # addEdge to the Socket class
         if self.end_socket is not None:
             self.end_socket.addEdge(self)
+        self.invalidatePath()
+
+    def invalidatePath(self) -> None:
+        """Let the `Graphics Edge` recalculate its cached path, the shape of some edge types depends on the sockets"""
+        grEdge = getattr(self, 'grEdge', None)
+        if grEdge is not None:
+            grEdge.invalidatePath()
 
     @property
     def edge_type(self):
@@ -188,7 +196,7 @@ class Edge(Serializable):
         :return: Instance of `grEdge` class representing the Graphics Edge in the grScene
         """
         self.grEdge = self.getGraphicsEdgeClass()(self)
-        self.scene.grScene.addItem(self.grEdge)
+        self.scene.grScene.addEdgeItem(self.grEdge)
         if self.start_socket is not None:
             self.updatePositions()
         return self.grEdge
@@ -267,7 +275,7 @@ class Edge(Serializable):
 
         if DEBUG:
             print(" - remove grEdge", self.grEdge)
-        self.scene.grScene.removeItem(self.grEdge)
+        self.scene.grScene.removeEdgeItem(self.grEdge)
         if DEBUG:
             print("   grEdge:", self.grEdge)
 
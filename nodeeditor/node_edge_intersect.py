@@ -133,7 +133,7 @@ class EdgeIntersect:
             return
 
         rect = self.hotZoneRect(self.draggedNode)
-        grItems = self.grScene.items(rect)
+        grItems = self.grScene.getItemsInRect(rect)
 
         for grEdge in self.hoveredList:
             if isinstance(grEdge, QDMGraphicsEdge):
@@ -162,7 +162,7 @@ class EdgeIntersect:
             return None
 
         # returns the first edge that intersects with the dropped node, ignores the rest
-        grItems = self.grScene.items(node_box)
+        grItems = self.grScene.getItemsInRect(node_box)
         for grItem in grItems:
             if hasattr(grItem, 'edge') and not self.draggedNode.hasConnectedEdge(grItem.edge):
                 return grItem.edge
@@ -56,6 +56,7 @@ class NodeEditorWidget(QWidget):
         # create graphics view
         self.view = self.__class__.GraphicsView_class(self.scene.grScene, self)
         self.layout.addWidget(self.view)
+        self.view.addViewportChangedListener(self.scene.evaluator.onViewportChanged)
 
     def isModified(self) -> bool:
         """Has the `Scene` been modified?
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the compiler turning a part of the `Scene` into a single Python function.
+
+Evaluating `Nodes` one by one means walking the `Nodes`, `Sockets` and `Edges` for every evaluation, which
+dominates the cost of small arithmetic `Nodes`. The compiler emits one function with the `Node` operations called
+in topological order (or inlined, when the `Node` class provides :attr:`~nodeeditor.node_node.Node.compile_expression`),
+so the graph is walked only once, when the function is compiled.
+
+Compiled functions can also evaluate the graph over whole NumPy arrays (batch mode), processing the input
+columns in chunks of bounded size.
+"""
+from collections import OrderedDict
+from nodeeditor.node_serializable import Serializable
+from nodeeditor.node_result_cache import hashValue
+
+from types import CodeType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from nodeeditor.node_scene import Scene
+    from nodeeditor.node_node import Node
+
+
+DEBUG = False
+
+#: name of the generated function
+COMPILED_FUNCTION_NAME = "compiled_graph"
+#: default number of rows evaluated at once in batch mode
+DEFAULT_BATCH_CHUNK_SIZE = 65536
+
+
+class NotCompilable(Exception):
+    """Raised when the requested part of the `Scene` can't be compiled"""
+    pass
+
+
+def applyRows(operation: Callable, outputs_count: int, *columns: Any) -> list:
+    """Apply `operation` which is not array-safe to each row of `columns` separately. Used in batch mode for
+    `Nodes` without :attr:`~nodeeditor.node_node.Node.array_safe`
+
+    :param operation: operation returned by :func:`~nodeeditor.node_node.Node.getCompiledOperation`
+    :param outputs_count: number of values returned by `operation`
+    :param columns: input values. Arrays are iterated, other values are passed to each row as they are
+    :return: list with one array per value returned by `operation`
+    """
+    lengths = [len(column) for column in columns if isinstance(column, np.ndarray) and column.ndim > 0]
+    if not lengths:
+        return operation(*columns)
+    rows = [operation(*[column[i] if isinstance(column, np.ndarray) and column.ndim > 0 else column
+                        for column in columns])
+            for i in range(min(lengths))]
+    return [np.array([row[k] for row in rows]) for k in range(outputs_count)]
+
+
+class CompiledGraph():
+    """Python function compiled from a part of the `Scene`. Calling it evaluates the graph"""
+
+    def __init__(self, function: Callable, source: str, arguments: List['Node'], results: List['Node'], key: str,
+                 code: Optional[CodeType] = None) -> None:
+        """
+        :Instance Attributes:
+
+        - **function** - the compiled function taking one positional argument per argument `Node`
+        - **source** - generated Python source code, useful for debugging
+        - **code** - compiled code object defining the function, shared by all structurally identical subgraphs
+        - **arguments** - `Nodes` whose values are passed as arguments
+        - **results** - `Nodes` whose values are returned
+        - **key** - hash of the graph structure and `Node` parameters the function was compiled from
+        """
+        self.function = function
+        self.source = source
+        self.code = code
+        self.arguments = arguments
+        self.results = results
+        self.key = key
+
+    def __call__(self, *args: Any) -> List[Any]:
+        """Evaluate the compiled graph
+
+        :param args: values of the argument `Nodes`
+        :return: list with the value of each result `Node`. A tuple of values if the `Node` has more outputs
+        """
+        return self.function(*args)
+
+
+class GraphCompiler():
+    """Compiles `Nodes` of the :class:`~nodeeditor.node_scene.Scene` into :class:`CompiledGraph` functions"""
+
+    def __init__(self, scene: 'Scene', max_cached: int = 32) -> None:
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+        :param max_cached: how many compiled functions to keep
+        :type max_cached: ``int``
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        - **max_cached** - how many compiled functions to keep. The least recently used ones are dropped
+        """
+        self.scene = scene
+        self.max_cached = max_cached
+
+        # compiled code and source for each structure key, see getStructureKey
+        self._compiled: 'OrderedDict[str, Tuple[CodeType, str]]' = OrderedDict()
+
+    def clear(self) -> None:
+        """Forget all compiled functions"""
+        self._compiled.clear()
+
+    def getSubgraph(self, results: Iterable['Node'], arguments: Iterable['Node'] = ()) -> List['Node']:
+        """Return `results` and all `Nodes` they depend on in topological order. The walk upstream stops
+        at `arguments`
+
+        :param results: `Nodes` whose values we want
+        :param arguments: `Nodes` whose values will be provided by the caller
+        :return: topologically sorted list of :class:`~nodeeditor.node_node.Node`
+        """
+        stop = set(arguments)
+        visited = set()
+        stack = list(results)
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            if node not in stop:
+                stack.extend(node.getParentNodes())
+        return self.scene.evaluator.getTopologicalOrder(visited)
+
+    def getStructureKey(self, order: List['Node'], arguments: List['Node'], results: List['Node'], batch: bool = False) -> str:
+        """Compute the hash of the structure of the subgraph and parameters of its `Nodes`. A compiled function
+        can be reused as long as the key does not change
+
+        :param order: topologically sorted `Nodes` of the subgraph
+        :param arguments: argument `Nodes`
+        :param results: result `Nodes`
+        :param batch: ``True`` for functions compiled for batch mode
+        :return: hexadecimal digest
+        :rtype: ``str``
+        """
+        index = {node: i for i, node in enumerate(order)}
+        structure = []
+        for node in order:
+            content = node.content.serialize() if isinstance(node.content, Serializable) else {}
+            inputs = []
+            for socket in node.inputs:
+                parent, other_socket = self.getConnection(socket)
+                inputs.append(None if parent is None else (index.get(parent), other_socket.index))
+            structure.append((node.__class__.__module__, node.__class__.__qualname__, node.compile_expression,
+                              len(node.outputs), content, inputs))
+        return hashValue((structure, [index[node] for node in arguments], [index[node] for node in results], batch))
+
+    def getConnection(self, socket) -> tuple:
+        """Return the `Node` and its output `Socket` connected to input `socket` or ``(None, None)``"""
+        for edge in socket.edges:
+            other_socket = edge.getOtherSocket(socket)
+            if other_socket is not None:
+                return other_socket.node, other_socket
+        return None, None
+
+    def compile(self, results: Iterable['Node'], arguments: Iterable['Node'] = (), batch: bool = False) -> CompiledGraph:
+        """Compile `results` and all `Nodes` they depend on into a single function. The generated code is cached
+        and compiled again only when the structure of the subgraph or parameters of its `Nodes` change. Each call
+        returns a new function bound to the operations of the given `Nodes`, so structurally identical subgraphs
+        (i.e. re-created by undo) share the code, but never the `Nodes`
+
+        :param results: `Nodes` whose values the function returns
+        :param arguments: `Nodes` whose values are passed to the function as positional arguments. The value is
+            used for all outputs of the `Node`
+        :param batch: ``True`` to compile the function for NumPy arrays. Operations of `Nodes` which are not
+            :attr:`~nodeeditor.node_node.Node.array_safe` are then applied to each row separately
+        :return: the compiled function
+        :rtype: :class:`CompiledGraph`
+        :raises NotCompilable: if some `Node` does not provide a compiled operation or the subgraph contains a cycle
+        """
+        results = list(results)
+        arguments = list(arguments)
+        order = self.getSubgraph(results, arguments)
+        key = self.getStructureKey(order, arguments, results, batch)
+
+        if key in self._compiled:
+            self._compiled.move_to_end(key)
+            code, source = self._compiled[key]
+            return self.bindCode(code, source, order, arguments, results, key)
+
+        compiled = self.compileSubgraph(order, arguments, results, key, batch)
+        self._compiled[key] = (compiled.code, compiled.source)
+        while len(self._compiled) > self.max_cached:
+            self._compiled.popitem(last=False)
+        return compiled
+
+    def compileSubgraph(self, order: List['Node'], arguments: List['Node'], results: List['Node'], key: str,
+                        batch: bool = False) -> CompiledGraph:
+        """Generate the source code of the function for topologically sorted `order` and compile it
+
+        :return: the compiled function
+        :rtype: :class:`CompiledGraph`
+        :raises NotCompilable: if some `Node` can't be compiled
+        """
+        variables: Dict['Node', List[str]] = {}
+        row_operations: List[str] = []
+        lines = ["def %s(%s):" % (COMPILED_FUNCTION_NAME, ", ".join("a%d" % i for i in range(len(arguments))))]
+
+        for i, node in enumerate(order):
+            names = ["n%d_%d" % (i, k) for k in range(max(1, len(node.outputs)))]
+
+            if node in arguments:
+                lines.append("    %s = a%d" % (" = ".join(names), arguments.index(node)))
+                variables[node] = names
+                continue
+
+            inputs = []
+            for socket in node.inputs:
+                parent, other_socket = self.getConnection(socket)
+                if parent is None:
+                    inputs.append("None")
+                elif parent not in variables:
+                    raise NotCompilable("%s is part of a cycle" % node)
+                else:
+                    inputs.append(variables[parent][min(other_socket.index, len(variables[parent]) - 1)])
+
+            rowwise = batch and not node.array_safe
+            if node.compile_expression is not None and not rowwise:
+                lines.append("    %s = (%s)" % (" = ".join(names), node.compile_expression.format(*inputs)))
+            else:
+                if node.compile_expression is not None:
+                    # expression which can't handle arrays, turn it into an operation applied to each row
+                    params = ["x%d" % k for k in range(len(inputs))]
+                    row_operations.append("op%d = lambda %s: [%s] * %d" % (
+                        i, ", ".join(params), node.compile_expression.format(*params), len(names)))
+                if rowwise:
+                    lines.append("    %s, = applyRows(op%d, %d, %s)" % (", ".join(names), i, len(names), ", ".join(inputs)))
+                else:
+                    lines.append("    %s, = op%d(%s)" % (", ".join(names), i, ", ".join(inputs)))
+            variables[node] = names
+
+        returned = [variables[node][0] if len(variables[node]) == 1 else "(%s)" % ", ".join(variables[node])
+                    for node in results]
+        lines.append("    return [%s]" % ", ".join(returned))
+        source = "\n".join(row_operations + lines) + "\n"
+
+        if DEBUG:
+            print("GraphCompiler: compiled\n" + source)
+
+        code = compile(source, "<%s %s>" % (COMPILED_FUNCTION_NAME, key[:8]), "exec")
+        return self.bindCode(code, source, order, arguments, results, key)
+
+    def bindCode(self, code: CodeType, source: str, order: List['Node'], arguments: List['Node'],
+                 results: List['Node'], key: str) -> CompiledGraph:
+        """Create the function defined by compiled `code` calling the operations of the `Nodes` in `order`.
+        See :func:`~nodeeditor.node_node.Node.getCompiledOperation`
+
+        :return: the compiled function
+        :rtype: :class:`CompiledGraph`
+        :raises NotCompilable: if some `Node` does not provide a compiled operation anymore
+        """
+        namespace: Dict[str, Any] = {'applyRows': applyRows}
+        for i, node in enumerate(order):
+            if node in arguments or node.compile_expression is not None:
+                continue
+            operation = node.getCompiledOperation()
+            if operation is None:
+                raise NotCompilable("%s does not provide a compiled operation" % node)
+            namespace["op%d" % i] = operation
+        exec(code, namespace)
+        return CompiledGraph(namespace[COMPILED_FUNCTION_NAME], source, arguments, results, key, code)
+
+    def iterBatches(self, results: Iterable['Node'], columns: Dict['Node', Any],
+                    chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE) -> Iterator[List[Any]]:
+        """Evaluate `results` over whole columns of input values, `chunk_size` rows at once. Only one chunk of
+        intermediate values is in memory at a time, so the columns can be i.e. memory mapped files
+
+        :param results: `Nodes` whose values we want
+        :param columns: mapping of argument `Nodes` to sequences of their values. All need to have the same length
+        :param chunk_size: maximum number of rows evaluated at once
+        :return: generator yielding for each chunk a list with one array per result `Node` (a tuple of arrays
+            for `Nodes` with more outputs)
+        :raises ImportError: if NumPy is not installed
+        :raises NotCompilable: if some `Node` can't be compiled
+        """
+        if np is None:
+            raise ImportError("NumPy is required for batch evaluation")
+
+        arguments = list(columns)
+        arrays = [np.asarray(columns[node]) for node in arguments]
+        lengths = {len(array) for array in arrays}
+        if len(lengths) > 1:
+            raise ValueError("All columns need to have the same length")
+        length = lengths.pop() if lengths else 1
+
+        compiled = self.compile(results, arguments, batch=True)
+        for start in range(0, length, chunk_size):
+            chunk_length = min(chunk_size, length - start)
+            values = compiled(*[array[start:start + chunk_size] for array in arrays])
+            yield [tuple(self.toColumn(item, chunk_length) for item in value) if isinstance(value, tuple)
+                   else self.toColumn(value, chunk_length) for value in values]
+
+    def evaluateBatch(self, results: Iterable['Node'], columns: Dict['Node', Any],
+                      chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE) -> List[Any]:
+        """Evaluate `results` over whole columns of input values and return whole result columns.
+        See :func:`iterBatches`
+
+        :return: list with one array per result `Node` (a tuple of arrays for `Nodes` with more outputs)
+        """
+        chunks = list(self.iterBatches(results, columns, chunk_size))
+        if len(chunks) == 1:
+            return chunks[0]
+        return [tuple(np.concatenate(parts) for parts in zip(*values)) if isinstance(values[0], tuple)
+                else np.concatenate(values) for values in zip(*chunks)]
+
+    def toColumn(self, value: Any, length: int) -> Any:
+        """Return `value` as an array of `length` rows. Constant values are broadcast without copying"""
+        value = np.asarray(value)
+        if value.ndim == 0:
+            return np.broadcast_to(value, (length,))
+        return value
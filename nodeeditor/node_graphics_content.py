@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the snapshot rendering of the `Node` content widgets.
+
+Content widgets are embedded into the ``QGraphicsScene`` by ``QGraphicsProxyWidget``, which is one of the most
+expensive items a ``QGraphicsScene`` can hold. When snapshots are enabled with
+:func:`~nodeeditor.node_graphics_scene.QDMGraphicsScene.setContentSnapshots`, the proxy of an idle `Node` is hidden
+and the `Graphics Node` paints a pixmap snapshot of its content instead. The live proxy is shown again while the
+`Node` is hovered or its content has the keyboard focus, so the widgets can be used as usual.
+
+Content of `Nodes` outside of all views is culled: its proxy stays hidden and the snapshot is dropped until the
+`Node` scrolls into view again.
+
+Hidden widgets do not report their repaints, so the snapshot is taken again when the content changes its value
+(see :func:`~nodeeditor.node_node.Node.onContentChanged`), when the `Node` is deserialized, marked `Dirty` or
+`Invalid`, or when :func:`ContentSnapshot.invalidate` is called by the `Node` itself.
+"""
+from qtpy.QtCore import QRectF
+from qtpy.QtGui import QPixmap
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from nodeeditor.node_graphics_node import QDMGraphicsNode
+
+
+DEBUG = False
+
+
+class ContentSnapshot():
+    """Class deciding whether the content of a `Graphics Node` is shown by its live proxy or by a snapshot"""
+
+    def __init__(self, grNode: 'QDMGraphicsNode') -> None:
+        """
+        :param grNode: `Graphics Node` owning the content
+        :type grNode: :class:`~nodeeditor.node_graphics_node.QDMGraphicsNode`
+
+        :Instance Attributes:
+
+            - **grNode** - `Graphics Node` owning the content
+            - **live** - ``True`` while the `Node` is hovered or its content has the focus
+            - **culled** - ``True`` if the `Node` is outside of all views
+            - **pixmap** - snapshot of the content, ``None`` when it has to be taken again
+        """
+        self.grNode = grNode
+        self.live: bool = False
+        self.culled: bool = False
+        self.pixmap: Optional[QPixmap] = None
+
+    @property
+    def proxy(self):
+        """``QGraphicsProxyWidget`` of the content or ``None``"""
+        return self.grNode.grContent
+
+    def isEnabled(self) -> bool:
+        """Are snapshots enabled in the `Scene`? See
+        :func:`~nodeeditor.node_graphics_scene.QDMGraphicsScene.setContentSnapshots`"""
+        return self.grNode.node.scene.grScene.content_snapshots
+
+    def isProxyVisible(self) -> bool:
+        """Should the live proxy be visible?"""
+        if not self.grNode._details_visible or self.culled:
+            return False
+        return self.live or not self.isEnabled()
+
+    def updateProxy(self) -> None:
+        """Show or hide the proxy according to the level of detail, culling and the live state"""
+        if self.proxy is None:
+            return
+        visible = self.isProxyVisible()
+        if visible != self.proxy.isVisible():
+            if DEBUG:
+                print("ContentSnapshot:", self.grNode.node, "live" if visible else "snapshot")
+            self.proxy.setVisible(visible)
+            self.grNode.update()
+
+    def setLive(self, value: bool) -> None:
+        """Show the live proxy while the `Node` is hovered or its content has the focus. A `Node` whose content has
+        the focus stays live until it loses the focus
+
+        :param value: ``True`` to show the live proxy
+        :type value: ``bool``
+        """
+        if not value and self.proxy is not None and self.proxy.hasFocus():
+            return
+        if value == self.live:
+            return
+        if not value and self.proxy is not None and self.proxy.isVisible():
+            # the content could have been edited, take the snapshot while the widget is still visible
+            self.pixmap = self.grab()
+        self.live = value
+        self.updateProxy()
+
+    def setCulled(self, value: bool) -> None:
+        """Hide the content of the `Node` outside of all views and drop its snapshot
+
+        :param value: ``True`` if the `Node` is not visible in any view
+        :type value: ``bool``
+        """
+        if value and self.live:
+            # live content is being used, i.e. it has the focus
+            return
+        if value == self.culled:
+            return
+        self.culled = value
+        if value:
+            self.pixmap = None
+        self.updateProxy()
+
+    def invalidate(self) -> None:
+        """Take the snapshot again when the `Node` is painted next time. Call it when the content changed while it
+        was not live"""
+        if self.pixmap is not None:
+            self.pixmap = None
+            self.grNode.update()
+
+    def grab(self) -> Optional[QPixmap]:
+        """Return new snapshot of the content widget"""
+        content = self.grNode.content
+        if content is None:
+            return None
+        return content.grab()
+
+    def getRect(self) -> QRectF:
+        """Return rectangle of the content in the `Graphics Node` coordinates"""
+        return self.proxy.geometry()
+
+    def paint(self, painter) -> None:
+        """Paint the snapshot in place of the hidden proxy. Called only when the content is painted at the level of
+        detail of the painter"""
+        if self.proxy is None or self.proxy.isVisible():
+            return
+        pixmap = self.pixmap
+        if pixmap is None:
+            pixmap = self.grab()
+            if not self.culled:
+                # culled content is painted only when the Scene is rendered outside of the views, do not keep it
+                self.pixmap = pixmap
+        if pixmap is not None:
+            painter.drawPixmap(self.getRect(), pixmap, QRectF(pixmap.rect()))
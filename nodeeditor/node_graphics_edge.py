@@ -3,7 +3,7 @@
 A module containing the Graphics representation of an Edge
 """
 from qtpy.QtWidgets import QGraphicsPathItem, QWidget, QGraphicsItem, QGraphicsSceneHoverEvent
-from qtpy.QtGui import QColor, QPen, QPainterPath
+from qtpy.QtGui import QColor, QPen, QPainterPath, QPainterPathStroker
 from qtpy.QtCore import Qt, QRectF, QPointF
 
 from nodeeditor.node_graphics_edge_path import GraphicsEdgePathBezier, GraphicsEdgePathDirect, GraphicsEdgePathSquare, GraphicsEdgePathImprovedSharp, GraphicsEdgePathImprovedBezier
@@ -17,8 +17,14 @@ if TYPE_CHECKING:
     from nodeeditor.node_socket import Socket
 
 
+#: width in pixels added to the widest pen of the edge, so the edge can be hovered and clicked comfortably
+EDGE_HIT_TOLERANCE = 6.0
+
+
 class QDMGraphicsEdge(QGraphicsPathItem):
     """Base class for Graphics Edge"""
+    #: level of detail (``1.0`` is the original size) below which the `Edge` is drawn as a straight line
+    lod_straight: float = 0.3
 
     def __init__(self, edge: 'Edge', parent: QGraphicsPathItem = None) -> None:
         """
@@ -37,12 +43,18 @@ class QDMGraphicsEdge(QGraphicsPathItem):
 
         self.edge = edge
 
+        # cached QPainterPath, its stroked outline used for hit testing and its bounding rect,
+        # ``None`` when they have to be recalculated
+        self._path: Optional[QPainterPath] = None
+        self._shape: Optional[QPainterPath] = None
+        self._bounding_rect: Optional[QRectF] = None
+
         # create instance of our path class
         self.pathCalculator = self.determineEdgePathClass()(self)
 
         # init our flags
         self._last_selected_state = False
-        self.hovered = False
+        self._hovered = False
 
         # init our variables
         self.posSource: List[float] = [0, 0]
@@ -51,6 +63,38 @@ class QDMGraphicsEdge(QGraphicsPathItem):
         self.initAssets()
         self.initUI()
 
+    @property
+    def hovered(self) -> bool:
+        """
+        Is the mouse over this `Graphics Edge` or is a dragged `Node` about to be dropped on it?
+
+        :getter: ``True`` when the `Edge` is drawn highlighted
+        :setter: highlights the `Edge` and promotes it from the edge batch if needed
+        :type: ``bool``
+        """
+        return self._hovered
+
+    @hovered.setter
+    def hovered(self, value: bool) -> None:
+        if self._hovered != value:
+            self._hovered = value
+            self.update()
+            self.updateBatch()
+
+    def updateBatch(self) -> None:
+        """Let the :class:`~nodeeditor.node_graphics_edge_layer.EdgeBatch` of the `Scene` know that this `Edge`
+        changed, when the `Edges` are batched"""
+        batch = self.edge.scene.grScene.edge_batch
+        if batch is not None:
+            batch.updateEdge(self)
+
+    def itemChange(self, change, value):
+        """Overridden Qt's method to move selected and hidden `Edges` out of the edge batch"""
+        if change in (QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged,
+                      QGraphicsItem.GraphicsItemChange.ItemVisibleHasChanged):
+            self.updateBatch()
+        return super().itemChange(change, value)
+
     def initUI(self) -> None:
         """Set up this ``QGraphicsPathItem``"""
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
@@ -72,9 +116,14 @@ class QDMGraphicsEdge(QGraphicsPathItem):
         self._pen_dragging.setWidthF(3.0)
         self._pen_hovered.setWidthF(5.0)
 
+    def getHitWidth(self) -> float:
+        """Returns width of the outline used for hit testing, the widest pen plus ``EDGE_HIT_TOLERANCE``"""
+        return max(self._pen.widthF(), self._pen_selected.widthF(), self._pen_hovered.widthF()) + EDGE_HIT_TOLERANCE
+
     def createEdgePathCalculator(self):
         """Create instance of :class:`~nodeeditor.node_graphics_edge_path.GraphicsEdgePathBase`"""
         self.pathCalculator = self.determineEdgePathClass()(self)
+        self.invalidatePath()
         return self.pathCalculator
 
     def determineEdgePathClass(self):
@@ -105,6 +154,7 @@ class QDMGraphicsEdge(QGraphicsPathItem):
         self._color = QColor(color) if type(color) == str else color
         self._pen = QPen(self._color)
         self._pen.setWidthF(3.0)
+        self.updateBatch()
 
     def setColorFromSockets(self) -> bool:
         """Change color according to connected sockets. Returns ``True`` if color can be determined"""
@@ -166,7 +216,9 @@ class QDMGraphicsEdge(QGraphicsPathItem):
         :param y: y position
         :type y: ``float``
         """
-        self.posSource = [x, y]
+        if self.posSource != [x, y]:
+            self.posSource = [x, y]
+            self.invalidatePath()
 
     def setDestination(self, x: float, y: float) -> None:
         """ Set destination point
@@ -176,30 +228,77 @@ class QDMGraphicsEdge(QGraphicsPathItem):
         :param y: y position
         :type y: ``float``
         """
-        self.posDestination = [x, y]
+        if self.posDestination != [x, y]:
+            self.posDestination = [x, y]
+            self.invalidatePath()
+
+    def invalidatePath(self) -> None:
+        """Forget the cached path, it is recalculated when this `Graphics Edge` is painted next time. Called when
+        the source, the destination, the sockets or the edge type changed"""
+        if self._path is not None:
+            self.prepareGeometryChange()
+            self._path = self._shape = self._bounding_rect = None
+            self.update()
+            self.updateBatch()
+
+    def path(self) -> QPainterPath:
+        """Returns cached ``QPainterPath`` of this `Edge`, it is calculated only when the edge geometry changed
+
+        :return: path representation
+        :rtype: ``QPainterPath``
+        """
+        if self._path is None:
+            self._path = self.calcPath()
+        return self._path
 
     def boundingRect(self) -> QRectF:
-        """Defining Qt' bounding rectangle"""
-        return self.shape().boundingRect()
+        """Defining Qt' bounding rectangle, the rectangle of the path grown by the hit width"""
+        if self._bounding_rect is None:
+            margin = self.getHitWidth() / 2
+            self._bounding_rect = self.path().boundingRect().adjusted(-margin, -margin, margin, margin)
+        return self._bounding_rect
 
     def shape(self) -> QPainterPath:
-        """Returns ``QPainterPath`` representation of this `Edge`
+        """Returns outline of this `Edge` used for hovering, clicking and selecting. It is the path stroked with
+        the hit width, cached until the edge geometry changes
 
-        :return: path representation
+        :return: stroked path
         :rtype: ``QPainterPath``
         """
-        return self.calcPath()
+        if self._shape is None:
+            stroker = QPainterPathStroker()
+            stroker.setWidth(self.getHitWidth())
+            stroker.setCapStyle(Qt.PenCapStyle.RoundCap)
+            self._shape = stroker.createStroke(self.path())
+        return self._shape
+
+    def contains(self, point: QPointF) -> bool:
+        """Is the `point` on this `Edge`? Points outside of the bounding rect are rejected without testing the shape
+
+        :param point: point in item coordinates
+        :type point: ``QPointF``
+        :rtype: ``bool``
+        """
+        if not self.boundingRect().contains(point):
+            return False
+        return self.shape().contains(point)
 
     def paint(self, painter, QStyleOptionGraphicsItem, widget=None) -> None:
         """Qt's overridden method to paint this Graphics Edge. Path calculated
-            in :func:`~nodeeditor.node_graphics_edge.QDMGraphicsEdge.calcPath` method"""
-        self.setPath(self.calcPath())
+            in :func:`~nodeeditor.node_graphics_edge.QDMGraphicsEdge.calcPath` method and cached until the edge
+            geometry changes. Below :attr:`lod_straight` a straight line is drawn instead"""
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < self.lod_straight:
+            path = QPainterPath(QPointF(*self.posSource))
+            path.lineTo(QPointF(*self.posDestination))
+        else:
+            path = self.path()
 
         painter.setBrush(Qt.NoBrush)
 
         if self.hovered and self.edge.end_socket is not None:
             painter.setPen(self._pen_hovered)
-            painter.drawPath(self.path())
+            painter.drawPath(path)
 
         if self.edge.end_socket is None:
             painter.setPen(self._pen_dragging)
@@ -207,7 +306,7 @@ class QDMGraphicsEdge(QGraphicsPathItem):
             painter.setPen(self._pen if not self.isSelected()
                            else self._pen_selected)
 
-        painter.drawPath(self.path())
+        painter.drawPath(path)
 
     def intersectsWith(self, p1: QPointF, p2: QPointF) -> bool:
         """Does this Graphics Edge intersect with the line between point A and point B ?
@@ -219,10 +318,11 @@ class QDMGraphicsEdge(QGraphicsPathItem):
         :return: ``True`` if this `Graphics Edge` intersects
         :rtype: ``bool``
         """
+        if not self.boundingRect().intersects(QRectF(p1, p2).normalized().adjusted(-1, -1, 1, 1)):
+            return False
         cutpath = QPainterPath(p1)
         cutpath.lineTo(p2)
-        path = self.calcPath()
-        return cutpath.intersects(path)
+        return cutpath.intersects(self.path())
 
     def calcPath(self) -> QPainterPath:
         """Will handle drawing QPainterPath from Point A to B. Internally there exist self.pathCalculator which
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the batched rendering of `Edges`. With tens of thousands of `Edges` one ``QGraphicsPathItem``
+per `Edge` is expensive, both for the bookkeeping of the ``QGraphicsScene`` and for painting each item.
+
+When batching is enabled with :func:`~nodeeditor.node_graphics_scene.QDMGraphicsScene.setEdgeBatching`, idle
+`Edges` are not items of the ``QGraphicsScene``. They are drawn by one :class:`QDMGraphicsEdgeLayer` per pen, which
+splits the `Scene` into square tiles and keeps one merged ``QPainterPath`` of the `Edges` centered in each tile.
+When an `Edge` changes, only its tile is rebuilt.
+
+`Edges` which are hovered, selected, dragged or rerouted are promoted back to their own
+:class:`~nodeeditor.node_graphics_edge.QDMGraphicsEdge` items, so they can be interacted with as usual, and go back
+to the layer when they are idle again.
+"""
+import math
+from qtpy.QtWidgets import QGraphicsItem
+from qtpy.QtCore import Qt, QRectF, QPointF, QTimer
+from qtpy.QtGui import QPainterPath, QPen
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from nodeeditor.node_graphics_scene import QDMGraphicsScene
+    from nodeeditor.node_graphics_edge import QDMGraphicsEdge
+
+
+DEBUG = False
+
+#: size of the square tiles in `Scene` pixels. Each tile keeps one merged path of the `Edges` centered in it
+EDGE_LAYER_TILE_SIZE = 512
+
+
+class QDMGraphicsEdgeLayer(QGraphicsItem):
+    """Draws all batched `Edges` with the same pen"""
+    #: level of detail (``1.0`` is the original size) below which the `Edges` are drawn as straight lines
+    lod_straight: float = 0.3
+
+    def __init__(self, batch: 'EdgeBatch', pen: QPen) -> None:
+        """
+        :param batch: :class:`EdgeBatch` owning this layer
+        :param pen: ``QPen`` used to draw the `Edges`
+
+        :Instance Attributes:
+
+        - **batch** - :class:`EdgeBatch` owning this layer
+        - **pen** - ``QPen`` used to draw the `Edges`
+        - **tiles** - dict mapping ``(column, row)`` of the tiles to sets of
+          :class:`~nodeeditor.node_graphics_edge.QDMGraphicsEdge` whose bounding rect center is in the tile
+        """
+        super().__init__()
+        self.batch = batch
+        self.pen = QPen(pen)
+        self.tiles: Dict[Tuple[int, int], Set['QDMGraphicsEdge']] = {}
+        # merged path and bounding rect of the edges of each tile, missing when the tile has to be rebuilt
+        self._tile_paths: Dict[Tuple[int, int], QPainterPath] = {}
+        self._tile_lines: Dict[Tuple[int, int], QPainterPath] = {}
+        self._tile_rects: Dict[Tuple[int, int], QRectF] = {}
+        # grows with the added edges, it does not shrink when they are removed
+        self._bounding_rect = QRectF()
+
+        self.setZValue(-2)
+        self.setAcceptHoverEvents(True)
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+    def getTile(self, point: QPointF) -> Tuple[int, int]:
+        """Return ``(column, row)`` of the tile containing `point`"""
+        return int(math.floor(point.x() / EDGE_LAYER_TILE_SIZE)), int(math.floor(point.y() / EDGE_LAYER_TILE_SIZE))
+
+    def addEdge(self, grEdge: 'QDMGraphicsEdge') -> Tuple[Tuple[int, int], QRectF]:
+        """Draw `grEdge` in this layer
+
+        :return: tile the `Edge` was added to and its bounding rect
+        """
+        rect = grEdge.boundingRect()
+        if not self._bounding_rect.contains(rect):
+            self.prepareGeometryChange()
+            self._bounding_rect = self._bounding_rect.united(rect)
+        tile = self.getTile(rect.center())
+        self.tiles.setdefault(tile, set()).add(grEdge)
+        self.invalidateTile(tile, rect)
+        return tile, rect
+
+    def removeEdge(self, grEdge: 'QDMGraphicsEdge', tile: Tuple[int, int], rect: QRectF) -> None:
+        """Stop drawing `grEdge` in this layer
+
+        :param tile: tile returned by :func:`addEdge`
+        :param rect: bounding rect returned by :func:`addEdge`, the `Edge` may have moved since
+        """
+        edges = self.tiles.get(tile)
+        if edges is None:
+            return
+        edges.discard(grEdge)
+        if not edges:
+            del self.tiles[tile]
+        self.invalidateTile(tile, rect)
+
+    def invalidateTile(self, tile: Tuple[int, int], rect: QRectF) -> None:
+        """Rebuild the merged path of the `tile` when it is painted next time
+
+        :param rect: area to repaint, the bounding rect of the added or removed `Edge`
+        """
+        self._tile_paths.pop(tile, None)
+        self._tile_lines.pop(tile, None)
+        self._tile_rects.pop(tile, None)
+        self.update(rect)
+
+    def getTileRect(self, tile: Tuple[int, int]) -> QRectF:
+        """Return bounding rect of all `Edges` of the `tile`"""
+        rect = self._tile_rects.get(tile)
+        if rect is None:
+            rect = QRectF()
+            for grEdge in self.tiles.get(tile, ()):
+                rect = rect.united(grEdge.boundingRect())
+            self._tile_rects[tile] = rect
+        return rect
+
+    def getTilePath(self, tile: Tuple[int, int], straight: bool = False) -> QPainterPath:
+        """Return merged path of all `Edges` of the `tile`
+
+        :param straight: ``True`` to get straight lines between the ends of the `Edges`, used when zoomed out
+        :type straight: ``bool``
+        """
+        cache = self._tile_lines if straight else self._tile_paths
+        path = cache.get(tile)
+        if path is None:
+            path = QPainterPath()
+            for grEdge in self.tiles.get(tile, ()):
+                if straight:
+                    path.moveTo(QPointF(*grEdge.posSource))
+                    path.lineTo(QPointF(*grEdge.posDestination))
+                else:
+                    path.addPath(grEdge.path())
+            cache[tile] = path
+        return path
+
+    def getEdges(self, path: QPainterPath) -> List['QDMGraphicsEdge']:
+        """Return `Edges` of this layer whose shape intersects `path`"""
+        rect = path.boundingRect()
+        return [grEdge for tile, edges in self.tiles.items() if self.getTileRect(tile).intersects(rect)
+                for grEdge in edges if grEdge.boundingRect().intersects(rect) and grEdge.shape().intersects(path)]
+
+    def getEdgeAt(self, point: QPointF) -> Optional['QDMGraphicsEdge']:
+        """Return `Edge` of this layer at `point` in `Scene` coordinates or ``None``"""
+        self.batch.flush(False)
+        for tile, edges in self.tiles.items():
+            if self.getTileRect(tile).contains(point):
+                for grEdge in edges:
+                    if grEdge.contains(point):
+                        return grEdge
+        return None
+
+    def boundingRect(self) -> QRectF:
+        """Defining Qt' bounding rectangle, it covers all `Edges` ever drawn by this layer"""
+        return self._bounding_rect
+
+    def contains(self, point: QPointF) -> bool:
+        """Only points on the `Edges` are a part of the layer, so it does not hide the empty space"""
+        return self.getEdgeAt(point) is not None
+
+    def collidesWithPath(self, path: QPainterPath, mode=Qt.ItemSelectionMode.IntersectsItemShape) -> bool:
+        """Overridden Qt's method, so ``QGraphicsScene.items(rect)`` finds the layer only over its `Edges`"""
+        self.batch.flush(False)
+        return bool(self.getEdges(path))
+
+    def hoverEnterEvent(self, event) -> None:
+        self.hoverMoveEvent(event)
+
+    def hoverMoveEvent(self, event) -> None:
+        """Promote the `Edge` under the cursor to its own item, which then receives the hover and click events"""
+        grEdge = self.getEdgeAt(event.pos())
+        if grEdge is not None:
+            self.batch.promote(grEdge)
+
+    def paint(self, painter, option, widget=None) -> None:
+        """Draw the merged paths of the tiles with exposed `Edges`, straight lines below :attr:`lod_straight`"""
+        self.batch.flush(False)
+        straight = option.levelOfDetailFromTransform(painter.worldTransform()) < self.lod_straight
+        painter.setPen(self.pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for tile in list(self.tiles):
+            if self.getTileRect(tile).intersects(option.exposedRect):
+                painter.drawPath(self.getTilePath(tile, straight))
+
+
+class EdgeBatch():
+    """Class managing batched rendering of the `Edges` of a :class:`~nodeeditor.node_graphics_scene.QDMGraphicsScene`"""
+
+    def __init__(self, grScene: 'QDMGraphicsScene') -> None:
+        """
+        :param grScene: :class:`~nodeeditor.node_graphics_scene.QDMGraphicsScene` of the `Edges`
+
+        :Instance Attributes:
+
+        - **grScene** - the :class:`~nodeeditor.node_graphics_scene.QDMGraphicsScene`
+        - **layers** - dict mapping pen keys to :class:`QDMGraphicsEdgeLayer`
+        - **promoted** - set of :class:`~nodeeditor.node_graphics_edge.QDMGraphicsEdge` which are items of the
+          ``QGraphicsScene``
+        """
+        self.grScene = grScene
+        self.layers: Dict[tuple, QDMGraphicsEdgeLayer] = {}
+        self.promoted: Set['QDMGraphicsEdge'] = set()
+        # all managed edges -> (layer, tile, bounding rect) of batched edges or None
+        self._placements: Dict['QDMGraphicsEdge', Optional[Tuple[QDMGraphicsEdgeLayer, Tuple[int, int], QRectF]]] = {}
+        # edges which changed and have to be placed again
+        self._pending: Set['QDMGraphicsEdge'] = set()
+
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def getPenKey(self, grEdge: 'QDMGraphicsEdge') -> tuple:
+        """Return key of the layer drawing `grEdge`"""
+        pen = grEdge._pen
+        return (pen.color().rgba(), pen.widthF(), pen.style())
+
+    def isIdle(self, grEdge: 'QDMGraphicsEdge') -> bool:
+        """Can `grEdge` be drawn by a layer? Selected, hovered and unconnected `Edges` need their own items"""
+        edge = grEdge.edge
+        return not grEdge.isSelected() and not grEdge.hovered and \
+            edge.start_socket is not None and edge.end_socket is not None and not grEdge.isUnderMouse()
+
+    def scheduleFlush(self) -> None:
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(0)
+
+    def addEdge(self, grEdge: 'QDMGraphicsEdge') -> None:
+        """Start managing `grEdge` of a new `Edge`"""
+        self._placements[grEdge] = None
+        if not self.isIdle(grEdge):
+            self.promote(grEdge)
+        self._pending.add(grEdge)
+        self.scheduleFlush()
+
+    def removeEdge(self, grEdge: 'QDMGraphicsEdge') -> None:
+        """Stop managing `grEdge` of a removed `Edge`"""
+        self.unplace(grEdge)
+        self._placements.pop(grEdge, None)
+        self._pending.discard(grEdge)
+        self.promoted.discard(grEdge)
+
+    def updateEdge(self, grEdge: 'QDMGraphicsEdge') -> None:
+        """The geometry, pen or state of `grEdge` changed. `Edges` which are not idle any more are promoted at once,
+        the others are placed again later"""
+        if grEdge not in self._placements:
+            return
+        self.unplace(grEdge)
+        if grEdge.isVisible() and not self.isIdle(grEdge):
+            self.promote(grEdge)
+        self._pending.add(grEdge)
+        self.scheduleFlush()
+
+    def promote(self, grEdge: 'QDMGraphicsEdge') -> None:
+        """Make `grEdge` an item of the ``QGraphicsScene``"""
+        if grEdge in self.promoted:
+            return
+        self.unplace(grEdge)
+        self.promoted.add(grEdge)
+        if grEdge.scene() is None:
+            self.grScene.addItem(grEdge)
+        if DEBUG:
+            print("EdgeBatch: promoted", grEdge.edge)
+
+    def unplace(self, grEdge: 'QDMGraphicsEdge') -> None:
+        """Remove `grEdge` from its layer"""
+        placement = self._placements.get(grEdge)
+        if placement is not None:
+            layer, tile, rect = placement
+            layer.removeEdge(grEdge, tile, rect)
+            self._placements[grEdge] = None
+
+    def place(self, grEdge: 'QDMGraphicsEdge') -> None:
+        """Add idle `grEdge` to the layer of its pen"""
+        if not grEdge.isVisible():
+            return
+        key = self.getPenKey(grEdge)
+        layer = self.layers.get(key)
+        if layer is None:
+            layer = self.layers[key] = QDMGraphicsEdgeLayer(self, grEdge._pen)
+            self.grScene.addItem(layer)
+        self._placements[grEdge] = (layer, *layer.addEdge(grEdge))
+
+    def flush(self, demote: bool = True) -> None:
+        """Place the changed `Edges` into layers
+
+        :param demote: ``False`` to only place `Edges` which are not items of the ``QGraphicsScene``. Items are not
+            removed from the ``QGraphicsScene`` while painting or hit testing
+        """
+        for grEdge in list(self._pending):
+            if grEdge.scene() is not None:
+                if not demote:
+                    continue
+                if not self.isIdle(grEdge):
+                    self._pending.discard(grEdge)
+                    continue
+                self.promoted.discard(grEdge)
+                self.grScene.removeItem(grEdge)
+                if DEBUG:
+                    print("EdgeBatch: demoted", grEdge.edge)
+            self._pending.discard(grEdge)
+            if self.isIdle(grEdge):
+                self.place(grEdge)
+
+    def demoteIdle(self) -> None:
+        """Return promoted `Edges` which are idle again to their layers"""
+        self._pending.update(self.promoted)
+        self.scheduleFlush()
+
+    def getEdges(self, path: QPainterPath) -> List['QDMGraphicsEdge']:
+        """Return batched `Edges` whose shape intersects `path` in `Scene` coordinates"""
+        self.flush(False)
+        edges: List['QDMGraphicsEdge'] = []
+        for layer in self.layers.values():
+            edges.extend(layer.getEdges(path))
+        return edges
+
+    def clear(self) -> None:
+        """Make all `Edges` items of the ``QGraphicsScene`` again and remove the layers"""
+        self._flush_timer.stop()
+        for grEdge in self._placements:
+            if grEdge.scene() is None:
+                self.grScene.addItem(grEdge)
+        for layer in self.layers.values():
+            self.grScene.removeItem(layer)
+        self.layers = {}
+        self._placements = {}
+        self._pending = set()
+        self.promoted = set()
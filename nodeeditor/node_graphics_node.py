@@ -2,9 +2,12 @@
 """
 A module containing Graphics representation of :class:`~nodeeditor.node_node.Node`
 """
-from qtpy.QtWidgets import QGraphicsItem, QWidget, QGraphicsTextItem, QGraphicsSceneHoverEvent
-from qtpy.QtGui import QFont, QColor, QPen, QBrush, QPainterPath
-from qtpy.QtCore import Qt, QRectF
+from collections import OrderedDict
+from qtpy.QtWidgets import QGraphicsItem, QWidget, QGraphicsSceneHoverEvent
+from qtpy.QtGui import QFont, QColor, QPen, QBrush, QPainterPath, QStaticText, QTransform
+from qtpy.QtCore import Qt, QRectF, QPointF, QMarginsF
+from nodeeditor.node_graphics_content import ContentSnapshot
+from nodeeditor.node_painted_content import QDMPaintedContent
 
 from typing import TYPE_CHECKING, List, Optional, Tuple, Any
 
@@ -16,8 +19,64 @@ if TYPE_CHECKING:
     from nodeeditor.node_node import Node
 
 
+class NodeChrome():
+    """Rounded title, content and outline paths of a `Graphics Node`. They depend only on the geometry of the node,
+    so they are built once and shared by all `Graphics Nodes` with the same geometry. Use :func:`get`"""
+    #: how many geometries are kept. The least recently used ones are dropped, i.e. when nodes are resized
+    max_cached: int = 64
+    # shared instances by ``(class, width, height, title_height, edge_roundness)``, the least recently used first
+    _cache: 'OrderedDict[tuple, NodeChrome]' = OrderedDict()
+
+    def __init__(self, width: float, height: float, title_height: float, edge_roundness: float) -> None:
+        """
+        :Instance Attributes:
+
+            - **path_title** - simplified ``QPainterPath`` of the title with rounded top corners
+            - **path_content** - simplified ``QPainterPath`` of the content with rounded bottom corners
+            - **path_outline** - simplified ``QPainterPath`` of the outline, drawn with the default,
+              hovered or selected pen
+        """
+        self.path_title = QPainterPath()
+        self.path_title.setFillRule(Qt.WindingFill)
+        self.path_title.addRoundedRect(0, 0, width, title_height, edge_roundness, edge_roundness)
+        self.path_title.addRect(0, title_height - edge_roundness, edge_roundness, edge_roundness)
+        self.path_title.addRect(width - edge_roundness, title_height - edge_roundness, edge_roundness, edge_roundness)
+        self.path_title = self.path_title.simplified()
+
+        self.path_content = QPainterPath()
+        self.path_content.setFillRule(Qt.WindingFill)
+        self.path_content.addRoundedRect(0, title_height, width, height - title_height, edge_roundness, edge_roundness)
+        self.path_content.addRect(0, title_height, edge_roundness, edge_roundness)
+        self.path_content.addRect(width - edge_roundness, title_height, edge_roundness, edge_roundness)
+        self.path_content = self.path_content.simplified()
+
+        self.path_outline = QPainterPath()
+        self.path_outline.addRoundedRect(-1, -1, width + 2, height + 2, edge_roundness, edge_roundness)
+        self.path_outline = self.path_outline.simplified()
+
+    @classmethod
+    def get(cls, width: float, height: float, title_height: float, edge_roundness: float) -> 'NodeChrome':
+        """Return shared chrome for the geometry, it is built on the first request
+
+        :rtype: :class:`NodeChrome`
+        """
+        key = (cls, width, height, title_height, edge_roundness)
+        chrome = cls._cache.get(key)
+        if chrome is not None:
+            cls._cache.move_to_end(key)
+            return chrome
+        chrome = cls._cache[key] = cls(width, height, title_height, edge_roundness)
+        while len(cls._cache) > cls.max_cached:
+            cls._cache.popitem(last=False)
+        return chrome
+
+
 class QDMGraphicsNode(QGraphicsItem):
     """Class describing Graphics representation of :class:`~nodeeditor.node_node.Node`"""
+    #: level of detail (``1.0`` is the original size) below which the title and the content widget are hidden
+    lod_content: float = 0.5
+    #: level of detail below which the `Node` is drawn as a plain rectangle
+    lod_simple: float = 0.3
 
     def __init__(self, node: 'Node', parent: QGraphicsItem = None) -> None:
         """
@@ -37,6 +96,9 @@ class QDMGraphicsNode(QGraphicsItem):
         self.hovered: bool = False
         self._was_moved: bool = False
         self._last_selected_state: bool = False
+        self._identical_pen: Optional[QPen] = None
+        self._details_visible: bool = True
+        self.content_snapshot = ContentSnapshot(self)
 
         self.initSizes()
         self.initAssets()
@@ -60,7 +122,9 @@ class QDMGraphicsNode(QGraphicsItem):
     @title.setter
     def title(self, value) -> None:
         self._title = value
-        self.title_item.setPlainText(self._title)
+        self._title_text.setText(self._title)
+        self._title_text.prepare(QTransform(), self._title_font)
+        self.update()
 
     def initUI(self) -> None:
         """Set up this ``QGraphicsItem``"""
@@ -73,6 +137,9 @@ class QDMGraphicsNode(QGraphicsItem):
         # self.title = self.node.title
 
         self.initContent()
+        self.updateCacheMode()
+        self._details_visible = self.node.scene.grScene.details_lod >= self.lod_content
+        self.content_snapshot.updateProxy()
 
     def initSizes(self) -> None:
         """Set up internal attributes like `width`, `height`, etc."""
@@ -92,6 +159,7 @@ class QDMGraphicsNode(QGraphicsItem):
         self._color = QColor("#7F000000")
         self._color_selected = QColor("#FFFFA637")
         self._color_hovered = QColor("#FF37A6FF")
+        self._color_frozen = QColor("#FF9AD8FF")
 
         self._pen_default = QPen(self._color)
         self._pen_default.setWidthF(2.0)
@@ -99,9 +167,12 @@ class QDMGraphicsNode(QGraphicsItem):
         self._pen_selected.setWidthF(2.0)
         self._pen_hovered = QPen(self._color_hovered)
         self._pen_hovered.setWidthF(3.0)
+        self._pen_frozen = QPen(self._color_frozen)
+        self._pen_frozen.setWidthF(1.5)
 
         self._brush_title = QBrush(QColor("#FF313131"))
         self._brush_background = QBrush(QColor("#E3212121"))
+        self._brush_frozen = QBrush(self._color_frozen)
 
     def onSelected(self) -> None:
         """Our event handling when the node was selected"""
@@ -155,94 +226,230 @@ class QDMGraphicsNode(QGraphicsItem):
             self.onSelected()
 
     def mouseDoubleClickEvent(self, event) -> None:
-        """Overriden event for doubleclick. Resend to `Node::onDoubleClicked`"""
+        """Overriden event for doubleclick. Opens the editor of an editable painted content, otherwise resend to
+        `Node::onDoubleClicked`"""
+        if isinstance(self.content, QDMPaintedContent) and self.content.geometry().contains(event.pos()) \
+                and self.content.openEditor():
+            return
         self.node.onDoubleClicked(event)
 
     def hoverEnterEvent(self, event: Optional['QGraphicsSceneHoverEvent']) -> None:
         """Handle hover effect"""
         self.hovered = True
+        self.content_snapshot.setLive(True)
         self.update()
 
     def hoverLeaveEvent(self, event: Optional['QGraphicsSceneHoverEvent']) -> None:
         """Handle hover effect"""
         self.hovered = False
+        self.content_snapshot.setLive(False)
         self.update()
 
     def boundingRect(self) -> QRectF:
-        """Defining Qt' bounding rectangle"""
+        """Defining Qt' bounding rectangle. It covers everything this `Node` paints, including the outline and
+        decorations outside of the `Node`, because the ``DeviceCoordinateCache`` clips painting to it.
+        See :func:`getPaintMargins`"""
         return QRectF(
             0,
             0,
             self.width,
             self.height
-        ).normalized()
+        ).normalized().marginsAdded(self.getPaintMargins())
 
-    def initTitle(self) -> None:
-        """Set up the title Graphics representation: font, color, position, etc."""
-        self.title_item = QGraphicsTextItem(self)
-        self.title = self.node.title
-        self.title_item.node = self.node
-        self.title_item.setDefaultTextColor(self._title_color)
-        self.title_item.setFont(self._title_font)
+    def getPaintMargins(self) -> QMarginsF:
+        """Return how far this `Node` paints outside of its ``width`` and ``height``. By default it is the outline
+        drawn around the `Node` with the widest pen. Override it when painting more outside of the `Node`
 
-        # Calculate horizontal and vertical center positions
-        horizontal_center = (self.boundingRect().width(
-        ) - self.title_item.boundingRect().width()) / 2
-        vertical_center = (self.title_height -
-                           self.title_item.boundingRect().height()) / 2
+        :rtype: ``QMarginsF``
+        """
+        margin = 1 + max(self._pen_default.widthF(), self._pen_selected.widthF(), self._pen_hovered.widthF()) / 2
+        return QMarginsF(margin, margin, margin, margin)
 
-        self.title_item.setPos(horizontal_center, vertical_center)
+    def shape(self) -> QPainterPath:
+        """Mouse interaction shape of this `Node`, only the `Node` itself without the painted margins"""
+        path = QPainterPath()
+        path.addRect(QRectF(0, 0, self.width, self.height))
+        return path
+
+    def initTitle(self) -> None:
+        """Set up the title Graphics representation. The title is laid out once into ``QStaticText`` and painted
+        by :func:`paintTitle`, so no child item is needed"""
+        self._title_pen = QPen(self._title_color)
+        self._title_text = QStaticText()
+        self._title_text.setTextFormat(Qt.TextFormat.PlainText)
+        self.title = self.node.title
 
     def initContent(self) -> None:
-        """Set up the `grContent` - ``QGraphicsProxyWidget`` to have a container for `Graphics Content`"""
+        """Set up the `grContent` - ``QGraphicsProxyWidget`` to have a container for `Graphics Content`.
+        :class:`~nodeeditor.node_painted_content.QDMPaintedContent` is painted by this item, so it has no proxy"""
         if self.content is not None:
             self.content.setGeometry(self.edge_padding, self.title_height + self.edge_padding,
                                      self.width - 2 * self.edge_padding, self.height - 2 * self.edge_padding - self.title_height)
 
+        if isinstance(self.content, QDMPaintedContent):
+            self.grContent = None
+            return
+
         # get the QGraphicsProxyWidget when inserted into the grScene
         self.grContent = self.node.scene.grScene.addWidget(self.content)
         self.grContent.node = self.node
         self.grContent.setParentItem(self)
 
+    def updateCacheMode(self) -> None:
+        """Apply cache mode of the `Scene` to this item and its content, see
+        :func:`~nodeeditor.node_graphics_scene.QDMGraphicsScene.setNodeCaching`. The cache is redrawn whenever
+        ``update()`` is called, i.e. on hover, selection, title or state changes"""
+        mode = self.node.scene.grScene.getNodeCacheMode()
+        self.setCacheMode(mode)
+        if self.grContent is not None:
+            self.grContent.setCacheMode(mode)
+
+    def setDetailsVisible(self, value: bool) -> None:
+        """Show or hide the content widget, which is hidden when all views are zoomed out. Called by
+        :func:`~nodeeditor.node_graphics_scene.QDMGraphicsScene.updateDetailsVisibility`
+
+        :param value: ``True`` to show the details
+        :type value: ``bool``
+        """
+        if value == self._details_visible:
+            return
+        self._details_visible = value
+        self.content_snapshot.updateProxy()
+
     def paint(self, painter, QStyleOptionGraphicsItem, widget=None) -> None:
-        """Painting the rounded rectanglar `Node`"""
+        """Painting the rounded rectanglar `Node`. When zoomed out, the title and the content are not painted below
+        :attr:`lod_content` and a plain rectangle is drawn below :attr:`lod_simple`. Painting does not change
+        the visibility of the content widget, views can paint at different zoom levels"""
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        details = lod >= self.lod_content
+        if lod < self.lod_simple:
+            self.paintSimple(painter)
+        else:
+            self.paintShape(painter, details)
+
+        profiler = self.node.scene.evaluator.profiler
+        if profiler.show_heatmap:
+            self.paintHeat(painter, profiler.getHeat(self.node))
+
+        if self._identical_pen is not None:
+            painter.setBrush(Qt.NoBrush)
+            painter.setPen(self._identical_pen)
+            # inside the bounding rect, so no repaint artifacts are left behind
+            painter.drawRoundedRect(QRectF(2, 2, self.width - 4, self.height - 4),
+                                    self.edge_roundness, self.edge_roundness)
+
+        if details:
+            self.paintContent(painter)
+            self.paintTitle(painter)
+
+        if self.node.isFrozen() and lod >= self.lod_simple:
+            self.paintFrozenBadge(painter)
+
+    def paintTitle(self, painter) -> None:
+        """Paint the title centered in the title bar"""
+        size = self._title_text.size()
+        painter.setFont(self._title_font)
+        painter.setPen(self._title_pen)
+        painter.drawStaticText(QPointF((self.width - size.width()) / 2, (self.title_height - size.height()) / 2),
+                               self._title_text)
+
+    def paintSimple(self, painter) -> None:
+        """Paint this `Node` as a plain rectangle, used when zoomed out"""
+        painter.setPen(self._pen_selected if self.isSelected() else Qt.NoPen)
+        painter.setBrush(self._brush_title)
+        painter.drawRect(QRectF(0, 0, self.width, self.height))
+
+    def paintShape(self, painter, details: bool = True) -> None:
+        """Paint the rounded title, content and outline of this `Node`
+
+        :param details: ``False`` if zoomed out below :attr:`lod_content`, the title and the content are not painted
+        :type details: ``bool``
+        """
+        chrome = self.getChrome()
+
         # title
-        path_title = QPainterPath()
-        path_title.setFillRule(Qt.WindingFill)
-        path_title.addRoundedRect(
-            0, 0, self.width, self.title_height, self.edge_roundness, self.edge_roundness)
-        path_title.addRect(0, self.title_height - self.edge_roundness,
-                           self.edge_roundness, self.edge_roundness)
-        path_title.addRect(self.width - self.edge_roundness, self.title_height -
-                           self.edge_roundness, self.edge_roundness, self.edge_roundness)
         painter.setPen(Qt.NoPen)
         painter.setBrush(self._brush_title)
-        painter.drawPath(path_title.simplified())
+        painter.drawPath(chrome.path_title)
 
         # content
-        path_content = QPainterPath()
-        path_content.setFillRule(Qt.WindingFill)
-        path_content.addRoundedRect(0, self.title_height, self.width, self.height -
-                                    self.title_height, self.edge_roundness, self.edge_roundness)
-        path_content.addRect(0, self.title_height,
-                             self.edge_roundness, self.edge_roundness)
-        path_content.addRect(self.width - self.edge_roundness,
-                             self.title_height, self.edge_roundness, self.edge_roundness)
         painter.setPen(Qt.NoPen)
         painter.setBrush(self._brush_background)
-        painter.drawPath(path_content.simplified())
+        painter.drawPath(chrome.path_content)
 
         # outline
-        path_outline = QPainterPath()
-        path_outline.addRoundedRect(-1, -1, self.width+2,
-                                    self.height+2, self.edge_roundness, self.edge_roundness)
         painter.setBrush(Qt.NoBrush)
         if self.hovered:
             painter.setPen(self._pen_hovered)
-            painter.drawPath(path_outline.simplified())
+            painter.drawPath(chrome.path_outline)
             painter.setPen(self._pen_default)
-            painter.drawPath(path_outline.simplified())
+            painter.drawPath(chrome.path_outline)
         else:
             painter.setPen(
                 self._pen_default if not self.isSelected() else self._pen_selected)
-            painter.drawPath(path_outline.simplified())
+            painter.drawPath(chrome.path_outline)
+
+    def paintContent(self, painter) -> None:
+        """Paint the widget-free content or the snapshot of the content widget"""
+        if isinstance(self.content, QDMPaintedContent):
+            self.content.paint(painter)
+        else:
+            self.content_snapshot.paint(painter)
+
+    def getChrome(self) -> NodeChrome:
+        """Return paths of the title, content and outline shared by all `Nodes` with the same geometry
+
+        :rtype: :class:`NodeChrome`
+        """
+        return NodeChrome.get(self.width, self.height, self.title_height, self.edge_roundness)
+
+    def paintHeat(self, painter, heat: float) -> None:
+        """Tint this `Node` by its evaluation time. See :class:`~nodeeditor.node_profiler.EvaluationProfiler`
+
+        :param heat: wall time relative to the slowest `Node` of the last run, from ``0.0`` to ``1.0``
+        :type heat: ``float``
+        """
+        # from green (fast) through yellow to red (the slowest node)
+        color = QColor.fromHsv(int(120 * (1.0 - heat)), 220, 255, 70 + int(110 * heat))
+        painter.setPen(QPen(color, 3.0))
+        painter.setBrush(QBrush(color))
+        painter.drawRoundedRect(QRectF(1.5, 1.5, self.width - 3, self.height - 3),
+                                self.edge_roundness, self.edge_roundness)
+
+    def setIdenticalHighlight(self, group: Optional[int] = None) -> None:
+        """Highlight this `Node` as a member of a group of identical subgraphs. Each group gets its own color.
+        See :func:`~nodeeditor.node_scene_evaluator.SceneEvaluator.updateIdenticalHighlight`
+
+        :param group: index of the group or ``None`` to remove the highlight
+        :type group: ``int``
+        """
+        if group is None:
+            pen = None
+        else:
+            pen = QPen(QColor.fromHsv((group * 67) % 360, 180, 255), 2.0, Qt.DashLine)
+        if pen != self._identical_pen:
+            self._identical_pen = pen
+            self.update()
+
+    def getFrozenBadgeRect(self) -> QRectF:
+        """Return rectangle of the padlock badge in the top right corner of the title"""
+        size = self.title_height * 0.5
+        return QRectF(self.width - self.edge_roundness - size, (self.title_height - size) / 2, size, size)
+
+    def paintFrozenBadge(self, painter) -> None:
+        """Paint padlock badge of the frozen `Node`, see :func:`getFrozenBadgeRect`"""
+        rect = self.getFrozenBadgeRect()
+        size, x, y = rect.width(), rect.x(), rect.y()
+        body_top = y + size * 0.4
+
+        # shackle
+        painter.setPen(self._pen_frozen)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawArc(QRectF(x + size * 0.2, y, size * 0.6, size * 0.7), 0, 180 * 16)
+        painter.drawLine(QPointF(x + size * 0.2, y + size * 0.35), QPointF(x + size * 0.2, body_top))
+        painter.drawLine(QPointF(x + size * 0.8, y + size * 0.35), QPointF(x + size * 0.8, body_top))
+
+        # body
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self._brush_frozen)
+        painter.drawRoundedRect(QRectF(x, body_top, size, y + size - body_top), 1.5, 1.5)
@@ -4,12 +4,14 @@ A module containing Graphic representation of :class:`~nodeeditor.node_scene.Sce
 """
 from array import array
 import math
+import time
 from qtpy import PYSIDE2
-from qtpy.QtWidgets import QGraphicsScene, QWidget
-from qtpy.QtCore import Signal, QRectF, QLine, Qt, Property, QObject
-from qtpy.QtGui import QColor, QPen, QFont, QPainter
+from qtpy.QtWidgets import QGraphicsScene, QGraphicsItem, QWidget, QStyleOptionGraphicsItem
+from qtpy.QtCore import Signal, QRectF, QLine, Qt, Property, QObject, QTimer
+from qtpy.QtGui import QColor, QPen, QFont, QPainter, QPainterPath, QPixmapCache
 from nodeeditor.utils import dumpException
 from nodeeditor.node_graphics_view import STATE_STRING, DEBUG_STATE
+from nodeeditor.node_graphics_edge_layer import EdgeBatch
 
 from typing import TYPE_CHECKING, List, Optional, Tuple, Any
 
@@ -19,6 +21,18 @@ if TYPE_CHECKING:
     from nodeeditor.node_edge import Edge
     from nodeeditor.node_socket import Socket
     from nodeeditor.node_scene import Scene
+    from nodeeditor.node_graphics_edge import QDMGraphicsEdge
+
+#: minimal size of ``QPixmapCache`` in kilobytes when the `Nodes` are cached. The default 10 MB holds only a few
+#: dozens of `Nodes` with their content, panning over more of them would keep repainting them
+NODE_CACHE_LIMIT = 64 * 1024
+
+#: delay in milliseconds after the last scroll or zoom before the content outside of the views is culled. The pass
+#: visits every `Node`, so it does not run on every scroll step
+CONTENT_CULLING_DELAY = 100
+
+#: maximal delay in milliseconds of the culling pass while the view keeps scrolling
+CONTENT_CULLING_MAX_DELAY = 1000
 
 
 class QDMGraphicsScene(QGraphicsScene):
@@ -55,6 +69,21 @@ class QDMGraphicsScene(QGraphicsScene):
         # Affected versions: 4.7.1, 4.7.2, 4.8.0, 5.5.1, 5.7.0 - LOL!
         self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
 
+        # EdgeBatch drawing idle edges in layers, None when every edge is its own item
+        self.edge_batch: Optional[EdgeBatch] = None
+        # Graphics Nodes keep their painting in a pixmap cache, which is redrawn only when they call update()
+        self.node_caching: bool = True
+        self.setNodeCaching(True)
+        # idle content widgets are painted from snapshots and hidden outside of the views
+        self.content_snapshots: bool = True
+        # level of detail of the most zoomed in view, the content widgets are shown according to it
+        self.details_lod: float = 1.0
+        self._culling_timer = QTimer()
+        self._culling_timer.setSingleShot(True)
+        self._culling_timer.timeout.connect(self.updateContentCulling)
+        self._culling_scheduled_since: Optional[float] = None
+        self.focusItemChanged.connect(self.onFocusItemChanged)
+
         # settings
         self.gridSize = 20
         self.gridSquares = 5
@@ -145,6 +174,137 @@ class QDMGraphicsScene(QGraphicsScene):
         """Overriden Qt's dragMoveEvent to enable Qt's Drag Events"""
         pass
 
+    def getNodeCacheMode(self) -> QGraphicsItem.CacheMode:
+        """Return ``QGraphicsItem.CacheMode`` used by the `Graphics Nodes` and their content of this `Scene`"""
+        if self.node_caching:
+            return QGraphicsItem.CacheMode.DeviceCoordinateCache
+        return QGraphicsItem.CacheMode.NoCache
+
+    def setNodeCaching(self, value: bool = True) -> None:
+        """Switch caching of the painted `Nodes`. Cached `Nodes` are not repainted while panning the view, only
+        when they change. Zooming redraws the cache at the new scale
+
+        :param value: ``True`` to paint the `Nodes` into a ``DeviceCoordinateCache``, ``False`` to paint them
+            on every repaint of the view
+        :type value: ``bool``
+        """
+        self.node_caching = value
+        if value and QPixmapCache.cacheLimit() < NODE_CACHE_LIMIT:
+            QPixmapCache.setCacheLimit(NODE_CACHE_LIMIT)
+        for node in self.scene.nodes:
+            node.grNode.updateCacheMode()
+
+    def setContentSnapshots(self, value: bool = True) -> None:
+        """Switch snapshot rendering of the content widgets. Idle content is painted from a pixmap snapshot and
+        the content of `Nodes` outside of all views is hidden. See :mod:`~nodeeditor.node_graphics_content`
+
+        :param value: ``True`` to use snapshots, ``False`` to keep all content widgets live
+        :type value: ``bool``
+        """
+        self.content_snapshots = value
+        for node in self.scene.nodes:
+            snapshot = node.grNode.content_snapshot
+            if not value:
+                snapshot.setCulled(False)
+            snapshot.updateProxy()
+        if value:
+            self.updateContentCulling()
+
+    def updateDetailsVisibility(self) -> None:
+        """Show or hide the content widgets of the `Nodes` by the level of detail of the most zoomed in visible
+        view, see :attr:`~nodeeditor.node_graphics_node.QDMGraphicsNode.lod_content`. Called when the visible area
+        of a view changed, so painting of the `Nodes` does not change the `Scene`"""
+        lods = [QStyleOptionGraphicsItem.levelOfDetailFromTransform(view.transform())
+                for view in self.views() if view.isVisible()]
+        if not lods or max(lods) == self.details_lod:
+            return
+        self.details_lod = max(lods)
+        for node in self.scene.nodes:
+            node.grNode.setDetailsVisible(self.details_lod >= node.grNode.lod_content)
+
+    def scheduleContentCulling(self) -> None:
+        """Run :func:`updateContentCulling` after the views stopped scrolling for
+        :data:`CONTENT_CULLING_DELAY`, but at least every :data:`CONTENT_CULLING_MAX_DELAY`. Called when the
+        visible area of a view changed. Culled content scrolled into view is painted from a temporary snapshot
+        until then"""
+        if not self.content_snapshots:
+            return
+        if self._culling_scheduled_since is None:
+            self._culling_scheduled_since = time.monotonic()
+        elapsed = (time.monotonic() - self._culling_scheduled_since) * 1000
+        self._culling_timer.start(int(max(0, min(CONTENT_CULLING_DELAY, CONTENT_CULLING_MAX_DELAY - elapsed))))
+
+    def hasScheduledContentCulling(self) -> bool:
+        """``True`` if :func:`updateContentCulling` is waiting for the views to stop scrolling"""
+        return self._culling_timer.isActive()
+
+    def updateContentCulling(self) -> None:
+        """Hide the content of the `Nodes` outside of all visible views, show it for the `Nodes` scrolled into
+        view. Visits every `Node`, use :func:`scheduleContentCulling` while the views are scrolled"""
+        self._culling_timer.stop()
+        self._culling_scheduled_since = None
+        if not self.content_snapshots:
+            return
+        rects = [view.mapToScene(view.viewport().rect()).boundingRect() for view in self.views() if view.isVisible()]
+        if not rects:
+            # rendered without a view, nothing to cull
+            return
+        for node in self.scene.nodes:
+            rect = node.grNode.sceneBoundingRect()
+            node.grNode.content_snapshot.setCulled(not any(view_rect.intersects(rect) for view_rect in rects))
+
+    def onFocusItemChanged(self, new_item: Optional[QGraphicsItem], old_item: Optional[QGraphicsItem],
+                           reason: Qt.FocusReason) -> None:
+        """Slot called when the keyboard focus moved. Content which lost the focus and is not hovered is painted
+        from a snapshot again"""
+        node = getattr(old_item, 'node', None)
+        if node is not None and node.grNode is not None and not node.grNode.hovered:
+            node.grNode.content_snapshot.setLive(False)
+
+    def isEdgeBatching(self) -> bool:
+        """Are idle `Edges` drawn by :class:`~nodeeditor.node_graphics_edge_layer.QDMGraphicsEdgeLayer` items?"""
+        return self.edge_batch is not None
+
+    def setEdgeBatching(self, value: bool = True) -> None:
+        """Switch batched rendering of the `Edges`. Useful for `Scenes` with tens of thousands of `Edges`.
+        See :mod:`~nodeeditor.node_graphics_edge_layer`
+
+        :param value: ``True`` to draw idle `Edges` in layers, ``False`` to make every `Edge` its own item
+        :type value: ``bool``
+        """
+        if value and self.edge_batch is None:
+            self.edge_batch = EdgeBatch(self)
+            for edge in self.scene.edges:
+                self.edge_batch.addEdge(edge.grEdge)
+            self.edge_batch.flush()
+        elif not value and self.edge_batch is not None:
+            batch, self.edge_batch = self.edge_batch, None
+            batch.clear()
+
+    def addEdgeItem(self, grEdge: 'QDMGraphicsEdge') -> None:
+        """Add `Graphics Edge` of a new `Edge`, either as an item or into the edge batch"""
+        if self.edge_batch is not None:
+            self.edge_batch.addEdge(grEdge)
+        else:
+            self.addItem(grEdge)
+
+    def removeEdgeItem(self, grEdge: 'QDMGraphicsEdge') -> None:
+        """Remove `Graphics Edge` of a removed `Edge`"""
+        if self.edge_batch is not None:
+            self.edge_batch.removeEdge(grEdge)
+        if grEdge.scene() is self:
+            self.removeItem(grEdge)
+
+    def getItemsInRect(self, rect: QRectF) -> List['QGraphicsItem']:
+        """Like ``items(rect)``, but returns the batched `Graphics Edges` instead of the layers drawing them"""
+        items = self.items(rect)
+        if self.edge_batch is None:
+            return items
+        path = QPainterPath()
+        path.addRect(rect)
+        return [item for item in items if item not in self.edge_batch.layers.values()] + \
+            self.edge_batch.getEdges(path)
+
     def setGrScene(self, width: int, height: int) -> None:
         """Set `width` and `height` of the `Graphics Scene`"""
         self.setSceneRect(-width // 2, -height // 2, width, height)
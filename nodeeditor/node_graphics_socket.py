@@ -3,8 +3,8 @@
 A module containing Graphics representation of a :class:`~nodeeditor.node_socket.Socket`
 """
 from qtpy.QtWidgets import QGraphicsItem
-from qtpy.QtGui import QColor, QBrush, QPen, QFont
-from qtpy.QtCore import Qt, QRectF
+from qtpy.QtGui import QColor, QBrush, QPen, QFont, QStaticText, QTransform
+from qtpy.QtCore import Qt, QRectF, QPointF
 
 from typing import TYPE_CHECKING, List, Optional, Tuple, Any
 
@@ -34,6 +34,10 @@ SOCKET_COLORS = [
 
 class QDMGraphicsSocket(QGraphicsItem):
     """Class representing Graphic `Socket` in ``QGraphicsScene``"""
+    #: level of detail (``1.0`` is the original size) below which the text is not painted
+    lod_text: float = 0.5
+    #: level of detail below which the `Socket` is not painted at all
+    lod_hidden: float = 0.3
 
     def __init__(self, socket: 'Socket') -> None:
         """
@@ -48,6 +52,9 @@ class QDMGraphicsSocket(QGraphicsItem):
 
         self.radius = 6
         self._text = ""
+        # text laid out once when it is set, painted centered in the circle
+        self._static_text = QStaticText()
+        self._static_text.setTextFormat(Qt.TextFormat.PlainText)
         self.outline_width = 1
         self._font: Optional[QFont] = None  # Will be initialized in initAssets
         self.initAssets()
@@ -93,10 +100,16 @@ class QDMGraphicsSocket(QGraphicsItem):
     def setText(self, text: str) -> None:
         """Set the text to display inside socket"""
         self._text = text
+        self._static_text.setText(text)
+        self._static_text.prepare(QTransform(), self._font)
         self.update()
 
     def paint(self, painter, QStyleOptionGraphicsItem, widget=None) -> None:
-        """Painting a circle"""
+        """Painting a circle. Nothing is painted below :attr:`lod_hidden` and the text below :attr:`lod_text`"""
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < self.lod_hidden:
+            return
+
         painter.setBrush(self._brush)
         painter.setPen(
             self._pen if not self.isHighlighted else self._pen_highlight)
@@ -104,24 +117,13 @@ class QDMGraphicsSocket(QGraphicsItem):
                             2 * self.radius, 2 * self.radius)
 
         # Draw text if present
-        if self._text:
-            # painter.setFont(self._font)
+        if self._text and lod >= self.lod_text:
             painter.setFont(self._font)
             painter.setPen(self._pen_text)
 
-            # Create text rect slightly smaller than socket for padding
-            text_rect = QRectF(
-                -self.radius + 1,  # Add 1px padding
-                -self.radius + 1,  # Add 1px padding
-                2 * (self.radius - 1),  # Remove 2px for padding
-                2 * (self.radius - 1)   # Remove 2px for padding
-            )
             # Draw centered text
-            painter.drawText(
-                text_rect,
-                Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter,
-                self._text
-            )
+            size = self._static_text.size()
+            painter.drawStaticText(QPointF(-size.width() / 2, -size.height() / 2), self._static_text)
 
     def boundingRect(self) -> QRectF:
         """Defining Qt' bounding rectangle"""
@@ -3,12 +3,13 @@
 A module containing `Graphics View` for NodeEditor
 """
 from qtpy.QtWidgets import QGraphicsView, QApplication, QWidget, QGraphicsItem
-from qtpy.QtCore import Signal, QPoint, Qt, QEvent, QPointF, QRectF
-from qtpy.QtGui import QPainter, QDragEnterEvent, QDropEvent, QMouseEvent, QKeyEvent, QWheelEvent, QInputEvent
+from qtpy.QtCore import Signal, QPoint, Qt, QEvent, QPointF, QRect, QRectF
+from qtpy.QtGui import QPainter, QPainterPath, QDragEnterEvent, QDropEvent, QMouseEvent, QKeyEvent, QWheelEvent, QInputEvent
 
 from nodeeditor import _QT_API_NAME as QT_API
 from nodeeditor.node_graphics_socket import QDMGraphicsSocket
 from nodeeditor.node_graphics_edge import QDMGraphicsEdge
+from nodeeditor.node_graphics_edge_layer import QDMGraphicsEdgeLayer
 from nodeeditor.node_edge_dragging import EdgeDragging
 from nodeeditor.node_edge_rerouting import EdgeRerouting
 from nodeeditor.node_edge_intersect import EdgeIntersect
@@ -111,6 +112,7 @@ class QDMGraphicsView(QGraphicsView):
         # listeners
         self._drag_enter_listeners: list = []
         self._drop_listeners: list = []
+        self._viewport_changed_listeners: list = []
 
     def initUI(self) -> None:
         """Set up this ``QGraphicsView``"""
@@ -125,6 +127,7 @@ class QDMGraphicsView(QGraphicsView):
 
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.setDragMode(QGraphicsView.RubberBandDrag)
+        self.rubberBandChanged.connect(self.onRubberBandChanged)
 
         # enable dropping
         self.setAcceptDrops(True)
@@ -163,6 +166,51 @@ class QDMGraphicsView(QGraphicsView):
         """
         self._drop_listeners.append(callback)
 
+    def addViewportChangedListener(self, callback: 'function') -> None:
+        """
+        Register callback for `Viewport Changed` event, triggered when the visible area of the `Scene` was
+        scrolled or zoomed
+
+        :param callback: callback function
+        """
+        self._viewport_changed_listeners.append(callback)
+
+    def onViewportChanged(self) -> None:
+        """Trigger our registered `Viewport Changed` events"""
+        if self.scene() is not None:
+            self.grScene.updateDetailsVisibility()
+            self.grScene.scheduleContentCulling()
+        for callback in self._viewport_changed_listeners:
+            callback()
+
+    def resizeEvent(self, event) -> None:
+        """overridden Qt's ``resizeEvent``. Triggers `Viewport Changed` event"""
+        super().resizeEvent(event)
+        self.onViewportChanged()
+
+    def showEvent(self, event) -> None:
+        """overridden Qt's ``showEvent``. Triggers `Viewport Changed` event"""
+        super().showEvent(event)
+        self.onViewportChanged()
+        if self.scene() is not None:
+            # do not wait with the culling for the first paint of the view
+            self.grScene.updateContentCulling()
+
+    def scrollContentsBy(self, dx: int, dy: int) -> None:
+        """overridden Qt's ``scrollContentsBy``. Triggers `Viewport Changed` event"""
+        super().scrollContentsBy(dx, dy)
+        self.onViewportChanged()
+
+    def onRubberBandChanged(self, rect: QRect, from_point: QPointF, to_point: QPointF) -> None:
+        """Promote batched `Edges` touched by the rubber band to items, so Qt can select them"""
+        batch = self.grScene.edge_batch
+        if batch is None or rect.isNull():
+            return
+        path = QPainterPath()
+        path.addPolygon(self.mapToScene(rect))
+        for grEdge in batch.getEdges(path):
+            batch.promote(grEdge)
+
     def mousePressEvent(self, event: Optional[QMouseEvent]) -> None:
         """Dispatch Qt's mousePress event to corresponding function below"""
         if event is None:
@@ -631,6 +679,11 @@ class QDMGraphicsView(QGraphicsView):
         """
         pos = event.pos()
         obj = self.itemAt(pos)
+        if isinstance(obj, QDMGraphicsEdgeLayer):
+            # clicked on a batched edge, which was not hovered before
+            obj = obj.getEdgeAt(self.mapToScene(pos))
+            if obj is not None:
+                obj.edge.scene.grScene.edge_batch.promote(obj)
         return obj
 
     def distanceBetweenClickAndReleaseIsOff(self, event: QMouseEvent) -> bool:
@@ -665,6 +718,7 @@ class QDMGraphicsView(QGraphicsView):
         # set scene scale
         if not clamped or self.zoomClamp is False:
             self.scale(zoomFactor, zoomFactor)
+            self.onViewportChanged()
 
     def wheelEvent(self, event: Optional[QWheelEvent]) -> None:
         """overridden Qt's ``wheelEvent``. This handles zooming"""
@@ -7,10 +7,11 @@ from qtpy.QtCore import QObject
 from nodeeditor.node_graphics_node import QDMGraphicsNode
 from nodeeditor.node_content_widget import QDMNodeContentWidget
 from nodeeditor.node_serializable import Serializable
+from nodeeditor.node_result_cache import hashValue
 from nodeeditor.node_socket import Socket, LEFT_BOTTOM, LEFT_CENTER, LEFT_TOP, RIGHT_BOTTOM, RIGHT_CENTER, RIGHT_TOP
 from nodeeditor.utils_no_qt import dumpException, pp
 
-from typing import TYPE_CHECKING, List, Optional, Tuple, Any, Union
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Tuple, Any, Union
 
 
 if TYPE_CHECKING:
@@ -30,6 +31,23 @@ class Node(QObject,  Serializable):
     NodeContent_class = QDMNodeContentWidget
     Socket_class = Socket
 
+    #: maximum number of `Nodes` of this class evaluated asynchronously at the same time. ``None`` means unlimited
+    eval_concurrency: Optional[int] = None
+    #: time budget in seconds for evaluation of this `Node`. Asynchronous evaluation is cancelled when it runs out,
+    #: synchronous evaluation is interrupted at the next :func:`checkCancelled`. ``None`` means no limit
+    eval_timeout: Optional[float] = None
+    #: ``True`` if this `Node` consumes results (i.e. displays them), so it is always evaluated in lazy mode
+    eval_sink: bool = False
+    #: ``False`` if two `Nodes` of this class with the same content and inputs can compute different values
+    #: (i.e. random numbers or reading files), so they never share results during evaluation
+    eval_shareable: bool = True
+    #: Python expression computing the value of this `Node` from its inputs ``{0}``, ``{1}``... inlined by
+    #: the :class:`~nodeeditor.node_graph_compiler.GraphCompiler`. ``None`` to use :func:`getCompiledOperation`
+    compile_expression: Optional[str] = None
+    #: ``True`` if the compiled operation or expression of this `Node` works on whole NumPy arrays. Otherwise it is
+    #: applied to each row separately in batch mode
+    array_safe: bool = False
+
     def __init__(self, scene: 'Scene', title: str = "Undefined Node", inputs: list = [], outputs: list = [], input_text: list = [], output_text: list = []) -> None:
         """
 
@@ -44,7 +62,7 @@ class Node(QObject,  Serializable):
 
             - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
             - **grNode** - Instance of :class:`~nodeeditor.node_graphics_node.QDMGraphicsNode` handling graphical representation in the ``QGraphicsScene``. Automatically created in the constructor
-            - **content** - Instance of :class:`~nodeeditor.node_graphics_content.QDMGraphicsContent` which is child of ``QWidget`` representing container for all inner widgets inside of the Node. Automatically created in the constructor
+            - **content** - Instance of :class:`~nodeeditor.node_graphics_content.QDMGraphicsContent` which is child of ``QWidget`` representing container for all inner widgets inside of the Node, or widget-free :class:`~nodeeditor.node_painted_content.QDMPaintedContent`. Automatically created in the constructor
             - **inputs** - list containin Input :class:`~nodeeditor.node_socket.Socket` instances
             - **outputs** - list containin Output :class:`~nodeeditor.node_socket.Socket` instances
 
@@ -74,6 +92,7 @@ class Node(QObject,  Serializable):
         # dirty and evaluation
         self._is_dirty = False
         self._is_invalid = False
+        self._is_frozen = False
 
     def __str__(self) -> str:
         return "<%s:%s %s..%s>" % (self.title, self.__class__.__name__, hex(id(self))[2:5], hex(id(self))[-3:])
@@ -114,11 +133,9 @@ class Node(QObject,  Serializable):
         self.grNode.setPos(x, y)
         for inputs in self.inputs:
             for edge in inputs.edges:
-                edge.grEdge.calcPath()
                 edge.updatePositions()
         for outputs in self.outputs:
             for edge in outputs.edges:
-                edge.grEdge.calcPath()
                 edge.updatePositions()
 
     def initInnerClasses(self) -> None:
@@ -235,6 +252,16 @@ class Node(QObject,  Serializable):
         self.markDirty()
         self.markDescendantsDirty()
 
+    def onContentChanged(self, *args) -> None:
+        """Event handling when the content widget of this `Node` changed its value (i.e. connect ``textChanged``
+        of a ``QLineEdit`` here). The `Node` is marked `Dirty` and its evaluation is debounced, so rapid changes
+        are evaluated once with the latest value. See
+        :func:`~nodeeditor.node_scene_evaluator.SceneEvaluator.scheduleEvaluation`
+        """
+        self.grNode.content_snapshot.invalidate()
+        self.markDirty()
+        self.scene.evaluator.scheduleEvaluation([self])
+
     def onDeserialized(self, data: dict) -> None:
         """Event manually called when this node was deserialized. Currently called when node is deserialized from scene
         Passing `data` containing the data which have been deserialized """
@@ -369,6 +396,13 @@ class Node(QObject,  Serializable):
         :param new_value: ``True`` if this `Node` should be `Dirty`. ``False`` if you want to un-dirty this `Node`
         :type new_value: ``bool``
         """
+        if new_value and self.isFrozen() and not self._is_dirty:
+            # frozen node keeps its pinned values
+            return
+        if self._is_dirty != new_value and self.grNode is not None:
+            # the state is painted, so the cached Graphics Node and the content snapshot have to be redrawn
+            self.grNode.update()
+            self.grNode.content_snapshot.invalidate()
         self._is_dirty = new_value
         if self._is_dirty:
             self.onMarkedDirty()
@@ -393,9 +427,39 @@ class Node(QObject,  Serializable):
         :type new_value: ``bool``
         """
         for other_node in self.getChildrenNodes():
+            if new_value and other_node.isFrozen():
+                # dirtiness does not cross frozen nodes
+                continue
             other_node.markDirty(new_value)
             other_node.markDescendantsDirty(new_value)
 
+    def isFrozen(self) -> bool:
+        """Is this node `Frozen`? Frozen `Node` keeps its last evaluated values regardless of changes upstream
+
+        :return: ``True`` if `Node` is `Frozen`
+        :rtype: ``bool``
+        """
+        return self._is_frozen
+
+    def setFrozen(self, new_value: bool = True) -> None:
+        """Freeze this `Node`, so its last values are pinned. Changes upstream do not make it `Dirty` and
+        they do not propagate through it, so the evaluator skips the whole upstream cone when evaluating
+        the descendants. Unfrozen `Node` is marked `Dirty`, so it catches up with the changes it missed
+
+        :param new_value: ``True`` to freeze this `Node`. ``False`` to unfreeze it
+        :type new_value: ``bool``
+        """
+        if self._is_frozen == new_value:
+            return
+        self._is_frozen = new_value
+        if not self._is_frozen:
+            self.markDirty()
+        self.onFrozenChanged()
+
+    def onFrozenChanged(self) -> None:
+        """Called when this `Node` has been frozen or unfrozen"""
+        self.grNode.update()
+
     def isInvalid(self) -> bool:
         """Is this node marked as `Invalid`?
 
@@ -410,6 +474,9 @@ class Node(QObject,  Serializable):
         :param new_value: ``True`` if this `Node` should be `Invalid`. ``False`` if you want to make this `Node` valid
         :type new_value: ``bool``
         """
+        if self._is_invalid != new_value and self.grNode is not None:
+            self.grNode.update()
+            self.grNode.content_snapshot.invalidate()
         self._is_invalid = new_value
         if self._is_invalid:
             self.onMarkedInvalid()
@@ -443,11 +510,105 @@ class Node(QObject,  Serializable):
         self.markInvalid(False)
         return 0
 
+    def checkCancelled(self) -> None:
+        """Call this from time to time in a long running evaluation. Raises an exception, which interrupts the
+        evaluation, if the evaluation run was cancelled (i.e. the inputs changed again) or if the time budget of
+        this `Node` (:attr:`eval_timeout`) or of the whole run is exhausted
+
+        :raises ~nodeeditor.node_cancellation.EvaluationCancelled: if the evaluation run was cancelled
+        :raises ~nodeeditor.node_cancellation.EvaluationTimeout: if the time budget is exhausted
+        """
+        self.scene.evaluator.checkCancelled(self)
+
     def evalChildren(self) -> None:
-        """Evaluate all children of this `Node`"""
+        """Evaluate all children of this `Node`. Does nothing while the `Scene` evaluator is running, because
+        the :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` evaluates the children itself, and in lazy
+        mode, where children are evaluated only when something asks for them"""
+        if self.scene.evaluator.is_evaluating or self.scene.evaluator.lazy:
+            return
         for node in self.getChildrenNodes():
             node.eval()
 
+    def serializeValues(self) -> Any:
+        """Return evaluated values of this `Node`, so they can be cached by the
+        :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` and restored later with
+        :func:`~nodeeditor.node_node.Node.deserializeValues`. Returning ``None`` (default) means that the values
+        of this `Node` are never cached. The returned values must not be modified in place afterwards
+
+        :return: evaluated values of this `Node` or ``None``
+        """
+        return None
+
+    def deserializeValues(self, values: Any) -> bool:
+        """Restore evaluated values of this `Node` previously returned by
+        :func:`~nodeeditor.node_node.Node.serializeValues` instead of evaluating it again. Override this to update
+        everything the evaluation would update (i.e. displayed labels)
+
+        :param values: values previously returned by :func:`~nodeeditor.node_node.Node.serializeValues`
+        :return: ``True`` if the values were restored
+        :rtype: ``bool``
+        """
+        return False
+
+    def setValue(self, value: str) -> bool:
+        """Set the parameter of this `Node` (i.e. the value of an input `Node`) from its text representation.
+        Used to set values of headlessly evaluated graphs from the command line, see :mod:`nodeeditor.node_headless`.
+        Override this in `Nodes` which have a parameter
+
+        :param value: text representation of the value
+        :type value: ``str``
+        :return: ``True`` if the value was set
+        :rtype: ``bool``
+        """
+        return False
+
+    def getCompiledOperation(self) -> Optional[Callable]:
+        """Return a pure function used by the :class:`~nodeeditor.node_graph_compiler.GraphCompiler` to evaluate
+        this `Node`. It gets the values connected to the `Inputs` as positional arguments (``None`` for unconnected
+        `Inputs`) and returns a list with one value per `Output` (one value if the `Node` has no `Outputs`).
+        Everything the result depends on besides the inputs must be serialized by the `Node` content, so the
+        compiled function is recompiled when it changes.
+
+        :return: the operation or ``None`` if this `Node` can't be compiled
+        """
+        return None
+
+    def process(self, *inputs: Optional[Iterator]) -> Optional[Iterator]:
+        """Streaming evaluation of this `Node`, see :class:`~nodeeditor.node_stream.StreamRunner`. Gets one iterator
+        of chunks per `Input` (``None`` for unconnected `Inputs`) and should be a generator yielding chunks of the
+        output (a sequence with one chunk per `Output` if there are more `Outputs`). Keep only the chunks you
+        need, so the memory use does not depend on the size of the data
+
+        :return: generator of output chunks or ``None`` if this `Node` does not support streaming
+        """
+        return None
+
+    def valuesEqual(self, old_values: Any, new_values: Any) -> bool:
+        """Compare values returned by :func:`~nodeeditor.node_node.Node.serializeValues` before and after
+        the evaluation. When they are equal, the :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` does not
+        propagate the change to the children of this `Node`. By default the values are compared by their hash.
+        Override this if your values need a different equality (i.e. tolerance for floats)
+
+        :param old_values: values before the evaluation
+        :param new_values: values after the evaluation
+        :return: ``True`` if the values are equal
+        :rtype: ``bool``
+        """
+        return hashValue(old_values) == hashValue(new_values)
+
+    async def evalAsync(self) -> Any:
+        """Asynchronously evaluate this `Node`. Awaits :func:`~nodeeditor.node_node.Node.evalImplementationAsync`
+        and resets the `Dirty` and `Invalid` flags when it finished without an error. See :ref:`evaluation` for more"""
+        value = await self.evalImplementationAsync()
+        self.markDirty(False)
+        self.markInvalid(False)
+        return value
+
+    async def evalImplementationAsync(self) -> Any:
+        """Asynchronous evaluation of this `Node`. Override this with your ``async def`` implementation for
+        I/O-bound `Nodes`. By default the synchronous :func:`~nodeeditor.node_node.Node.eval` is called"""
+        return self.eval()
+
     # traversing nodes functions
 
     def getChildrenNodes(self) -> 'List[Node]':
@@ -466,6 +627,21 @@ class Node(QObject,  Serializable):
                 other_nodes.append(other_node)
         return other_nodes
 
+    def getParentNodes(self) -> 'List[Node]':
+        """
+        Retreive all first-level parents connected to this `Node` `Inputs`
+
+        :return: list of `Nodes` connected to this `Node` from all `Inputs`
+        :rtype: List[:class:`~nodeeditor.node_node.Node`]
+        """
+        other_nodes = []
+        for socket in self.inputs:
+            for edge in socket.edges:
+                other_socket = edge.getOtherSocket(socket)
+                if other_socket is not None:
+                    other_nodes.append(other_socket.node)
+        return other_nodes
+
     def getInput(self, index: int = 0) -> Optional['Node']:
         """
         Get the **first**  `Node` connected to the  Input specified by `index`
@@ -571,7 +747,7 @@ class Node(QObject,  Serializable):
             outputs.append(socket.serialize())
         ser_content = self.content.serialize() if isinstance(
             self.content, Serializable) else {}
-        return OrderedDict([
+        res = OrderedDict([
             ('id', self.id),
             ('title', self.title),
             ('pos_x', self.grNode.scenePos().x()),
@@ -580,6 +756,11 @@ class Node(QObject,  Serializable):
             ('outputs', outputs),
             ('content', ser_content),
         ])
+        if self.isFrozen():
+            # pinned values are stored with the graph, so they survive reopening the file
+            res['frozen'] = True
+            res['values'] = self.serializeValues()
+        return res
 
     def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True, *args, **kwargs) -> bool:
         try:
@@ -648,8 +829,28 @@ class Node(QObject,  Serializable):
 
         # also deserialize the content of the node
         # so far the rest was ok, now as last step the content...
+        res = True
         if isinstance(self.content, Serializable):
             res = self.content.deserialize(data['content'], hashmap)
-            return res
+            self.grNode.content_snapshot.invalidate()
+
+        self.deserializeFrozen(data)
+        return res
 
-        return True
+    def deserializeFrozen(self, data: dict) -> None:
+        """Restore the frozen state and the pinned values of this `Node`. Frozen `Node` whose values can't be
+        restored stays `Dirty`, so it is evaluated once and then keeps the new values
+
+        :param data: serialized `Node`
+        """
+        if not data.get('frozen', False):
+            self._is_frozen = False
+            return
+        self._is_frozen = True
+        if data.get('values') is not None and self.deserializeValues(data['values']):
+            self.markDirty(False)
+            self.markInvalid(False)
+            self.scene.evaluator.rememberValues(self)
+        else:
+            self._is_dirty = True
+        self.onFrozenChanged()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the base class for `Node` content which is painted by the `Graphics Node` instead of being
+a ``QWidget``.
+
+Every :class:`~nodeeditor.node_content_widget.QDMNodeContentWidget` is a ``QWidget`` with a layout and a style
+sheet, embedded into the ``QGraphicsScene`` by a ``QGraphicsProxyWidget``. That is a lot of memory and construction
+time for content which only shows a label or a value. :class:`QDMPaintedContent` is a plain python object drawn
+in the paint pass of its `Graphics Node`, so no widget and no proxy are created. A real editor widget is created
+only while the content is being edited, after it is double-clicked (see :attr:`QDMPaintedContent.editable`).
+
+The content is serialized the same way as the content widgets, so a `Node` can switch its ``NodeContent_class``
+without changing the saved files.
+"""
+from collections import OrderedDict
+from nodeeditor.node_serializable import Serializable
+from qtpy.QtWidgets import QWidget, QLineEdit
+from qtpy.QtGui import QFont, QColor, QPen, QStaticText, QTransform
+from qtpy.QtCore import Qt, QRectF, QPointF, QSizeF, QMarginsF
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from qtpy.QtWidgets import QGraphicsProxyWidget
+    from nodeeditor.node_node import Node
+
+
+class QDMPaintedContent(Serializable):
+    """Base class for widget-free content of a :class:`~nodeeditor.node_node.Node`. It paints a single line of
+    text into its geometry. Override :func:`initUI` to set up the text and the font and :func:`paint` to draw
+    anything else"""
+
+    #: ``True`` if double-clicking the content opens an editor created by :func:`createEditor`
+    editable: bool = False
+
+    def __init__(self, node: 'Node') -> None:
+        """
+        :param node: reference to the :py:class:`~nodeeditor.node_node.Node`
+        :type node: :py:class:`~nodeeditor.node_node.Node`
+
+        :Instance Attributes:
+            - **node** - reference to the :class:`~nodeeditor.node_node.Node`
+            - **font** - ``QFont`` of the text
+            - **color** - ``QColor`` of the text
+            - **alignment** - ``Qt.Alignment`` of the text inside of the geometry
+            - **margins** - ``QMarginsF`` between the geometry and the text
+            - **editor_proxy** - ``QGraphicsProxyWidget`` of the open editor or ``None``
+        """
+        self.node = node
+        super().__init__()
+
+        self._rect = QRectF()
+        self._text = ""
+        self._static_text = QStaticText()
+        self._static_text.setTextFormat(Qt.TextFormat.PlainText)
+        self._pen = QPen()
+
+        self.font = QFont()
+        self.color = QColor("#e0e0e0")
+        self.alignment = Qt.AlignmentFlag.AlignCenter
+        self.margins = QMarginsF()
+        self.editor_proxy: Optional['QGraphicsProxyWidget'] = None
+
+        self.initUI()
+
+    def initUI(self) -> None:
+        """Set up the text, the font and the colors of this content"""
+        self.setText("")
+
+    def text(self) -> str:
+        """Return the painted text"""
+        return self._text
+
+    def setText(self, text: str) -> None:
+        """Set the painted text. The text is laid out once into ``QStaticText``
+
+        :param text: new text
+        :type text: ``str``
+        """
+        self._text = text
+        self._static_text.setText(text)
+        self._static_text.prepare(QTransform(), self.font)
+        self.update()
+
+    def setFont(self, font: QFont) -> None:
+        """Set the font of the text
+
+        :param font: new font
+        :type font: ``QFont``
+        """
+        self.font = font
+        self.setText(self._text)
+
+    def setGeometry(self, x: float, y: float, width: float, height: float) -> None:
+        """Place the content in the `Graphics Node` coordinates. Called by the `Graphics Node`, like
+        ``QWidget.setGeometry``"""
+        self._rect = QRectF(x, y, width, height)
+        if self.editor_proxy is not None:
+            self.editor_proxy.setGeometry(self._rect)
+
+    def geometry(self) -> QRectF:
+        """Return rectangle of the content in the `Graphics Node` coordinates"""
+        return QRectF(self._rect)
+
+    def width(self) -> float:
+        return self._rect.width()
+
+    def height(self) -> float:
+        return self._rect.height()
+
+    def size(self) -> QSizeF:
+        return self._rect.size()
+
+    def update(self) -> None:
+        """Repaint the `Graphics Node` with this content"""
+        grNode = getattr(self.node, 'grNode', None)
+        if grNode is not None:
+            grNode.update()
+
+    def paint(self, painter) -> None:
+        """Paint the text aligned inside of the geometry. Nothing is painted while the editor is open"""
+        if self.editor_proxy is not None or not self._text:
+            return
+        rect = self._rect.marginsRemoved(self.margins)
+        size = self._static_text.size()
+
+        if self.alignment & Qt.AlignmentFlag.AlignLeft:
+            x = rect.left()
+        elif self.alignment & Qt.AlignmentFlag.AlignRight:
+            x = rect.right() - size.width()
+        else:
+            x = rect.left() + (rect.width() - size.width()) / 2
+        if self.alignment & Qt.AlignmentFlag.AlignTop:
+            y = rect.top()
+        elif self.alignment & Qt.AlignmentFlag.AlignBottom:
+            y = rect.bottom() - size.height()
+        else:
+            y = rect.top() + (rect.height() - size.height()) / 2
+
+        self._pen.setColor(self.color)
+        painter.setFont(self.font)
+        painter.setPen(self._pen)
+        painter.drawStaticText(QPointF(x, y), self._static_text)
+
+    def createEditor(self) -> Optional[QWidget]:
+        """Create the widget editing this content. The default editor is a ``QLineEdit`` with the text. Override it
+        together with :func:`commitEditor` for other values
+
+        :return: new editor widget or ``None`` if this content is not :attr:`editable`
+        :rtype: ``QWidget`` or ``None``
+        """
+        if not self.editable:
+            return None
+        editor = QLineEdit(self._text)
+        editor.setFont(self.font)
+        editor.selectAll()
+        return editor
+
+    def commitEditor(self, editor: QWidget) -> None:
+        """Store the value of the `editor` into this content and notify the `Node`, see
+        :func:`~nodeeditor.node_node.Node.onContentChanged`
+
+        :param editor: the editor created by :func:`createEditor`
+        :type editor: ``QWidget``
+        """
+        if editor.text() != self._text:
+            self.setText(editor.text())
+            self.node.onContentChanged()
+
+    def isEditing(self) -> bool:
+        """Is the editor open?"""
+        return self.editor_proxy is not None
+
+    def openEditor(self) -> bool:
+        """Create the editor over this content and give it the keyboard focus. The editor is committed and closed
+        when it loses the focus or `Enter` is pressed
+
+        :return: ``True`` if the editor was opened
+        :rtype: ``bool``
+        """
+        if self.editor_proxy is not None:
+            return True
+        editor = self.createEditor()
+        if editor is None:
+            return False
+
+        self.editor_proxy = self.node.scene.grScene.addWidget(editor)
+        self.editor_proxy.node = self.node
+        self.editor_proxy.setParentItem(self.node.grNode)
+        self.editor_proxy.setGeometry(self._rect)
+        if hasattr(editor, 'editingFinished'):
+            editor.editingFinished.connect(self.closeEditor)
+
+        self.setEditingFlag(True)
+        self.editor_proxy.setFocus()
+        editor.setFocus()
+        self.update()
+        return True
+
+    def closeEditor(self, commit: bool = True) -> None:
+        """Close the editor and delete it
+
+        :param commit: ``True`` to store the value of the editor, see :func:`commitEditor`
+        :type commit: ``bool``
+        """
+        proxy = self.editor_proxy
+        if proxy is None:
+            return
+        # editingFinished is emitted again when the hidden editor loses the focus
+        self.editor_proxy = None
+        if commit:
+            self.commitEditor(proxy.widget())
+        self.setEditingFlag(False)
+        # can be called from the focus out event of the editor, delete it later
+        proxy.hide()
+        proxy.deleteLater()
+        self.update()
+
+    def setEditingFlag(self, value: bool) -> None:
+        """Helper function which sets editingFlag inside :py:class:`~nodeeditor.node_graphics_view.QDMGraphicsView`,
+        so the keys pressed in the editor do not delete the selected items. See
+        :func:`~nodeeditor.node_content_widget.QDMNodeContentWidget.setEditingFlag`"""
+        if self.node.scene.grScene.views():
+            self.node.scene.getView().editingFlag = value
+
+    def serialize(self) -> OrderedDict:
+        return OrderedDict([
+        ])
+
+    def deserialize(self, data: dict, hashmap: dict = {}, restore_id: bool = True) -> bool:
+        return True
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the evaluation profiler, which records how long each `Node` took to evaluate, how often it was
+evaluated or restored from the cache and how big its values are.
+
+The profiler is owned by the :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` and is disabled by default::
+
+    scene.evaluator.profiler.enabled = True
+    scene.evaluator.profiler.show_heatmap = True
+    scene.evaluator.evaluate()
+    scene.evaluator.profiler.saveChromeTrace("trace.json")
+
+Recorded runs can be exported as JSON (:func:`EvaluationProfiler.saveJson`) or in the Chrome trace event format
+(:func:`EvaluationProfiler.saveChromeTrace`), which can be opened in ``chrome://tracing`` or Perfetto.
+"""
+import os
+import sys
+import time
+import threading
+import orjson as json
+from collections import OrderedDict, deque
+
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from nodeeditor.node_scene import Scene
+    from nodeeditor.node_node import Node
+
+
+DEBUG = False
+
+#: default number of evaluation runs kept by the :class:`EvaluationProfiler`
+DEFAULT_MAX_RUNS = 20
+
+#: `Node` was evaluated
+EVENT_EVAL = "eval"
+#: `Node` values were restored from the result cache
+EVENT_CACHE_HIT = "cache"
+#: `Node` values were shared from an identical `Node`
+EVENT_SHARED = "shared"
+
+
+def estimateValueSize(value: Any) -> int:
+    """
+    Cheaply estimate the size of `value` in bytes. Buffers count their ``nbytes``, strings and bytes their length
+    and items of lists and tuples are estimated the same way without descending into nested containers, so
+    recording an evaluation never walks the whole value like :func:`~nodeeditor.node_result_cache.getValueSize`
+
+    :param value: value to measure
+    :return: approximate size in bytes
+    :rtype: ``int``
+    """
+    if isinstance(value, (list, tuple)):
+        return sum(getShallowSize(item) for item in value)
+    return getShallowSize(value)
+
+
+def getShallowSize(value: Any) -> int:
+    """Return ``nbytes`` of buffers, length of strings and bytes and ``sys.getsizeof`` of anything else"""
+    if value is None:
+        return 0
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class ProfiledRun():
+    """Profiling data of one evaluation run"""
+
+    def __init__(self, index: int) -> None:
+        """
+        :param index: sequential number of the run
+
+        :Instance Attributes:
+
+        - **index** - sequential number of the run
+        - **start** - ``time.perf_counter()`` value when the run started
+        - **duration** - wall time of the run in seconds
+        - **events** - list of ``(node_id, title, class name, kind, start, duration, output size, thread id)``
+          tuples, one for every `Node` evaluation
+        """
+        self.index = index
+        self.start: float = time.perf_counter()
+        self.duration: float = 0.0
+        self.events: List[tuple] = []
+
+    def getNodeStats(self) -> Dict[int, OrderedDict]:
+        """Aggregate the events of this run per `Node`
+
+        :return: dict mapping `Node` ids to their wall time, call count, cache hits and output size
+        """
+        stats: Dict[int, OrderedDict] = OrderedDict()
+        for node_id, title, class_name, kind, _, duration, size, _ in self.events:
+            item = stats.get(node_id)
+            if item is None:
+                item = stats[node_id] = OrderedDict([
+                    ('id', node_id),
+                    ('title', title),
+                    ('class', class_name),
+                    ('wall_time', 0.0),
+                    ('calls', 0),
+                    ('cache_hits', 0),
+                    ('output_size', 0),
+                ])
+            item['wall_time'] += duration
+            if kind == EVENT_EVAL:
+                item['calls'] += 1
+            else:
+                item['cache_hits'] += 1
+            item['output_size'] = size
+        return stats
+
+    def serialize(self) -> OrderedDict:
+        return OrderedDict([
+            ('run', self.index),
+            ('duration', self.duration),
+            ('nodes', list(self.getNodeStats().values())),
+        ])
+
+
+class EvaluationProfiler():
+    """Records per `Node` evaluation statistics of the :class:`~nodeeditor.node_scene.Scene`"""
+
+    def __init__(self, scene: 'Scene', max_runs: int = DEFAULT_MAX_RUNS) -> None:
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+        :param max_runs: number of recorded runs to keep
+        :type max_runs: ``int``
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        - **enabled** - ``True`` if evaluation runs are recorded
+        - **show_heatmap** - ``True`` to tint the `Nodes` by their wall time in the last run
+        - **runs** - recorded :class:`ProfiledRun` instances, the oldest are dropped
+        """
+        self.scene = scene
+        self.enabled: bool = False
+        self._show_heatmap: bool = False
+        self.runs: Deque[ProfiledRun] = deque(maxlen=max_runs)
+
+        self._current: Optional[ProfiledRun] = None
+        self._run_count: int = 0
+        # wall time of each node in the last run relative to the slowest one: node id -> 0..1
+        self._heat: Dict[int, float] = {}
+
+    @property
+    def show_heatmap(self) -> bool:
+        """``True`` if the `Nodes` are tinted by their wall time in the last recorded run
+
+        :getter: current state of the heatmap
+        :setter: shows or hides the heatmap and repaints the `Nodes`
+        :type: ``bool``
+        """
+        return self._show_heatmap
+
+    @show_heatmap.setter
+    def show_heatmap(self, value: bool) -> None:
+        self._show_heatmap = value
+        self.updateNodes()
+
+    def startRun(self) -> None:
+        """Start recording a new evaluation run"""
+        if not self.enabled:
+            return
+        self._run_count += 1
+        self._current = ProfiledRun(self._run_count)
+
+    def finishRun(self) -> None:
+        """Finish the recorded evaluation run and update the heatmap"""
+        run, self._current = self._current, None
+        if run is None:
+            return
+        run.duration = time.perf_counter() - run.start
+        self.runs.append(run)
+
+        stats = run.getNodeStats()
+        slowest = max([item['wall_time'] for item in stats.values()] + [0.0])
+        self._heat = {node_id: item['wall_time'] / slowest if slowest > 0 else 0.0
+                      for node_id, item in stats.items()}
+        if DEBUG:
+            print("EvaluationProfiler: run %d took %.3fms" % (run.index, run.duration * 1000))
+        if self.show_heatmap:
+            self.updateNodes()
+
+    def recordNode(self, node: 'Node', kind: str, start: float, duration: float) -> None:
+        """Record one evaluation of `node` in the current run
+
+        :param node: evaluated :class:`~nodeeditor.node_node.Node`
+        :param kind: ``EVENT_EVAL``, ``EVENT_CACHE_HIT`` or ``EVENT_SHARED``
+        :param start: ``time.perf_counter()`` value when the evaluation started
+        :param duration: wall time of the evaluation in seconds
+
+        The output size is only estimated by :func:`estimateValueSize`, so recording stays cheap for big values
+        """
+        if self._current is None:
+            return
+        size = estimateValueSize(node.serializeValues())
+        self._current.events.append((node.id, node.title, node.__class__.__name__, kind, start, duration, size,
+                                     threading.get_ident()))
+
+    def getLastRun(self) -> Optional[ProfiledRun]:
+        """Return the last recorded :class:`ProfiledRun` or ``None``"""
+        return self.runs[-1] if self.runs else None
+
+    def getHeat(self, node: 'Node') -> float:
+        """Return wall time of `node` in the last recorded run relative to the slowest `Node` of the run
+
+        :param node: :class:`~nodeeditor.node_node.Node` of the `Scene`
+        :return: value from ``0.0`` (not evaluated or instant) to ``1.0`` (the slowest `Node`)
+        :rtype: ``float``
+        """
+        return self._heat.get(node.id, 0.0)
+
+    def updateNodes(self) -> None:
+        """Repaint the `Nodes`, so they show the current heatmap"""
+        for node in self.scene.nodes:
+            node.grNode.update()
+
+    def clear(self) -> None:
+        """Forget all recorded runs"""
+        self.runs.clear()
+        self._heat = {}
+        if self.show_heatmap:
+            self.updateNodes()
+
+    def serialize(self) -> OrderedDict:
+        return OrderedDict([
+            ('runs', [run.serialize() for run in self.runs]),
+        ])
+
+    def serializeChromeTrace(self) -> OrderedDict:
+        """Return recorded runs in the Chrome trace event format. Each run is one process, evaluations of the `Nodes`
+        are complete events on the threads which evaluated them
+
+        :return: trace events
+        :rtype: ``OrderedDict``
+        """
+        events: List[Any] = []
+        origin = self.runs[0].start if self.runs else 0.0
+        for run in self.runs:
+            events.append(OrderedDict([
+                ('name', 'process_name'), ('ph', 'M'), ('pid', run.index),
+                ('args', {'name': "run %d" % run.index}),
+            ]))
+            events.append(OrderedDict([
+                ('name', "run %d" % run.index), ('cat', 'run'), ('ph', 'X'), ('pid', run.index), ('tid', 0),
+                ('ts', (run.start - origin) * 1e6), ('dur', run.duration * 1e6),
+            ]))
+            for node_id, title, class_name, kind, start, duration, size, thread_id in run.events:
+                events.append(OrderedDict([
+                    ('name', "%s #%d" % (title, node_id)), ('cat', kind), ('ph', 'X'), ('pid', run.index),
+                    ('tid', thread_id), ('ts', (start - origin) * 1e6), ('dur', duration * 1e6),
+                    ('args', {'class': class_name, 'output_size': size}),
+                ]))
+        return OrderedDict([
+            ('traceEvents', events),
+            ('displayTimeUnit', 'ms'),
+        ])
+
+    def saveJson(self, filename: str) -> None:
+        """Save per `Node` statistics of the recorded runs to a JSON file
+
+        :param filename: file to write
+        """
+        with open(filename, "wb") as file:
+            file.write(json.dumps(self.serialize(), option=json.OPT_INDENT_2))
+
+    def saveChromeTrace(self, filename: str) -> None:
+        """Save the recorded runs to a file in the Chrome trace event format
+
+        :param filename: file to write
+        """
+        with open(filename, "wb") as file:
+            file.write(json.dumps(self.serializeChromeTrace()))
+        if DEBUG:
+            print("EvaluationProfiler: trace saved to", os.path.abspath(filename))
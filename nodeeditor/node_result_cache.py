@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the content-addressed cache of evaluated `Node` results and helper functions for computing
+stable hashes of evaluated values.
+
+Results are keyed by the `Node` class, the serialized `Node` content (parameters) and the hashes of the values
+connected to the `Node` inputs. Because the key does not depend on the `Node` instance, cached results survive
+re-creating the `Nodes` (i.e. undo/redo or re-opening a file).
+"""
+import sys
+import hashlib
+from collections import OrderedDict
+
+from typing import Any, Hashable, Optional
+
+
+DEBUG = False
+
+#: default maximum memory in bytes occupied by values stored in the :class:`ResultCache`
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+def hashValue(value: Any) -> str:
+    """
+    Compute a stable hash of `value`. The hash does not change between Python sessions, so it can be stored
+    in files. Lists, tuples, dicts, buffers and NumPy arrays are hashed by content, other objects by ``repr()``
+
+    :param value: value to hash
+    :return: hexadecimal digest
+    :rtype: ``str``
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    _updateHash(hasher, value)
+    return hasher.hexdigest()
+
+
+def _updateHash(hasher: Any, value: Any) -> None:
+    """Feed `value` into `hasher` recursively"""
+    if isinstance(value, (list, tuple)):
+        hasher.update(b'[' if isinstance(value, list) else b'(')
+        for item in value:
+            _updateHash(hasher, item)
+        hasher.update(b']')
+    elif isinstance(value, dict):
+        hasher.update(b'{')
+        for key in sorted(value, key=repr):
+            _updateHash(hasher, key)
+            _updateHash(hasher, value[key])
+        hasher.update(b'}')
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        hasher.update(b'b%d:' % len(data))
+        hasher.update(data)
+    elif hasattr(value, 'dtype') and hasattr(value, 'tobytes'):
+        # NumPy arrays and scalars
+        header = "a%s%s:" % (value.dtype, getattr(value, 'shape', ()))
+        hasher.update(header.encode('utf-8'))
+        hasher.update(value.tobytes())
+    else:
+        data = ("%s:%r" % (value.__class__.__name__, value)).encode('utf-8')
+        hasher.update(b'%d:' % len(data))
+        hasher.update(data)
+
+
+def getValueSize(value: Any) -> int:
+    """
+    Estimate memory occupied by `value` in bytes, including the items of containers and buffers of arrays
+
+    :param value: value to measure
+    :return: approximate size in bytes
+    :rtype: ``int``
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(getValueSize(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(getValueSize(key) + getValueSize(item) for key, item in value.items())
+    elif isinstance(value, memoryview):
+        size += value.nbytes
+    elif hasattr(value, 'nbytes') and getattr(value, 'base', None) is not None:
+        # views of NumPy arrays do not count the buffer they point to
+        size += value.nbytes
+    return size
+
+
+class ResultCache():
+    """Least recently used cache of evaluated `Node` values limited by the memory they occupy"""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        :param max_size: maximum memory in bytes occupied by cached values
+        :type max_size: ``int``
+
+        :Instance Attributes:
+
+        - **max_size** - maximum memory in bytes occupied by cached values
+        - **size** - memory in bytes currently occupied by cached values
+        - **hits** - number of successful lookups
+        - **misses** - number of failed lookups
+        """
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._items: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return cached value for `key` or ``None`` if there is no such value. The value becomes the most
+        recently used one
+
+        :param key: cache key
+        :return: cached value or ``None``
+        """
+        if key not in self._items:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return self._items[key][0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store `value` under `key` and evict the least recently used values if the cache is too big.
+        Values are stored by reference, so they must not be modified in place afterwards
+
+        :param key: cache key
+        :param value: value to store
+        """
+        self.remove(key)
+        value_size = getValueSize(value)
+        if value_size > self.max_size:
+            if DEBUG:
+                print("ResultCache: value for", key, "is too big to be cached:", value_size)
+            return
+
+        self._items[key] = (value, value_size)
+        self.size += value_size
+
+        while self.size > self.max_size:
+            _, (_, evicted_size) = self._items.popitem(last=False)
+            self.size -= evicted_size
+
+    def remove(self, key: Hashable) -> None:
+        """Remove value stored under `key` if there is any
+
+        :param key: cache key
+        """
+        if key in self._items:
+            _, value_size = self._items.pop(key)
+            self.size -= value_size
+
+    def clear(self) -> None:
+        """Remove all cached values"""
+        self._items.clear()
+        self.size = 0
@@ -5,7 +5,7 @@ A module containing the representation of the NodeEditor's Scene
 import os
 import sys
 import orjson as json
-from orjson import JSONDecodeError, OPT_INDENT_2
+from orjson import JSONDecodeError, OPT_INDENT_2, OPT_SERIALIZE_NUMPY
 from collections import OrderedDict
 from qtpy.QtCore import QRectF, Qt, QPoint
 from qtpy.QtWidgets import QGraphicsItem
@@ -16,6 +16,8 @@ from nodeeditor.node_node import Node
 from nodeeditor.node_edge import Edge
 from nodeeditor.node_scene_history import SceneHistory
 from nodeeditor.node_scene_clipboard import SceneClipboard
+from nodeeditor.node_scene_evaluator import SceneEvaluator
+from nodeeditor.node_graph_compiler import GraphCompiler
 
 from typing import TYPE_CHECKING, List, Optional, Tuple, Any, Callable, OrderedDict as OrderedDictType, Type
 
@@ -37,6 +39,8 @@ class Scene(Serializable):
     """Class representing NodeEditor's `Scene`"""
     historyClass = SceneHistory
     clipboardClass = SceneClipboard
+    evaluatorClass = SceneEvaluator
+    compilerClass = GraphCompiler
 
     def __init__(self) -> None:
         """
@@ -46,6 +50,8 @@ class Scene(Serializable):
             - **edges** - list of `Edges` in this `Scene`
             - **history** - Instance of :class:`~nodeeditor.node_scene_history.SceneHistory`
             - **clipboard** - Instance of :class:`~nodeeditor.node_scene_clipboard.SceneClipboard`
+            - **evaluator** - Instance of :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator`
+            - **compiler** - Instance of :class:`~nodeeditor.node_graph_compiler.GraphCompiler`
             - **scene_width** - width of this `Scene` in pixels
             - **scene_height** - height of this `Scene` in pixels
         """
@@ -61,6 +67,8 @@ class Scene(Serializable):
 
         # custom flag used to suppress triggering onItemSelected which does a bunch of stuff
         self._silent_selection_events: bool = False
+        # True while the Scene is restored from serialized data, i.e. loaded or restored from the history
+        self._is_deserializing: bool = False
 
         self._has_been_modified: bool = False
         self._last_selected_items: Optional[List[QGraphicsItem]] = None
@@ -78,6 +86,8 @@ class Scene(Serializable):
         self.initUI()
         self.history = self.historyClass(self)
         self.clipboard = self.clipboardClass(self)
+        self.evaluator = self.evaluatorClass(self)
+        self.compiler = self.compilerClass(self)
 
         self.grScene.itemSelected.connect(self.onItemSelected)
         self.grScene.itemsDeselected.connect(self.onItemsDeselected)
@@ -110,6 +120,12 @@ class Scene(Serializable):
         self.grScene = QDMGraphicsScene(self)
         self.grScene.setGrScene(self.scene_width, self.scene_height)
 
+    def isDeserializing(self) -> bool:
+        """``True`` while this `Scene` is restored from serialized data, i.e. loaded from a file or restored from
+        the history. Content changes made by the deserialization are not scheduled for evaluation, see
+        :func:`~nodeeditor.node_scene_evaluator.SceneEvaluator.scheduleEvaluation`"""
+        return self._is_deserializing
+
     def getNodeByID(self, node_id: int):
         """
         Find node in the scene according to provided `node_id`
@@ -318,7 +334,8 @@ class Scene(Serializable):
 
     def saveToFile(self, filename: str) -> None:
         """
-        Save this `Scene` to the file on disk.
+        Save this `Scene` to the file on disk. If the evaluator has ``persist_results`` enabled, evaluated
+        values are saved next to the file.
 
         :param filename: where to save this scene
         :type filename: ``str``
@@ -327,7 +344,8 @@ class Scene(Serializable):
         with open(filename, "w") as file:
             json_str = json.dumps(
                 self.serialize(),
-                option=OPT_INDENT_2,  # Use orjson's built-in indentation option
+                # Use orjson's built-in indentation option, pinned values of frozen nodes can be NumPy arrays
+                option=OPT_INDENT_2 | OPT_SERIALIZE_NUMPY,
             ).decode("utf-8")
             file.write(json_str)
             # print("saving to", filename, "was successfull.")
@@ -335,9 +353,13 @@ class Scene(Serializable):
             self.has_been_modified = False
             self.filename = filename
 
+        if self.evaluator.persist_results:
+            self.evaluator.saveResults(filename)
+
     def loadFromFile(self, filename: str):
         """
-        Load `Scene` from a file on disk
+        Load `Scene` from a file on disk. If the evaluator has ``persist_results`` enabled, still valid
+        evaluated values are restored from the file saved next to it.
 
         :param filename: from what file to load the `Scene`
         :type filename: ``str``
@@ -350,6 +372,8 @@ class Scene(Serializable):
                 data = json.loads(raw_data)
                 self.filename = filename
                 self.deserialize(data)
+                if self.evaluator.persist_results:
+                    self.evaluator.loadResults(filename)
                 self.has_been_modified = False
             except JSONDecodeError:
                 raise InvalidFile("%s is not a valid JSON file" %
@@ -405,79 +429,84 @@ class Scene(Serializable):
         ])
 
     def deserialize(self, data: dict, hashmap: Optional[dict] = None, restore_id: bool = True, *args: Any, **kwargs: Any) -> bool:
-        hashmap = hashmap or {}
-
-        if restore_id:
-            self.id = data['id']
-
-        # -- deserialize NODES
-
-        # Instead of recreating all the nodes, reuse existing ones...
-        # get list of all current nodes:
-        all_nodes = self.nodes.copy()
-
-        # go through deserialized nodes:
-        for node_data in data['nodes']:
-            # can we find this node in the scene?
-            found_node: Optional[Node] = None
-            for node in all_nodes:
-                if node.id == node_data['id']:
-                    found_node = node
-                    break
-
-            if not found_node:
-                try:
-                    new_node = self.getNodeClassFromData(node_data)(self)
-                    new_node.deserialize(
-                        node_data, hashmap, restore_id, *args, **kwargs)
-                    new_node.onDeserialized(node_data)
-                    # print("New node for", node_data['title'])
-                except:
-                    dumpException()
-            else:
-                try:
-                    found_node.deserialize(node_data, hashmap,
+        was_deserializing = self._is_deserializing
+        self._is_deserializing = True
+        try:
+            hashmap = hashmap or {}
+
+            if restore_id:
+                self.id = data['id']
+
+            # -- deserialize NODES
+
+            # Instead of recreating all the nodes, reuse existing ones...
+            # get list of all current nodes:
+            all_nodes = self.nodes.copy()
+
+            # go through deserialized nodes:
+            for node_data in data['nodes']:
+                # can we find this node in the scene?
+                found_node: Optional[Node] = None
+                for node in all_nodes:
+                    if node.id == node_data['id']:
+                        found_node = node
+                        break
+
+                if not found_node:
+                    try:
+                        new_node = self.getNodeClassFromData(node_data)(self)
+                        new_node.deserialize(
+                            node_data, hashmap, restore_id, *args, **kwargs)
+                        new_node.onDeserialized(node_data)
+                        # print("New node for", node_data['title'])
+                    except:
+                        dumpException()
+                else:
+                    try:
+                        found_node.deserialize(node_data, hashmap,
+                                               restore_id, *args, **kwargs)
+                        found_node.onDeserialized(node_data)
+                        all_nodes.remove(found_node)
+                        # print("Reused", node_data['title'])
+                    except:
+                        dumpException()
+
+            # remove nodes which are left in the scene and were NOT in the serialized data!
+            # that means they were not in the graph before...
+            while all_nodes != []:
+                node = all_nodes.pop()
+                node.remove()
+
+            # -- deserialize EDGES
+
+            # Instead of recreating all the edges, reuse existing ones...
+            # get list of all current edges:
+            all_edges = self.edges.copy()
+
+            # go through deserialized edges:
+            for edge_data in data['edges']:
+                # can we find this node in the scene?
+                found_edge: Optional[Edge] = None
+                for edge in all_edges:
+                    if edge.id == edge_data['id']:
+                        found_edge = edge
+                        break
+
+                if not found_edge:
+                    new_edge = self.getEdgeClass()(self).deserialize(
+                        edge_data, hashmap, restore_id, *args, **kwargs)
+                    # print("New edge for", edge_data)
+                else:
+                    found_edge.deserialize(edge_data, hashmap,
                                            restore_id, *args, **kwargs)
-                    found_node.onDeserialized(node_data)
-                    all_nodes.remove(found_node)
-                    # print("Reused", node_data['title'])
-                except:
-                    dumpException()
-
-        # remove nodes which are left in the scene and were NOT in the serialized data!
-        # that means they were not in the graph before...
-        while all_nodes != []:
-            node = all_nodes.pop()
-            node.remove()
-
-        # -- deserialize EDGES
-
-        # Instead of recreating all the edges, reuse existing ones...
-        # get list of all current edges:
-        all_edges = self.edges.copy()
-
-        # go through deserialized edges:
-        for edge_data in data['edges']:
-            # can we find this node in the scene?
-            found_edge: Optional[Edge] = None
-            for edge in all_edges:
-                if edge.id == edge_data['id']:
-                    found_edge = edge
-                    break
-
-            if not found_edge:
-                new_edge = self.getEdgeClass()(self).deserialize(
-                    edge_data, hashmap, restore_id, *args, **kwargs)
-                # print("New edge for", edge_data)
-            else:
-                found_edge.deserialize(edge_data, hashmap,
-                                       restore_id, *args, **kwargs)
-                all_edges.remove(found_edge)
-
-        # remove nodes which are left in the scene and were NOT in the serialized data!
-        # that means they were not in the graph before...
-        while all_edges != []:
-            edge = all_edges.pop()
-            edge.remove()
-
-        return True
+                    all_edges.remove(found_edge)
+
+            # remove nodes which are left in the scene and were NOT in the serialized data!
+            # that means they were not in the graph before...
+            while all_edges != []:
+                edge = all_edges.pop()
+                edge.remove()
+
+            return True
+        finally:
+            self._is_deserializing = was_deserializing
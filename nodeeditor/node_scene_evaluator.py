@@ -0,0 +1,1058 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Evaluation scheduler of the :class:`~nodeeditor.node_scene.Scene`. The scheduler walks
+the graph in topological order, so each `Node` is evaluated at most once per run and only after all `Nodes`
+connected to its inputs. It can evaluate `Nodes` synchronously or run asynchronous
+:func:`~nodeeditor.node_node.Node.evalImplementationAsync` implementations concurrently on an ``asyncio`` event loop
+integrated with the Qt event loop.
+"""
+import os
+import time
+import asyncio
+import weakref
+import orjson as json
+from orjson import JSONDecodeError, JSONEncodeError, OPT_SERIALIZE_NUMPY
+from collections import OrderedDict
+from qtpy.QtCore import QTimer
+from nodeeditor.node_serializable import Serializable
+from nodeeditor.node_result_cache import ResultCache, hashValue
+from nodeeditor.node_stream import StreamRunner, DEFAULT_QUEUE_SIZE
+from nodeeditor.node_profiler import EvaluationProfiler, EVENT_EVAL, EVENT_CACHE_HIT, EVENT_SHARED
+from nodeeditor.node_cancellation import CancellationToken, EvaluationCancelled, EvaluationTimeout
+from nodeeditor.utils_no_qt import dumpException
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+
+if TYPE_CHECKING:
+    from nodeeditor.node_scene import Scene
+    from nodeeditor.node_node import Node
+
+
+DEBUG = False
+
+#: interval in milliseconds in which the private ``asyncio`` event loop is processed from the Qt event loop
+ASYNC_LOOP_PUMP_INTERVAL = 5
+
+#: default window in milliseconds in which content changes are coalesced into one evaluation run
+DEFAULT_DEBOUNCE_INTERVAL = 150
+
+#: default longest time in milliseconds a content change waits for evaluation while further changes keep coming
+DEFAULT_DEBOUNCE_MAX_DELAY = 1000
+
+#: extension appended to the graph filename for the file with persisted evaluation results
+RESULTS_FILE_EXTENSION = ".results"
+
+
+class SceneEvaluator():
+    """Class scheduling the evaluation of `Nodes` in the :class:`~nodeeditor.node_scene.Scene`"""
+
+    #: cache of evaluated `Node` values shared by all `Scenes`, so the results survive re-creating `Nodes`
+    result_cache = ResultCache()
+
+    def __init__(self, scene: 'Scene') -> None:
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        - **async_concurrency_limit** - maximum number of `Nodes` evaluated asynchronously at the same time.
+          ``None`` means unlimited
+        - **use_result_cache** - ``True`` if evaluated values should be stored to and restored from the
+          :attr:`result_cache`
+        - **persist_results** - ``True`` if evaluated values should be saved next to the graph file and restored
+          when the file is loaded
+        - **lazy** - ``True`` for demand-driven evaluation. Only sinks and `Nodes` they depend on are evaluated,
+          other `Nodes` stay `Dirty` until something asks for them. See :func:`getSinkNodes`
+        - **visible_sinks** - ``True`` if `Nodes` visible in any view of the `Scene` are sinks in lazy mode
+        - **run_timeout** - time budget of one evaluation run in seconds. ``None`` means no limit
+        - **debounce_interval** - window in milliseconds in which changes passed to :func:`scheduleEvaluation`
+          are coalesced into one evaluation run. ``0`` evaluates them immediately
+        - **debounce_max_delay** - longest time in milliseconds a scheduled change waits while further changes
+          keep coming
+        - **share_identical** - ``True`` if `Nodes` with the same structure hash share one computed result within
+          an evaluation run. See :func:`getStructureHash`
+        - **highlight_identical** - ``True`` if identical subgraphs are highlighted in the views after each run.
+          See :func:`updateIdenticalHighlight`
+        - **profiler** - :class:`~nodeeditor.node_profiler.EvaluationProfiler` recording the evaluation runs.
+          Disabled by default
+        """
+        self.scene = scene
+
+        self.async_concurrency_limit: Optional[int] = None
+        self.use_result_cache: bool = True
+        self.persist_results: bool = False
+        self.lazy: bool = False
+        self.visible_sinks: bool = False
+        self.run_timeout: Optional[float] = None
+        self.debounce_interval: int = DEFAULT_DEBOUNCE_INTERVAL
+        self.debounce_max_delay: int = DEFAULT_DEBOUNCE_MAX_DELAY
+        self.share_identical: bool = True
+        self.highlight_identical: bool = False
+        self.profiler = EvaluationProfiler(scene)
+
+        # nodes registered as sinks by addSink
+        self._sinks: 'weakref.WeakSet[Node]' = weakref.WeakSet()
+
+        # hashes of the last seen values of each node: node -> (values, hash)
+        self._values_hashes: Dict['Node', Tuple[Any, str]] = {}
+
+        # structure hashes of nodes computed in the current run: node -> hash or None
+        self._structure_hashes: Dict['Node', Optional[str]] = {}
+
+        # nodes evaluated in the current run holding the result for each structure hash: hash -> node
+        self._shared_results: Dict[str, 'Node'] = {}
+
+        # values each node had after its last evaluation, used for early cutoff: node -> values
+        self._last_values: 'weakref.WeakKeyDictionary[Node, Any]' = weakref.WeakKeyDictionary()
+
+        # cancellation tokens of the running evaluation runs
+        self._tokens: List[CancellationToken] = []
+        self._run_serial: int = 0
+
+        # serial number of the last run which brought each node up to date: node -> serial
+        self._updated_in: 'weakref.WeakKeyDictionary[Node, int]' = weakref.WeakKeyDictionary()
+
+        # nodes changed since the last debounced evaluation run and the time of the first of those changes
+        self._scheduled: List['Node'] = []
+        self._scheduled_since: float = 0.0
+        self._debounce_timer: Optional[QTimer] = None
+
+        # number of evaluation runs currently in progress (async runs can interleave with synchronous ones)
+        self._running_evaluations: int = 0
+
+        # asyncio event loop used when the application does not run on a qasync-like loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_timer: Optional[QTimer] = None
+        self._pending_tasks: Set[asyncio.Future] = set()
+
+        # concurrency limits for asynchronous evaluation
+        # (loop, limit, semaphore), see getLimitSemaphore
+        self._semaphore: Optional[Tuple[asyncio.AbstractEventLoop, Optional[int], asyncio.Semaphore]] = None
+        self._class_semaphores: Dict[Type['Node'], Tuple[asyncio.AbstractEventLoop, Optional[int],
+                                                         asyncio.Semaphore]] = {}
+
+    @property
+    def is_evaluating(self) -> bool:
+        """``True`` while this scheduler is evaluating `Nodes`. While it does, :func:`~nodeeditor.node_node.Node.evalChildren`
+        does nothing, since the scheduler evaluates the children itself"""
+        return self._running_evaluations > 0
+
+    def isPinned(self, node: 'Node') -> bool:
+        """``True`` if `node` is `Frozen` and has values to keep, so neither it nor its upstream `Nodes` need
+        evaluation on its behalf. See :func:`~nodeeditor.node_node.Node.setFrozen`"""
+        return node.isFrozen() and not node.isDirty() and not node.isInvalid()
+
+    def getDescendantNodes(self, nodes: Iterable['Node']) -> List['Node']:
+        """Return all `Nodes` connected to outputs of `nodes` and all their descendants. Provided `nodes` are
+        not included unless they are descendants of each other. Changes do not propagate through pinned `Nodes`
+        (see :func:`isPinned`), so they and their descendants are not included
+
+        :param nodes: `Nodes` from which we start
+        :return: list of descendant :class:`~nodeeditor.node_node.Node`
+        """
+        result: List['Node'] = []
+        visited: Set['Node'] = set()
+        stack = [child for node in nodes for child in node.getChildrenNodes()]
+        while stack:
+            node = stack.pop()
+            if node in visited or self.isPinned(node):
+                continue
+            visited.add(node)
+            result.append(node)
+            stack.extend(node.getChildrenNodes())
+        return result
+
+    def getAncestorNodes(self, nodes: Iterable['Node'], stop_at_pinned: bool = False) -> List['Node']:
+        """Return all `Nodes` connected to inputs of `nodes` and all their ancestors
+
+        :param nodes: `Nodes` from which we start
+        :param stop_at_pinned: ``True`` to not include ancestors of pinned `Nodes` (see :func:`isPinned`),
+            which are not needed to evaluate `nodes`
+        :return: list of ancestor :class:`~nodeeditor.node_node.Node`
+        """
+        result: List['Node'] = []
+        visited: Set['Node'] = set()
+        stack = [parent for node in nodes for parent in node.getParentNodes()]
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            result.append(node)
+            if not (stop_at_pinned and self.isPinned(node)):
+                stack.extend(node.getParentNodes())
+        return result
+
+    def getDirtyAncestorNodes(self, nodes: Iterable['Node']) -> List['Node']:
+        """Return all `Dirty` or `Invalid` `Nodes` upstream of `nodes`, which need to be evaluated before `nodes`.
+        The search does not continue above pinned `Nodes` (see :func:`isPinned`)
+
+        :param nodes: `Nodes` from which we start
+        :return: list of :class:`~nodeeditor.node_node.Node` needing evaluation
+        """
+        result: List['Node'] = []
+        visited: Set['Node'] = set()
+        stack = [parent for node in nodes for parent in node.getParentNodes()]
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            if node.isDirty() or node.isInvalid():
+                result.append(node)
+            elif self.isPinned(node):
+                continue
+            stack.extend(node.getParentNodes())
+        return result
+
+    def getTopologicalOrder(self, nodes: Optional[Iterable['Node']] = None) -> List['Node']:
+        """Sort `nodes` so each `Node` comes after all `Nodes` connected to its inputs. Only the connections
+        between the provided `nodes` are considered. `Nodes` inside a cycle are appended at the end in `Scene` order
+
+        :param nodes: `Nodes` to sort. All `Nodes` of the `Scene` if ``None``
+        :return: topologically sorted list of :class:`~nodeeditor.node_node.Node`
+        """
+        node_set = set(self.scene.nodes if nodes is None else nodes)
+        # keep the Scene order for nodes on the same level, so the evaluation order is deterministic
+        ordered = [node for node in self.scene.nodes if node in node_set]
+        in_scene = set(ordered)
+        ordered += [node for node in node_set if node not in in_scene]
+
+        in_degree = {node: 0 for node in ordered}
+        for node in ordered:
+            for child in node.getChildrenNodes():
+                if child in in_degree:
+                    in_degree[child] += 1
+
+        result: List['Node'] = []
+        ready = [node for node in ordered if in_degree[node] == 0]
+        while ready:
+            node = ready.pop(0)
+            result.append(node)
+            for child in node.getChildrenNodes():
+                if child in in_degree:
+                    in_degree[child] -= 1
+                    if in_degree[child] == 0:
+                        ready.append(child)
+
+        if len(result) != len(ordered):
+            if DEBUG:
+                print("!W:", "SceneEvaluator::getTopologicalOrder", "graph contains a cycle")
+            sorted_nodes = set(result)
+            result += [node for node in ordered if node not in sorted_nodes]
+
+        return result
+
+    def getEvaluationOrder(self, nodes: Optional[Iterable['Node']] = None) -> List['Node']:
+        """Prepare the evaluation run. `nodes` are marked `Dirty` and returned in topological order together
+        with all their descendants and `Dirty` upstream `Nodes` they depend on
+
+        :param nodes: `Nodes` which changed. All `Dirty` and `Invalid` `Nodes` of the `Scene` if ``None``
+        :return: topologically sorted list of :class:`~nodeeditor.node_node.Node` which may need evaluation
+        """
+        if nodes is None:
+            roots = [node for node in self.scene.nodes if node.isDirty() or node.isInvalid()]
+        else:
+            roots = list(nodes)
+
+        for node in roots:
+            node.markDirty()
+
+        order = self.getTopologicalOrder(roots + self.getDescendantNodes(roots) + self.getDirtyAncestorNodes(roots))
+        if not self.lazy:
+            return order
+
+        # in lazy mode nodes nobody asks for are only marked dirty, so they get evaluated once they are needed
+        required = self.getRequiredNodes()
+        for node in order:
+            if node not in required:
+                node.markDirty()
+        return [node for node in order if node in required]
+
+    def addSink(self, node: 'Node') -> None:
+        """Register `node` as a sink, so it is evaluated in lazy mode
+
+        :param node: :class:`~nodeeditor.node_node.Node` consuming the results
+        """
+        self._sinks.add(node)
+
+    def removeSink(self, node: 'Node') -> None:
+        """Unregister `node` previously registered by :func:`addSink`
+
+        :param node: :class:`~nodeeditor.node_node.Node` to unregister
+        """
+        self._sinks.discard(node)
+
+    def getSinkNodes(self) -> List['Node']:
+        """Return `Nodes` whose values are requested in lazy mode. These are `Nodes` with
+        :attr:`~nodeeditor.node_node.Node.eval_sink` set, `Nodes` registered by :func:`addSink` and `Nodes` visible
+        in the views of the `Scene` if :attr:`visible_sinks` is ``True``
+
+        :return: list of sink :class:`~nodeeditor.node_node.Node`
+        """
+        visible = set(self.getVisibleNodes()) if self.visible_sinks else set()
+        return [node for node in self.scene.nodes if node.eval_sink or node in self._sinks or node in visible]
+
+    def getRequiredNodes(self) -> Set['Node']:
+        """Return sinks and all `Nodes` they depend on. In lazy mode only these `Nodes` are evaluated
+
+        :return: set of required :class:`~nodeeditor.node_node.Node`
+        """
+        sinks = self.getSinkNodes()
+        return set(sinks).union(self.getAncestorNodes(sinks, stop_at_pinned=True))
+
+    def getVisibleNodes(self) -> List['Node']:
+        """Return `Nodes` intersecting the viewport of any visible view of the `Scene`
+
+        :return: list of visible :class:`~nodeeditor.node_node.Node`
+        """
+        rects = [view.mapToScene(view.viewport().rect()).boundingRect()
+                 for view in self.scene.grScene.views() if view.isVisible()]
+        if not rects:
+            return []
+        return [node for node in self.scene.nodes
+                if any(rect.intersects(node.grNode.sceneBoundingRect()) for rect in rects)]
+
+    def onViewportChanged(self) -> None:
+        """Slot called when the visible area of a view changed. In lazy mode with :attr:`visible_sinks` it
+        evaluates `Dirty` `Nodes` which became visible together with the `Nodes` they depend on"""
+        if not self.lazy or not self.visible_sinks or self.is_evaluating:
+            return
+        required = self.getRequiredNodes()
+        dirty = [node for node in self.scene.nodes if node in required and node.isDirty()]
+        if dirty:
+            self.evaluate(dirty)
+
+    def evaluate(self, nodes: Optional[Iterable['Node']] = None) -> None:
+        """Synchronously evaluate `nodes` and everything depending on them in topological order.
+
+        Propagation stops at `Nodes` whose values did not change (early cutoff): their descendants are evaluated
+        only if they are `Dirty` or `Invalid` on their own or if some other input changed. See
+        :func:`~nodeeditor.node_node.Node.valuesEqual`
+
+        :param nodes: `Nodes` which changed. All `Dirty` and `Invalid` `Nodes` of the `Scene` if ``None``
+        """
+        self._running_evaluations += 1
+        if self._running_evaluations == 1:
+            self.profiler.startRun()
+        token = None
+        try:
+            order = self.getEvaluationOrder(nodes)
+            self.unscheduleNodes(order)
+            token = self.startRun(order)
+            outdated = {node for node in order if node.isDirty() or node.isInvalid()}
+            changed: Set['Node'] = set()
+            for node in order:
+                # frozen node keeps its values even when its inputs changed
+                inputs_changed = not node.isFrozen() and any(parent in changed for parent in node.getParentNodes())
+                if node in outdated or inputs_changed:
+                    if token.is_cancelled or token.isRunTimedOut():
+                        self.markInterrupted(node, token)
+                    elif self.evalNode(node, token):
+                        changed.add(node)
+                else:
+                    self.skipNode(node)
+                    self.setUpdatedIn(node, token)
+        finally:
+            if token is not None:
+                self.finishRun(token)
+            self._running_evaluations -= 1
+            if not self.is_evaluating:
+                self.onEvaluationFinished()
+
+    def scheduleEvaluation(self, nodes: Iterable['Node']) -> None:
+        """Evaluate changed `nodes` after :attr:`debounce_interval`. Changes coming within the interval restart
+        it and are evaluated together in one run, so i.e. typing a number into a content widget evaluates the graph
+        once with the final value instead of once per keystroke. Changes are never delayed by more than
+        :attr:`debounce_max_delay`.
+
+        Changes made while the `Scene` is deserialized (loaded or restored from the history) are not scheduled,
+        the changed `Nodes` stay `Dirty` for the evaluation run following the restore. See
+        :func:`~nodeeditor.node_scene.Scene.isDeserializing`
+
+        :param nodes: `Nodes` which changed
+        """
+        if self.scene.isDeserializing():
+            return
+        if not self._scheduled:
+            self._scheduled_since = time.monotonic()
+        for node in nodes:
+            if node not in self._scheduled:
+                self._scheduled.append(node)
+
+        if self.debounce_interval <= 0:
+            self.evaluateScheduled()
+            return
+
+        if self._debounce_timer is None:
+            self._debounce_timer = QTimer()
+            self._debounce_timer.setSingleShot(True)
+            self._debounce_timer.timeout.connect(self.evaluateScheduled)
+        elapsed = (time.monotonic() - self._scheduled_since) * 1000
+        self._debounce_timer.start(int(max(0, min(self.debounce_interval, self.debounce_max_delay - elapsed))))
+
+    def hasScheduledEvaluation(self) -> bool:
+        """``True`` if some changes passed to :func:`scheduleEvaluation` are still waiting for evaluation"""
+        return bool(self._scheduled)
+
+    def evaluateScheduled(self) -> None:
+        """Immediately evaluate all changes waiting in :func:`scheduleEvaluation` in one run. `Nodes` which are
+        not `Dirty` or `Invalid` anymore, i.e. restored from the :attr:`result_cache` or evaluated by another run
+        meanwhile, are skipped"""
+        if self._debounce_timer is not None:
+            self._debounce_timer.stop()
+        nodes = [node for node in self._scheduled
+                 if node in self.scene.nodes and (node.isDirty() or node.isInvalid())]
+        self._scheduled = []
+        if nodes:
+            self.evaluate(nodes)
+
+    def unscheduleNodes(self, nodes: Iterable['Node']) -> None:
+        """Remove `nodes` from the changes waiting in :func:`scheduleEvaluation`, i.e. because an evaluation
+        run started evaluating them already"""
+        if not self._scheduled:
+            return
+        nodes = set(nodes)
+        self._scheduled = [node for node in self._scheduled if node not in nodes]
+        if not self._scheduled and self._debounce_timer is not None:
+            self._debounce_timer.stop()
+
+    def onEvaluationFinished(self) -> None:
+        """Called when the last of the running evaluation runs finished. Forgets the data valid only during
+        the evaluation and refreshes the identical subgraph highlight"""
+        self._values_hashes = {}
+        self._structure_hashes = {}
+        self._shared_results = {}
+        self.profiler.finishRun()
+        if self.highlight_identical:
+            self.updateIdenticalHighlight()
+
+    def startRun(self, order: List['Node']) -> CancellationToken:
+        """Create the cancellation token of a new evaluation run of `order`. Running evaluation runs sharing
+        some `Nodes` with it are stale, so they are cancelled
+
+        :param order: `Nodes` of the new run
+        :return: token of the new run
+        :rtype: :class:`~nodeeditor.node_cancellation.CancellationToken`
+        """
+        self._run_serial += 1
+        token = CancellationToken(order, self.run_timeout, self._run_serial)
+        for other in self._tokens:
+            if not other.nodes.isdisjoint(token.nodes):
+                if DEBUG:
+                    print("SceneEvaluator: cancelling stale run")
+                other.cancel()
+        self._tokens.append(token)
+        return token
+
+    def finishRun(self, token: CancellationToken) -> None:
+        """Forget the cancellation token of a finished evaluation run"""
+        if token in self._tokens:
+            self._tokens.remove(token)
+
+    def cancel(self) -> None:
+        """Cancel all running evaluation runs"""
+        for token in self._tokens:
+            token.cancel()
+
+    def markInterrupted(self, node: 'Node', token: Optional[CancellationToken]) -> None:
+        """The evaluation of `node` in the run of `token` was interrupted, so the `Node` is marked `Dirty` for
+        the next run. Unless a newer run, i.e. the one which cancelled this run, has already evaluated it
+
+        :param node: :class:`~nodeeditor.node_node.Node` which was not evaluated
+        :param token: cancellation token of the interrupted run
+        """
+        if token is None or self._updated_in.get(node, 0) <= token.serial:
+            node.markDirty()
+
+    def setUpdatedIn(self, node: 'Node', token: Optional[CancellationToken]) -> None:
+        """Remember that the run of `token` brought `node` up to date"""
+        if token is not None:
+            self._updated_in[node] = token.serial
+
+    def checkCancelled(self, node: 'Node') -> None:
+        """Raise an exception if the evaluation run of `node` was cancelled or the time budget of `node` or of
+        the run is exhausted. See :func:`~nodeeditor.node_node.Node.checkCancelled`
+
+        :param node: :class:`~nodeeditor.node_node.Node` being evaluated
+        :raises ~nodeeditor.node_cancellation.EvaluationCancelled: if the run was cancelled
+        :raises ~nodeeditor.node_cancellation.EvaluationTimeout: if the time budget is exhausted
+        """
+        # the most recent run evaluating the node, runs can be nested when Qt events are processed during evaluation
+        for token in reversed(self._tokens):
+            if node in token.running:
+                token.check(node)
+                return
+
+    def evalNode(self, node: 'Node', token: Optional[CancellationToken] = None) -> bool:
+        """Evaluate single `Node` or restore its values from the :attr:`result_cache`. Exceptions are caught and
+        the `Node` is marked `Invalid`. Cancelled `Node` is left for the next run, see :func:`markInterrupted`
+
+        :param node: :class:`~nodeeditor.node_node.Node` to evaluate
+        :param token: cancellation token of the evaluation run
+        :return: ``True`` if the values of the `Node` changed, so its children need to be evaluated
+        :rtype: ``bool``
+        """
+        start = time.perf_counter()
+        if self.restoreFromIdentical(node):
+            self.profiler.recordNode(node, EVENT_SHARED, start, time.perf_counter() - start)
+        elif self.restoreFromCache(node):
+            self.profiler.recordNode(node, EVENT_CACHE_HIT, start, time.perf_counter() - start)
+        else:
+            if DEBUG:
+                print("SceneEvaluator: evaluating", node)
+            if token is not None:
+                token.startNode(node)
+            try:
+                node.eval()
+            except EvaluationCancelled:
+                self.markInterrupted(node, token)
+                return False
+            except EvaluationTimeout as e:
+                node.markInvalid()
+                node.grNode.setToolTip(str(e))
+                return self.hasValuesChanged(node)
+            except Exception as e:
+                node.markInvalid()
+                node.grNode.setToolTip(str(e))
+                dumpException(e)
+                return self.hasValuesChanged(node)
+            finally:
+                if token is not None:
+                    token.finishNode(node)
+                self.profiler.recordNode(node, EVENT_EVAL, start, time.perf_counter() - start)
+            self.storeToCache(node)
+
+        self.shareResult(node)
+        self.setUpdatedIn(node, token)
+        return self.hasValuesChanged(node)
+
+    def skipNode(self, node: 'Node') -> None:
+        """`Node` is not evaluated, because none of its inputs changed. If some upstream `Node` marked it `Dirty`
+        during the evaluation run, it is unmarked, since its values are still up to date
+
+        :param node: skipped :class:`~nodeeditor.node_node.Node`
+        """
+        if DEBUG:
+            print("SceneEvaluator: inputs unchanged, skipping", node)
+        if node.isDirty():
+            node.markDirty(False)
+        self.shareResult(node)
+
+    def hasValuesChanged(self, node: 'Node') -> bool:
+        """Compare the current values of evaluated `node` with the values it had after its previous evaluation
+        and remember the current ones for the next comparison
+
+        :param node: evaluated :class:`~nodeeditor.node_node.Node`
+        :return: ``True`` if the values changed or can't be compared
+        :rtype: ``bool``
+        """
+        old_values = self._last_values.pop(node, None)
+        if node.isInvalid() or node.isDirty():
+            return True
+        new_values = node.serializeValues()
+        if new_values is None:
+            return True
+        self._last_values[node] = new_values
+        return old_values is None or not node.valuesEqual(old_values, new_values)
+
+    def rememberValues(self, node: 'Node') -> None:
+        """Remember the current values of up to date `node` restored without evaluation (i.e. from the results
+        file), so the next evaluation compares its new values with them and can stop the propagation early.
+        Values restored during evaluation are remembered by :func:`hasValuesChanged`
+
+        :param node: restored :class:`~nodeeditor.node_node.Node`
+        """
+        values = None if node.isDirty() or node.isInvalid() else node.serializeValues()
+        if values is None:
+            self._last_values.pop(node, None)
+        else:
+            self._last_values[node] = values
+
+    # result cache
+
+    def getValuesHash(self, node: 'Node') -> Optional[str]:
+        """Return hash of the evaluated values of `node` or ``None`` if the `Node` does not provide its values.
+        See :func:`~nodeeditor.node_node.Node.serializeValues`
+
+        :param node: :class:`~nodeeditor.node_node.Node` whose values we want to hash
+        :return: hash of the values or ``None``
+        """
+        values = node.serializeValues()
+        if values is None:
+            return None
+        last_values, last_hash = self._values_hashes.get(node, (None, None))
+        if last_values is not values:
+            last_hash = hashValue(values)
+            self._values_hashes[node] = (values, last_hash)
+        return last_hash
+
+    def getCacheKey(self, node: 'Node') -> Optional[str]:
+        """Return the key identifying the result of `node` in the :attr:`result_cache`. The key is computed from
+        the `Node` class, its serialized content and the hashes of the values connected to its inputs.
+
+        :param node: :class:`~nodeeditor.node_node.Node` for which we want the key
+        :return: cache key or ``None`` if some of the input `Nodes` is not evaluated
+        """
+        content = node.content.serialize() if isinstance(node.content, Serializable) else {}
+        inputs = []
+        for socket in node.inputs:
+            connected = []
+            for edge in socket.edges:
+                other_socket = edge.getOtherSocket(socket)
+                if other_socket is None:
+                    continue
+                parent = other_socket.node
+                if parent.isDirty() or parent.isInvalid():
+                    return None
+                values_hash = self.getValuesHash(parent)
+                if values_hash is None:
+                    return None
+                connected.append((values_hash, other_socket.index))
+            inputs.append(connected)
+        return hashValue((node.__class__.__module__, node.__class__.__qualname__, content, inputs))
+
+    def restoreFromCache(self, node: 'Node') -> bool:
+        """Restore values of `node` from the :attr:`result_cache` and mark it not `Dirty` and not `Invalid`
+
+        :param node: :class:`~nodeeditor.node_node.Node` to restore
+        :return: ``True`` if the values were found in the cache and restored
+        :rtype: ``bool``
+        """
+        if not self.use_result_cache:
+            return False
+        key = self.getCacheKey(node)
+        if key is None:
+            return False
+        values = self.result_cache.get(key)
+        if values is None or not node.deserializeValues(values):
+            return False
+
+        if DEBUG:
+            print("SceneEvaluator: restored from cache", node)
+        node.markDirty(False)
+        node.markInvalid(False)
+        node.grNode.setToolTip("")
+        return True
+
+    def storeToCache(self, node: 'Node') -> None:
+        """Store the values of successfully evaluated `node` to the :attr:`result_cache`
+
+        :param node: evaluated :class:`~nodeeditor.node_node.Node`
+        """
+        if not self.use_result_cache or node.isDirty() or node.isInvalid():
+            return
+        values = node.serializeValues()
+        if values is None:
+            return
+        key = self.getCacheKey(node)
+        if key is not None:
+            self.result_cache.put(key, values)
+
+    # structural hashing
+
+    def getStructureHashes(self, nodes: Optional[Iterable['Node']] = None,
+                           hashes: Optional[Dict['Node', Optional[str]]] = None) -> Dict['Node', Optional[str]]:
+        """Compute structure hashes of `nodes` and all `Nodes` they depend on. See :func:`getStructureHash`
+
+        :param nodes: `Nodes` to hash. All `Nodes` of the `Scene` if ``None``
+        :param hashes: already computed hashes, which are updated with the new ones
+        :return: dict mapping `Nodes` to their structure hash or ``None`` if they can't be hashed
+        """
+        hashes = {} if hashes is None else hashes
+        if nodes is None:
+            order = self.getTopologicalOrder()
+        else:
+            nodes = [node for node in nodes if node not in hashes]
+            order = self.getTopologicalOrder(nodes + self.getAncestorNodes(nodes)) if nodes else []
+
+        for node in order:
+            if node in hashes:
+                continue
+            if node.isFrozen() or not node.eval_shareable:
+                # values of these nodes do not follow from their structure, nothing downstream is identical
+                hashes[node] = hashValue(("node", id(node)))
+                continue
+            content = node.content.serialize() if isinstance(node.content, Serializable) else {}
+            inputs = []
+            for socket in node.inputs:
+                connected = []
+                for edge in socket.edges:
+                    other_socket = edge.getOtherSocket(socket)
+                    if other_socket is None:
+                        continue
+                    connected.append((hashes.get(other_socket.node), other_socket.index))
+                inputs.append(connected)
+            if any(parent_hash is None for connected in inputs for parent_hash, _ in connected):
+                # part of a cycle
+                hashes[node] = None
+                continue
+            if not content and not any(inputs):
+                # source without parameters, its values come from somewhere else (i.e. set from code)
+                hashes[node] = hashValue(("node", id(node)))
+                continue
+            hashes[node] = hashValue((node.__class__.__module__, node.__class__.__qualname__, content, inputs))
+        return hashes
+
+    def getStructureHash(self, node: 'Node') -> Optional[str]:
+        """Return Merkle-style structure hash of `node` computed from its class, serialized content and
+        the structure hashes of the `Nodes` connected to its inputs. `Nodes` with equal hashes are roots of
+        identical subgraphs and compute the same values. `Frozen` `Nodes`, `Nodes` without
+        :attr:`~nodeeditor.node_node.Node.eval_shareable` and `Nodes` with neither content nor connected inputs
+        get a unique hash, since nothing tells what they compute
+
+        :param node: :class:`~nodeeditor.node_node.Node` to hash
+        :return: structure hash or ``None`` if the `Node` is part of a cycle
+        """
+        if node not in self._structure_hashes:
+            hashes = self.getStructureHashes([node], self._structure_hashes)
+            if not self.is_evaluating:
+                # structure can change between runs, hashes are remembered only during evaluation
+                self._structure_hashes = {}
+            return hashes.get(node)
+        return self._structure_hashes[node]
+
+    def restoreFromIdentical(self, node: 'Node') -> bool:
+        """Restore values of `node` from an identical `Node` (with the same structure hash) evaluated earlier
+        in the current run, instead of computing the same values again
+
+        :param node: :class:`~nodeeditor.node_node.Node` to restore
+        :return: ``True`` if the values were restored
+        :rtype: ``bool``
+        """
+        if not self.share_identical:
+            return False
+        other = self._shared_results.get(self.getStructureHash(node))
+        if other is None or other is node or other.isDirty() or other.isInvalid():
+            return False
+        values = other.serializeValues()
+        if values is None or not node.deserializeValues(values):
+            return False
+
+        if DEBUG:
+            print("SceneEvaluator: sharing values of", other, "with", node)
+        node.markDirty(False)
+        node.markInvalid(False)
+        node.grNode.setToolTip("")
+        return True
+
+    def shareResult(self, node: 'Node') -> None:
+        """Offer the values of up to date `node` to identical `Nodes` evaluated later in the current run"""
+        if not self.share_identical or node.isDirty() or node.isInvalid():
+            return
+        structure_hash = self.getStructureHash(node)
+        if structure_hash is not None:
+            self._shared_results.setdefault(structure_hash, node)
+
+    def getIdenticalNodeGroups(self) -> List[List['Node']]:
+        """Return groups of `Nodes` with equal structure hash. Each group are roots of identical subgraphs,
+        which share one computed result during evaluation
+
+        :return: list of groups with more than one :class:`~nodeeditor.node_node.Node`
+        """
+        groups: Dict[str, List['Node']] = OrderedDict()
+        for node, structure_hash in self.getStructureHashes().items():
+            if structure_hash is not None:
+                groups.setdefault(structure_hash, []).append(node)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def updateIdenticalHighlight(self) -> None:
+        """Highlight identical subgraphs in the views, each group of identical `Nodes` with its own color.
+        Clears the highlight if :attr:`highlight_identical` is ``False``. See
+        :func:`~nodeeditor.node_graphics_node.QDMGraphicsNode.setIdenticalHighlight`"""
+        groups = self.getIdenticalNodeGroups() if self.highlight_identical else []
+        colors = {node: index for index, group in enumerate(groups) for node in group}
+        for node in self.scene.nodes:
+            node.grNode.setIdenticalHighlight(colors.get(node))
+
+    # persisted results
+
+    def getResultsFilename(self, filename: str) -> str:
+        """Return the filename of the file with persisted results for the graph stored in `filename`"""
+        return filename + RESULTS_FILE_EXTENSION
+
+    def saveResults(self, filename: str) -> None:
+        """Save evaluated values of all evaluated `Nodes` to the results file belonging to the graph `filename`
+
+        :param filename: filename of the graph file
+        :type filename: ``str``
+        """
+        try:
+            data = json.dumps(self.serializeResults(), option=OPT_SERIALIZE_NUMPY)
+        except JSONEncodeError as e:
+            # some values cannot be stored, keep only the graph file
+            dumpException(e)
+            return
+        with open(self.getResultsFilename(filename), "wb") as file:
+            file.write(data)
+
+    def loadResults(self, filename: str) -> int:
+        """Restore evaluated values from the results file belonging to the graph `filename`. Only the values
+        computed from the same content and inputs are restored, the rest of the `Nodes` stays `Dirty`
+
+        :param filename: filename of the graph file
+        :type filename: ``str``
+        :return: number of restored `Nodes`
+        :rtype: ``int``
+        """
+        results_filename = self.getResultsFilename(filename)
+        if not os.path.exists(results_filename):
+            return 0
+        with open(results_filename, "rb") as file:
+            try:
+                data = json.loads(file.read())
+            except JSONDecodeError as e:
+                dumpException(e)
+                return 0
+        if not isinstance(data, dict):
+            # not a results file, everything is evaluated again
+            return 0
+        return self.deserializeResults(data)
+
+    def serializeResults(self) -> OrderedDict:
+        """Serialize values of all evaluated `Nodes` with the cache keys they were computed from
+
+        :return: serialized results
+        :rtype: ``OrderedDict``
+        """
+        results = []
+        for node in self.scene.nodes:
+            if node.isDirty() or node.isInvalid():
+                continue
+            values = node.serializeValues()
+            key = self.getCacheKey(node)
+            if values is None or key is None:
+                continue
+            results.append(OrderedDict([
+                ('id', node.id),
+                ('hash', key),
+                ('values', values),
+            ]))
+        return OrderedDict([
+            ('results', results),
+        ])
+
+    def deserializeResults(self, data: dict) -> int:
+        """Restore values of `Dirty` or `Invalid` `Nodes` whose current cache key matches the stored one.
+        Restored `Nodes` are removed from the changes waiting in :func:`scheduleEvaluation`, i.e. content changes
+        made while deserializing the graph, since their values are up to date
+
+        :param data: results previously returned by :func:`serializeResults`
+        :return: number of restored `Nodes`
+        :rtype: ``int``
+        """
+        results = {item.get('id'): item for item in data.get('results', []) if isinstance(item, dict)}
+        restored: List['Node'] = []
+        # topological order, so the keys of children are computed from already restored parents
+        for node in self.getTopologicalOrder():
+            item = results.get(node.id)
+            if item is None or not (node.isDirty() or node.isInvalid()):
+                continue
+            if self.getCacheKey(node) != item.get('hash') or not node.deserializeValues(item.get('values')):
+                continue
+            node.markDirty(False)
+            node.markInvalid(False)
+            node.grNode.setToolTip("")
+            self.rememberValues(node)
+            restored.append(node)
+        self.unscheduleNodes(restored)
+        return len(restored)
+
+    # asynchronous evaluation
+
+    async def evaluateAsync(self, nodes: Optional[Iterable['Node']] = None) -> None:
+        """Evaluate `nodes` and everything depending on them concurrently. Each `Node` waits only for the `Nodes`
+        connected to its inputs, so independent I/O-bound `Nodes` overlap. Propagation stops at `Nodes` whose
+        values did not change, the same way as in :func:`evaluate`
+
+        :param nodes: `Nodes` which changed. All `Dirty` and `Invalid` `Nodes` of the `Scene` if ``None``
+        """
+        self._running_evaluations += 1
+        if self._running_evaluations == 1:
+            self.profiler.startRun()
+        token = None
+        tasks: Dict['Node', asyncio.Future] = {}
+        try:
+            order = self.getEvaluationOrder(nodes)
+            self.unscheduleNodes(order)
+            token = self.startRun(order)
+            for node in order:
+                parent_tasks = [tasks[parent] for parent in node.getParentNodes() if parent in tasks]
+                outdated = node.isDirty() or node.isInvalid()
+                tasks[node] = asyncio.ensure_future(self.evalNodeAsync(node, parent_tasks, outdated, token))
+                token.addFuture(tasks[node])
+            if tasks:
+                await asyncio.wait_for(asyncio.gather(*tasks.values()), token.timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+            # stale or timed out run, unfinished nodes stay dirty for the next one
+            for node, task in tasks.items():
+                if task.cancelled():
+                    self.markInterrupted(node, token)
+            if isinstance(e, asyncio.CancelledError) and (token is None or not token.is_cancelled):
+                raise
+        finally:
+            if token is not None:
+                self.finishRun(token)
+            self._running_evaluations -= 1
+            if not self.is_evaluating:
+                self.onEvaluationFinished()
+
+    async def evalNodeAsync(self, node: 'Node', parent_tasks: Optional[List[asyncio.Future]] = None,
+                            outdated: bool = True, token: Optional[CancellationToken] = None) -> bool:
+        """Evaluate single `Node` asynchronously once all `parent_tasks` have finished. Respects the concurrency
+        limits and the timeout of the `Node`. On timeout or error the `Node` is marked `Invalid`
+
+        :param node: :class:`~nodeeditor.node_node.Node` to evaluate
+        :param parent_tasks: tasks evaluating `Nodes` connected to the inputs of `node`
+        :param outdated: ``True`` if the `Node` needs evaluation even if none of its inputs changed
+        :param token: cancellation token of the evaluation run
+        :return: ``True`` if the values of the `Node` changed, so its children need to be evaluated
+        :rtype: ``bool``
+        """
+        parents_changed = await asyncio.gather(*parent_tasks) if parent_tasks else []
+
+        if not outdated and (node.isFrozen() or not any(parents_changed)):
+            self.skipNode(node)
+            self.setUpdatedIn(node, token)
+            return False
+
+        start = time.perf_counter()
+        restored = EVENT_SHARED if self.restoreFromIdentical(node) else \
+            EVENT_CACHE_HIT if self.restoreFromCache(node) else None
+        if restored is not None:
+            self.profiler.recordNode(node, restored, start, time.perf_counter() - start)
+            self.shareResult(node)
+            self.setUpdatedIn(node, token)
+            return self.hasValuesChanged(node)
+
+        if DEBUG:
+            print("SceneEvaluator: evaluating async", node)
+
+        if token is not None:
+            token.startNode(node)
+        try:
+            async with self.getSemaphore(), self.getClassSemaphore(node):
+                # time spent waiting for the semaphores is not the node's
+                start = time.perf_counter()
+                try:
+                    await asyncio.wait_for(node.evalAsync(), node.eval_timeout)
+                finally:
+                    self.profiler.recordNode(node, EVENT_EVAL, start, time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            node.markInvalid()
+            node.grNode.setToolTip("Evaluation timed out after %gs" % node.eval_timeout)
+            return self.hasValuesChanged(node)
+        except EvaluationCancelled:
+            self.markInterrupted(node, token)
+            return False
+        except EvaluationTimeout as e:
+            node.markInvalid()
+            node.grNode.setToolTip(str(e))
+            return self.hasValuesChanged(node)
+        except Exception as e:
+            node.markInvalid()
+            node.grNode.setToolTip(str(e))
+            dumpException(e)
+            return self.hasValuesChanged(node)
+        finally:
+            if token is not None:
+                token.finishNode(node)
+
+        self.storeToCache(node)
+        self.shareResult(node)
+        self.setUpdatedIn(node, token)
+        return self.hasValuesChanged(node)
+
+    def getSemaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore limiting the number of all `Nodes` evaluated at the same time. It is created again
+        when :attr:`async_concurrency_limit` changed or the evaluation runs on another event loop"""
+        self._semaphore = self.getLimitSemaphore(self._semaphore, self.async_concurrency_limit)
+        return self._semaphore[2]
+
+    def getClassSemaphore(self, node: 'Node') -> asyncio.Semaphore:
+        """Return the semaphore limiting the number of `Nodes` of the same class evaluated at the same time.
+        See :attr:`~nodeeditor.node_node.Node.eval_concurrency`"""
+        node_class = node.__class__
+        self._class_semaphores[node_class] = self.getLimitSemaphore(self._class_semaphores.get(node_class),
+                                                                    node.eval_concurrency)
+        return self._class_semaphores[node_class][2]
+
+    def getLimitSemaphore(self, cached: Optional[Tuple[asyncio.AbstractEventLoop, Optional[int], asyncio.Semaphore]],
+                          limit: Optional[int]) -> Tuple[asyncio.AbstractEventLoop, Optional[int], asyncio.Semaphore]:
+        """Return `cached` ``(loop, limit, semaphore)`` if it is still valid for the running event loop and the
+        `limit`, otherwise a new one. Semaphores are bound to the loop they are used on first
+
+        :param cached: previously returned tuple or ``None``
+        :param limit: maximum number of holders of the semaphore, ``None`` for no limit
+        """
+        loop = asyncio.get_running_loop()
+        if cached is not None and cached[0] is loop and cached[1] == limit:
+            return cached
+        # semaphore with a huge value behaves as no limit at all
+        return loop, limit, asyncio.Semaphore(limit or 2**31)
+
+    def getEventLoop(self) -> asyncio.AbstractEventLoop:
+        """Return the ``asyncio`` event loop used for asynchronous evaluation.
+
+        If the application already runs an ``asyncio`` loop integrated with Qt (i.e. ``qasync.QEventLoop``), that
+        loop is used. Otherwise a private loop is created, which is processed periodically from the Qt event loop
+        while there are pending evaluations.
+        """
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def scheduleAsyncEvaluation(self, nodes: Optional[Iterable['Node']] = None) -> asyncio.Future:
+        """Start asynchronous evaluation without blocking the Qt event loop
+
+        :param nodes: `Nodes` which changed. All `Dirty` and `Invalid` `Nodes` of the `Scene` if ``None``
+        :return: ``asyncio`` task of the evaluation run
+        """
+        loop = self.getEventLoop()
+        task = loop.create_task(self.evaluateAsync(nodes))
+        if loop is self._loop:
+            self._pending_tasks.add(task)
+            task.add_done_callback(self._pending_tasks.discard)
+            if self._loop_timer is None:
+                self._loop_timer = QTimer()
+                self._loop_timer.setInterval(ASYNC_LOOP_PUMP_INTERVAL)
+                self._loop_timer.timeout.connect(self.onLoopTimer)
+            self._loop_timer.start()
+        return task
+
+    def runAsyncEvaluation(self, nodes: Optional[Iterable['Node']] = None) -> None:
+        """Run asynchronous evaluation and block until it is finished. Useful for headless evaluation without
+        a running event loop
+
+        :param nodes: `Nodes` which changed. All `Dirty` and `Invalid` `Nodes` of the `Scene` if ``None``
+        """
+        self.getEventLoop().run_until_complete(self.evaluateAsync(nodes))
+
+    def evaluateStream(self, nodes: Optional[Iterable['Node']] = None, queue_size: int = DEFAULT_QUEUE_SIZE) -> bool:
+        """Stream data through `nodes` and the `Nodes` they depend on using their
+        :func:`~nodeeditor.node_node.Node.process` generators. Blocks until the streams are exhausted.
+        See :class:`~nodeeditor.node_stream.StreamRunner`
+
+        :param nodes: sink `Nodes` consuming the streams. All `Nodes` of the `Scene` if ``None``
+        :param queue_size: maximum number of chunks waiting in the queue of each `Edge`
+        :return: ``True`` if the stream finished without errors
+        :rtype: ``bool``
+        """
+        return StreamRunner(self.scene, queue_size).run(nodes)
+
+    def onLoopTimer(self) -> None:
+        """Process ready callbacks and I/O events of the private ``asyncio`` event loop without blocking"""
+        if self._loop is None:
+            return
+        self._loop.call_soon(self._loop.stop)
+        self._loop.run_forever()
+        if not self._pending_tasks and self._loop_timer is not None:
+            self._loop_timer.stop()
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the streaming evaluation of the `Scene`, for data which does not fit into memory.
+
+In streaming mode `Nodes` implement :func:`~nodeeditor.node_node.Node.process`, a generator consuming one
+iterator of chunks per `Input` and yielding chunks of its output. Each `Node` runs in its own thread and every
+`Edge` is a bounded queue, so a fast producer blocks until its consumers catch up (backpressure). Memory use
+therefore depends on the queue sizes and the chunk size, not on the size of the data. Chunks going out of
+an `Output` with more `Edges` are passed to all of them by reference, as read-only views.
+"""
+import queue
+import threading
+from nodeeditor.utils_no_qt import dumpException, readOnlyView
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    from nodeeditor.node_scene import Scene
+    from nodeeditor.node_node import Node
+    from nodeeditor.node_edge import Edge
+
+
+DEBUG = False
+
+#: default maximum number of chunks waiting in the queue of each `Edge`
+DEFAULT_QUEUE_SIZE = 4
+
+# seconds between checks whether the stream was stopped while waiting on a queue
+POLL_INTERVAL = 0.05
+
+# marks the end of the stream in a queue
+_END = object()
+
+
+class NotStreamable(Exception):
+    """Raised when some `Node` of the stream does not implement :func:`~nodeeditor.node_node.Node.process`"""
+    pass
+
+
+class StreamStopped(Exception):
+    """Raised inside the `Node` threads when the stream was stopped because of an error elsewhere"""
+    pass
+
+
+class StreamRunner():
+    """Runs streaming evaluation of `Nodes` of the :class:`~nodeeditor.node_scene.Scene`"""
+
+    def __init__(self, scene: 'Scene', queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+        :param queue_size: maximum number of chunks waiting in the queue of each `Edge`
+        :type queue_size: ``int``
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        - **queue_size** - maximum number of chunks waiting in the queue of each `Edge`
+        - **errors** - exceptions raised by `Nodes` during the last run
+        """
+        self.scene = scene
+        self.queue_size = queue_size
+        self.errors: Dict['Node', Exception] = {}
+
+        self._stopped = threading.Event()
+        self._queues: Dict['Edge', queue.Queue] = {}
+        # queues whose consumer finished, chunks put there are dropped
+        self._closed: set = set()
+
+    def run(self, nodes: Optional[Iterable['Node']] = None) -> bool:
+        """Stream data through `nodes` and all `Nodes` they depend on. Blocks until all streams are exhausted.
+        `Nodes` which raised an exception are marked `Invalid` with the error in the tooltip, the other `Nodes`
+        of the stream are stopped
+
+        :param nodes: sink `Nodes` consuming the streams. All `Nodes` of the `Scene` if ``None``
+        :return: ``True`` if the stream finished without errors
+        :rtype: ``bool``
+        :raises NotStreamable: if some `Node` does not implement :func:`~nodeeditor.node_node.Node.process`
+        """
+        evaluator = self.scene.evaluator
+        if nodes is None:
+            order = evaluator.getTopologicalOrder()
+        else:
+            nodes = list(nodes)
+            order = evaluator.getTopologicalOrder(nodes + evaluator.getAncestorNodes(nodes))
+
+        members = set(order)
+        self.errors = {}
+        self._stopped.clear()
+        self._queues = {edge: queue.Queue(self.queue_size) for node in order for socket in node.inputs
+                        for edge in socket.edges if edge.getOtherSocket(socket).node in members}
+        self._closed = set()
+
+        generators = {}
+        for node in order:
+            generator = node.process(*[self.iterInput(socket) for socket in node.inputs])
+            if generator is None:
+                raise NotStreamable("%s does not implement process()" % node)
+            generators[node] = generator
+
+        threads = [threading.Thread(target=self.runNode, args=(node, generators[node]), daemon=True,
+                                    name="stream %s" % node.title) for node in order]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Qt objects can be touched only from the main thread
+        for node, error in self.errors.items():
+            node.markInvalid()
+            node.grNode.setToolTip(str(error))
+
+        self._queues = {}
+        self._closed = set()
+        return not self.errors
+
+    def stop(self) -> None:
+        """Stop all `Node` threads of the running stream"""
+        self._stopped.set()
+
+    def iterInput(self, socket) -> Optional[Iterator]:
+        """Return the iterator of chunks coming to input `socket` or ``None`` if it is not connected"""
+        for edge in socket.edges:
+            if edge in self._queues:
+                return self.iterQueue(self._queues[edge])
+        return None
+
+    def iterQueue(self, edge_queue: queue.Queue) -> Iterator:
+        """Yield chunks from `edge_queue` until the end of the stream"""
+        while True:
+            try:
+                chunk = edge_queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if self._stopped.is_set():
+                    raise StreamStopped()
+                continue
+            if chunk is _END:
+                return
+            yield chunk
+
+    def put(self, edge_queue: queue.Queue, chunk: Any) -> None:
+        """Put `chunk` to `edge_queue`, waiting while it is full"""
+        while edge_queue not in self._closed:
+            try:
+                edge_queue.put(chunk, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                if self._stopped.is_set():
+                    raise StreamStopped()
+
+    def getOutputQueues(self, node: 'Node') -> List[List[queue.Queue]]:
+        """Return queues of `Edges` going out of each `Output` of `node`"""
+        return [[self._queues[edge] for edge in socket.edges if edge in self._queues] for socket in node.outputs]
+
+    def runNode(self, node: 'Node', generator: Iterator) -> None:
+        """Thread target pulling chunks from the generator of `node` and pushing them to its `Edges`"""
+        output_queues = self.getOutputQueues(node)
+        input_queues = [self._queues[edge] for socket in node.inputs for edge in socket.edges if edge in self._queues]
+        all_output_queues = [edge_queue for queues in output_queues for edge_queue in queues]
+        try:
+            for item in generator:
+                chunks = item if len(output_queues) > 1 else [item]
+                for chunk, queues in zip(chunks, output_queues):
+                    # the same chunk goes to all edges, make sure none of the consumers modifies it
+                    chunk = readOnlyView(chunk) if len(queues) > 1 else chunk
+                    for edge_queue in queues:
+                        self.put(edge_queue, chunk)
+                if all_output_queues and self._closed.issuperset(all_output_queues):
+                    # nobody consumes the output anymore
+                    generator.close()
+                    break
+        except StreamStopped:
+            pass
+        except Exception as e:
+            if DEBUG:
+                dumpException(e)
+            self.errors[node] = e
+            self.stop()
+        finally:
+            # the node does not want more input, do not let the producers wait for it
+            self._closed.update(input_queues)
+            try:
+                for queues in output_queues:
+                    for edge_queue in queues:
+                        self.put(edge_queue, _END)
+            except StreamStopped:
+                pass
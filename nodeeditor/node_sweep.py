@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the parameter sweep runner, which evaluates one graph file over all combinations of input
+values in a pool of processes.
+
+Each worker process loads the graph headlessly once, compiles it (see :mod:`nodeeditor.node_graph_compiler`)
+and evaluates shards of the parameter grid. Shards are described only by their row range, so neither the grid
+nor the results are ever held in memory as a whole. Results are streamed to a CSV file or written directly by
+the workers to a memory mapped ``.npy`` file.
+
+Can be run from the command line::
+
+    python -m nodeeditor.node_sweep graph.json --set 1=1,2,3 --set 2=0:100 --out results.csv --jobs 4
+"""
+import os
+import csv
+import argparse
+import itertools
+import multiprocessing
+from collections import deque
+from nodeeditor.node_headless import loadScene, getSinkNodes
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from nodeeditor.node_node import Node
+
+
+DEBUG = False
+
+#: default number of parameter combinations evaluated by a worker at once
+DEFAULT_SHARD_SIZE = 4096
+
+# SweepWorker of the current worker process
+_worker: Optional['SweepWorker'] = None
+# exception raised when the SweepWorker of the current worker process was created
+_worker_error: Optional[Exception] = None
+
+
+class SweepWorker():
+    """Graph loaded in one process, evaluating shards of the parameter grid"""
+
+    def __init__(self, filename: str, parameter_ids: List[int], values: List[list], result_ids: List[int] = (),
+                 node_class_selector: Union[str, Callable, None] = None, output: Optional[str] = None) -> None:
+        """
+        :param filename: graph file to load
+        :param parameter_ids: ids of the `Nodes` whose values are swept
+        :param values: list of values for each swept `Node`
+        :param result_ids: ids of the `Nodes` whose values are collected. `Nodes` with
+            :attr:`~nodeeditor.node_node.Node.eval_sink` (or without children) if empty
+        :param node_class_selector: function or its ``"module:function"`` import path selecting `Node` classes
+            when loading the graph. See :func:`~nodeeditor.node_scene.Scene.setNodeClassSelector`
+        :param output: ``.npy`` file the worker writes the results to. Results are returned if ``None``
+        :raises ValueError: if some of the `Node` ids is not in the graph
+
+        :Instance Attributes:
+
+        - **scene** - the loaded :class:`~nodeeditor.node_scene.Scene`
+        - **arguments** - swept `Nodes`
+        - **results** - `Nodes` whose values are collected
+        - **values** - list of values for each swept `Node`
+        """
+        self.scene = loadScene(filename, node_class_selector)
+
+        nodes = {node.id: node for node in self.scene.nodes}
+        missing = [node_id for node_id in list(parameter_ids) + list(result_ids) if node_id not in nodes]
+        if missing:
+            raise ValueError("Nodes %s not found in %s" % (", ".join(str(node_id) for node_id in missing), filename))
+        self.arguments: List['Node'] = [nodes[node_id] for node_id in parameter_ids]
+        if result_ids:
+            self.results: List['Node'] = [nodes[node_id] for node_id in result_ids]
+        else:
+            self.results = getSinkNodes(self.scene)
+        self.values = values
+        self.output = output
+        self._output_array = None
+
+        self.compiled = self.scene.compiler.compile(self.results, self.arguments)
+
+    def getShape(self) -> Tuple[int, ...]:
+        """Return the shape of the parameter grid"""
+        return tuple(len(values) for values in self.values)
+
+    def getColumnNames(self) -> List[str]:
+        """Return names of the result columns. Swept values come first, then the results. `Nodes` with more
+        `Outputs` have one column per `Output`
+
+        :return: list of column names
+        """
+        names = ["%s#%d" % (node.title, node.id) for node in self.arguments]
+        for node in self.results:
+            if len(node.outputs) > 1:
+                names += ["%s#%d:%d" % (node.title, node.id, index) for index in range(len(node.outputs))]
+            else:
+                names.append("%s#%d" % (node.title, node.id))
+        return names
+
+    def evaluateColumns(self, start: int, stop: int) -> List['np.ndarray']:
+        """Evaluate combinations ``start`` to ``stop`` of the parameter grid (in ``itertools.product`` order)
+        as arrays. Requires NumPy
+
+        :return: list of columns, the swept values followed by the results
+        """
+        indices = np.unravel_index(np.arange(start, stop), self.getShape())
+        columns = [np.asarray(values)[index] for values, index in zip(self.values, indices)]
+        values = self.scene.compiler.evaluateBatch(self.results, dict(zip(self.arguments, columns)),
+                                                   chunk_size=stop - start)
+        for value in values:
+            columns += list(value) if isinstance(value, tuple) else [value]
+        return columns
+
+    def evaluateShard(self, start: int, stop: int) -> Union[int, List[tuple]]:
+        """Evaluate combinations ``start`` to ``stop`` of the parameter grid (in ``itertools.product`` order)
+
+        :return: list of rows or the number of rows written to the output file
+        :raises TypeError: if the results can't be stored in the output file without changing their kind,
+            i.e. floats in a file of integers
+        """
+        if np is not None:
+            columns = self.evaluateColumns(start, stop)
+            if self.output is not None:
+                if self._output_array is None:
+                    self._output_array = np.load(self.output, mmap_mode='r+')
+                np.copyto(self._output_array[start:stop], np.column_stack(columns), casting='same_kind')
+                self._output_array.flush()
+                return stop - start
+            return list(zip(*[column.tolist() for column in columns]))
+
+        rows = []
+        for row in itertools.islice(itertools.product(*self.values), start, stop):
+            result = list(row)
+            for value in self.compiled(*row):
+                result += list(value) if isinstance(value, tuple) else [value]
+            rows.append(tuple(result))
+        return rows
+
+
+def _initWorker(*args) -> None:
+    """Pool initializer loading the graph once per worker process. An exception raised by the initializer would
+    make the pool respawn the worker forever, so it is raised by the shards instead"""
+    global _worker, _worker_error
+    try:
+        _worker = SweepWorker(*args)
+    except Exception as e:
+        _worker_error = e
+
+
+def _evaluateShard(start: int, stop: int) -> Union[int, List[tuple]]:
+    if _worker_error is not None:
+        raise _worker_error
+    return _worker.evaluateShard(start, stop)
+
+
+def sweep(filename: str, parameters: Dict[int, Iterable], output: str, results: Iterable[int] = (),
+          jobs: Optional[int] = None, node_class_selector: Union[str, Callable, None] = None,
+          shard_size: int = DEFAULT_SHARD_SIZE) -> int:
+    """Evaluate graph `filename` for all combinations of `parameters` and write the results to `output`
+
+    :param filename: graph file
+    :param parameters: mapping of `Node` ids to the values swept for the `Node`
+    :param output: ``.csv`` or ``.npy`` file to write. Each row holds the swept values followed by the results.
+        The ``.npy`` file has the common dtype of the columns of the first shard
+    :param results: ids of the `Nodes` whose values are collected. By default `Nodes` with
+        :attr:`~nodeeditor.node_node.Node.eval_sink` or without children
+    :param jobs: number of worker processes. Number of CPUs if ``None``. With ``1`` the graph is evaluated
+        in the current process
+    :param node_class_selector: ``"module:function"`` import path of the function selecting `Node` classes
+        when loading the graph. With more jobs it must be importable by the worker processes
+    :param shard_size: number of combinations evaluated by a worker at once
+    :return: number of evaluated combinations
+    :raises ~nodeeditor.node_graph_compiler.NotCompilable: if the graph can't be compiled
+    :raises ValueError: if some of the `Node` ids is not in the graph
+    :raises TypeError: if later results of a ``.npy`` sweep don't fit the dtype of the first shard
+    """
+    parameter_ids = list(parameters)
+    values = [list(parameters[node_id]) for node_id in parameter_ids]
+    total = 1
+    for item in values:
+        total *= len(item)
+    to_npy = output.endswith(".npy")
+    if to_npy and np is None:
+        raise ImportError("NumPy is required to write .npy files")
+    jobs = jobs or os.cpu_count() or 1
+    worker_args = (os.path.abspath(filename), parameter_ids, values, list(results), node_class_selector,
+                   os.path.abspath(output) if to_npy else None)
+
+    # the graph is loaded here also with more jobs, so wrong ids, selectors or graphs fail before the pool starts
+    worker = SweepWorker(*worker_args)
+    column_names = worker.getColumnNames()
+    first = 0
+    if to_npy:
+        # the first shard is evaluated here, so the file keeps the dtype of the results. Workers write their shards
+        # directly, the file needs to exist before they start
+        first = min(shard_size, total)
+        block = np.column_stack(worker.evaluateColumns(0, first)) if first else None
+        dtype = block.dtype if block is not None else np.float64
+        array = np.lib.format.open_memmap(output, mode='w+', dtype=dtype, shape=(total, len(column_names)))
+        if block is not None:
+            array[:first] = block
+        array.flush()
+        del array, block
+    # shards are generated lazily, so nothing grows with the number of combinations
+    shards = ((start, min(start + shard_size, total)) for start in range(first, total, shard_size))
+
+    if jobs == 1:
+        submit = lambda shard: worker.evaluateShard(*shard)  # noqa: E731
+        pool = None
+    else:
+        del worker
+        pool = multiprocessing.get_context("spawn").Pool(jobs, initializer=_initWorker, initargs=worker_args)
+        submit = lambda shard: pool.apply_async(_evaluateShard, shard)  # noqa: E731
+
+    try:
+        if to_npy:
+            for _ in _runShards(shards, submit, jobs):
+                pass
+        else:
+            with open(output, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(column_names)
+                for rows in _runShards(shards, submit, jobs):
+                    writer.writerows(rows)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    if DEBUG:
+        print("sweep: evaluated", total, "combinations of", filename)
+    return total
+
+
+def _runShards(shards: Iterable[Tuple[int, int]], submit: Callable, jobs: int):
+    """Submit `shards` keeping at most ``2 * jobs`` of them in flight and yield their results in order"""
+    pending: deque = deque()
+    for shard in shards:
+        pending.append(submit(shard))
+        if len(pending) >= 2 * jobs:
+            yield _getResult(pending.popleft())
+    while pending:
+        yield _getResult(pending.popleft())
+
+
+def _getResult(result: Any) -> Any:
+    return result.get() if hasattr(result, 'get') else result
+
+
+def parseValues(text: str) -> list:
+    """Parse swept values from the command line. Either ``start:stop[:step]`` range of integers or comma
+    separated list of numbers or strings
+
+    :param text: text to parse
+    :return: list of values
+    """
+    if ':' in text:
+        return list(range(*[int(part) for part in text.split(':')]))
+    result = []
+    for item in text.split(','):
+        for convert in (int, float, str):
+            try:
+                result.append(convert(item))
+                break
+            except ValueError:
+                continue
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Evaluate a graph over all combinations of input values")
+    parser.add_argument("filename", help="graph file")
+    parser.add_argument("--set", action="append", default=[], metavar="NODE_ID=VALUES",
+                        help="values swept for the Node, i.e. 1=1,2,3 or 1=0:100:5")
+    parser.add_argument("--result", action="append", type=int, default=[], metavar="NODE_ID",
+                        help="Node whose value is collected, default are output Nodes")
+    parser.add_argument("--out", required=True, help=".csv or .npy file to write")
+    parser.add_argument("--jobs", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--node-class-selector", default=None, metavar="MODULE:FUNCTION",
+                        help="function selecting Node classes when loading the graph")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE)
+    args = parser.parse_args(argv)
+
+    parameters = {}
+    for item in args.set:
+        node_id, _, text = item.partition('=')
+        parameters[int(node_id)] = parseValues(text)
+
+    total = sweep(args.filename, parameters, args.out, args.result, args.jobs, args.node_class_selector,
+                  args.shard_size)
+    print("Evaluated %d combinations to %s" % (total, args.out))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import importlib
 import traceback
 from pprint import PrettyPrinter
 
@@ -14,5 +15,41 @@ def dumpException(e=None) -> None:
     traceback.print_exc()
 
 
+def importObject(path: str):
+    """
+    Import an object (i.e. class or function) described by ``"package.module:name"``
+
+    :param path: module path and the name of the object in the module separated by ``:``
+    :type path: str
+    :return: the imported object or the module if the name is missing
+    """
+    module_name, _, name = path.partition(':')
+    result = importlib.import_module(module_name)
+    for attribute in name.split('.') if name else []:
+        result = getattr(result, attribute)
+    return result
+
+
+def readOnlyView(value):
+    """
+    Return a read-only view of `value` sharing its memory, so values can be passed between `Nodes` by reference
+    without the risk of modifying them in place. NumPy arrays and buffers (``bytearray``, ``memoryview``) are
+    wrapped without copying, other values are returned as they are
+
+    :param value: value to wrap
+    :return: read-only view of `value`
+    """
+    if isinstance(value, (bytearray, memoryview)):
+        return memoryview(value).toreadonly()
+    if hasattr(value, 'flags') and hasattr(value, 'view'):
+        # NumPy array
+        if not value.flags.writeable:
+            return value
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    return value
+
+
 pp = PrettyPrinter(indent=4).pprint
 
@@ -0,0 +1,421 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_scene_evaluator` module."""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+from qtpy.QtTest import QTest
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge
+
+
+class SleepingNode(Node):
+    """Node simulating I/O-bound work"""
+    delay = 0.1
+
+    async def evalImplementationAsync(self):
+        self.started = time.perf_counter()
+        await asyncio.sleep(self.delay)
+        return 1
+
+
+class LimitedSleepingNode(SleepingNode):
+    eval_concurrency = 1
+
+
+class TimingOutNode(SleepingNode):
+    eval_timeout = 0.01
+
+
+class ValueNode(Node):
+    """Node passing its input value through ``transform``, counting its evaluations"""
+
+    def __init__(self, scene, value=0):
+        super().__init__(scene, inputs=[1], outputs=[1])
+        self.value = value
+        self.eval_count = 0
+
+    def transform(self, value):
+        return value
+
+    def eval(self, index=0):
+        self.eval_count += 1
+        parent = self.getInput(0)
+        if parent is not None:
+            self.value = self.transform(parent.value)
+        return super().eval(index)
+
+    def serializeValues(self):
+        return [self.value]
+
+
+class ClampNode(ValueNode):
+    def transform(self, value):
+        return max(value, 10)
+
+
+class RestorableValueNode(ValueNode):
+    """ValueNode whose values can be restored without evaluation"""
+
+    def deserializeValues(self, values):
+        self.value = values[0]
+        return True
+
+
+class PersistedValueNode(RestorableValueNode):
+    """RestorableValueNode which is `Dirty` when created, so it is restored from persisted results on load"""
+
+    def __init__(self, scene, value=0):
+        super().__init__(scene, value)
+        self.markDirty()
+
+
+class ContentNode(RestorableValueNode):
+    """RestorableValueNode whose content changes when it is deserialized, like a ``QLineEdit`` setting its text"""
+
+    def onDeserialized(self, data):
+        super().onDeserialized(data)
+        self.onContentChanged()
+
+
+class PollingNode(ValueNode):
+    """Node doing long work in steps, checking for cancellation between them"""
+    steps = 5
+    on_step = None
+
+    def eval(self, index=0):
+        for _ in range(self.steps):
+            time.sleep(0.01)
+            if self.on_step is not None:
+                self.on_step()
+            self.checkCancelled()
+        return super().eval(index)
+
+
+class TestSceneEvaluator(unittest.TestCase):
+    """Tests for `SceneEvaluator` class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+
+    def createNodes(self, node_class, count):
+        nodes = [node_class(self.scene, inputs=[1], outputs=[1]) for _ in range(count)]
+        for node in nodes:
+            node.markDirty()
+        return nodes
+
+    def test_topological_order(self):
+        first, second, third = self.createNodes(Node, 3)
+        Edge(self.scene, second.outputs[0], third.inputs[0])
+        Edge(self.scene, first.outputs[0], second.inputs[0])
+        order = self.scene.evaluator.getTopologicalOrder()
+        self.assertLess(order.index(first), order.index(second))
+        self.assertLess(order.index(second), order.index(third))
+
+    def test_async_nodes_overlap(self):
+        nodes = self.createNodes(SleepingNode, 4)
+        start = time.perf_counter()
+        self.scene.evaluator.runAsyncEvaluation()
+        self.assertLess(time.perf_counter() - start, 4 * SleepingNode.delay)
+        self.assertFalse(any(node.isDirty() for node in nodes))
+
+    def test_async_waits_for_inputs(self):
+        first, second = self.createNodes(SleepingNode, 2)
+        Edge(self.scene, first.outputs[0], second.inputs[0])
+        self.scene.evaluator.runAsyncEvaluation()
+        self.assertGreaterEqual(second.started - first.started, SleepingNode.delay * 0.9)
+
+    def test_concurrency_limit(self):
+        self.createNodes(LimitedSleepingNode, 3)
+        start = time.perf_counter()
+        self.scene.evaluator.runAsyncEvaluation()
+        self.assertGreaterEqual(time.perf_counter() - start, 3 * SleepingNode.delay * 0.9)
+
+    def test_concurrency_limit_changes(self):
+        nodes = self.createNodes(SleepingNode, 3)
+        evaluator = self.scene.evaluator
+        evaluator.runAsyncEvaluation()
+
+        evaluator.async_concurrency_limit = 1
+        for node in nodes:
+            node.markDirty()
+        start = time.perf_counter()
+        evaluator.runAsyncEvaluation()
+        self.assertGreaterEqual(time.perf_counter() - start, 3 * SleepingNode.delay * 0.9)
+
+        # the semaphore waited on the private loop can not be used by another loop
+        for node in nodes:
+            node.markDirty()
+        asyncio.run(evaluator.evaluateAsync())
+        self.assertFalse(any(node.isDirty() for node in nodes))
+
+    def test_timeout_marks_invalid(self):
+        node, = self.createNodes(TimingOutNode, 1)
+        self.scene.evaluator.runAsyncEvaluation()
+        self.assertTrue(node.isInvalid())
+
+    def test_early_cutoff(self):
+        source, clamp, sink = ValueNode(self.scene, 1), ClampNode(self.scene), ValueNode(self.scene)
+        Edge(self.scene, source.outputs[0], clamp.inputs[0])
+        Edge(self.scene, clamp.outputs[0], sink.inputs[0])
+        self.scene.evaluator.evaluate([source])
+        self.assertEqual((clamp.value, sink.eval_count), (10, 1))
+
+        source.value = 5
+        self.scene.evaluator.evaluate([source])
+        self.assertEqual((clamp.eval_count, sink.eval_count), (2, 1))
+        self.assertFalse(sink.isDirty())
+
+        source.value = 20
+        self.scene.evaluator.evaluate([source])
+        self.assertEqual((sink.value, sink.eval_count), (20, 2))
+
+    def test_lazy_evaluates_only_sinks(self):
+        self.scene.evaluator.lazy = True
+        source, used, dangling = ValueNode(self.scene, 1), ValueNode(self.scene), ValueNode(self.scene)
+        Edge(self.scene, source.outputs[0], used.inputs[0])
+        Edge(self.scene, source.outputs[0], dangling.inputs[0])
+        self.scene.evaluator.addSink(used)
+        self.scene.evaluator.evaluate([source])
+        self.assertEqual((used.value, used.eval_count), (1, 1))
+        self.assertEqual(dangling.eval_count, 0)
+        self.assertTrue(dangling.isDirty())
+
+        self.scene.evaluator.addSink(dangling)
+        self.scene.evaluator.evaluate()
+        self.assertEqual((dangling.value, dangling.eval_count, used.eval_count), (1, 1, 1))
+
+    def test_new_change_cancels_stale_run(self):
+        source, slow = ValueNode(self.scene, 1), PollingNode(self.scene)
+        Edge(self.scene, source.outputs[0], slow.inputs[0])
+        runs = []
+
+        def changeInput():
+            # input changes while the slow node is evaluated (i.e. from processEvents)
+            if not runs:
+                runs.append(True)
+                source.value = 2
+                self.scene.evaluator.evaluate([source])
+
+        slow.on_step = changeInput
+        self.scene.evaluator.evaluate([source])
+        self.assertEqual((slow.value, slow.eval_count), (2, 1))
+        self.assertFalse(slow.isDirty() or slow.isInvalid())
+
+    def test_node_time_budget(self):
+        node = PollingNode(self.scene)
+        node.eval_timeout = 0.02
+        self.scene.evaluator.evaluate([node])
+        self.assertTrue(node.isInvalid())
+        self.assertEqual(node.grNode.toolTip(), "Evaluation timed out after 0.02s")
+
+    def test_run_time_budget(self):
+        first, second = PollingNode(self.scene), PollingNode(self.scene)
+        Edge(self.scene, first.outputs[0], second.inputs[0])
+        first.steps = 1
+        self.scene.evaluator.run_timeout = 0.005
+        self.scene.evaluator.evaluate([first])
+        self.assertTrue(second.isDirty())
+        self.assertEqual(second.eval_count, 0)
+
+    def test_debounced_content_changes(self):
+        source, sink = ValueNode(self.scene), ValueNode(self.scene)
+        Edge(self.scene, source.outputs[0], sink.inputs[0])
+        self.scene.evaluator.debounce_interval = 20
+        for value in range(1, 11):
+            # i.e. typing a 10-digit number
+            source.value = value
+            source.onContentChanged()
+        self.assertEqual(sink.eval_count, 0)
+        QTest.qWait(100)
+        self.assertFalse(self.scene.evaluator.hasScheduledEvaluation())
+        self.assertEqual((sink.value, sink.eval_count, source.eval_count), (10, 1, 1))
+
+        self.scene.evaluator.debounce_interval = 0
+        source.value = 11
+        source.onContentChanged()
+        self.assertEqual((sink.value, sink.eval_count), (11, 2))
+
+    def test_restore_does_not_schedule(self):
+        self.scene.setNodeClassSelector(lambda data: ContentNode)
+        node = ContentNode(self.scene, 1)
+        self.scene.history.storeInitialHistoryStamp()
+        node.setPos(100, 0)
+        self.scene.history.storeHistory("Move")
+        self.scene.history.undo()
+        self.assertFalse(self.scene.evaluator.hasScheduledEvaluation())
+        self.assertTrue(node.isDirty())
+
+        scene = Scene()
+        scene.setNodeClassSelector(lambda data: ContentNode)
+        scene.deserialize(self.scene.serialize())
+        self.assertFalse(scene.evaluator.hasScheduledEvaluation())
+
+        # the scheduled node was brought up to date before the debounced run
+        node.onContentChanged()
+        node.markDirty(False)
+        self.scene.evaluator.evaluateScheduled()
+        self.assertEqual(node.eval_count, 0)
+
+    def test_frozen_node_pins_values(self):
+        self.scene.evaluator.use_result_cache = False
+        source, frozen, sink = [RestorableValueNode(self.scene, value) for value in (1, 0, 0)]
+        Edge(self.scene, source.outputs[0], frozen.inputs[0])
+        Edge(self.scene, frozen.outputs[0], sink.inputs[0])
+        self.scene.evaluator.evaluate([source])
+        frozen.setFrozen()
+
+        source.value = 2
+        source.onInputChanged(None)
+        self.assertFalse(frozen.isDirty() or sink.isDirty())
+        self.scene.evaluator.evaluate([source])
+        self.assertEqual((frozen.value, frozen.eval_count, sink.eval_count), (1, 1, 1))
+
+        # the pinned values survive serialization, the upstream cone is not needed
+        scene = Scene()
+        scene.setNodeClassSelector(lambda data: RestorableValueNode)
+        scene.deserialize(self.scene.serialize())
+        scene.evaluator.use_result_cache = False
+        scene.evaluator.lazy = True
+        new_source, new_frozen, new_sink = scene.nodes
+        new_source.markDirty()
+        new_sink.markDirty()
+        scene.evaluator.addSink(new_sink)
+        scene.evaluator.evaluate()
+        self.assertTrue(new_frozen.isFrozen())
+        self.assertEqual((new_sink.value, new_source.eval_count), (1, 0))
+
+        frozen.setFrozen(False)
+        self.scene.evaluator.evaluate([frozen])
+        self.assertEqual((frozen.value, sink.value), (2, 2))
+
+    def test_identical_nodes_share_result(self):
+        self.scene.evaluator.use_result_cache = False
+        source = ValueNode(self.scene, 3)
+        first, second = RestorableValueNode(self.scene), RestorableValueNode(self.scene)
+        unshareable = RestorableValueNode(self.scene)
+        unshareable.eval_shareable = False
+        for node in (first, second, unshareable):
+            Edge(self.scene, source.outputs[0], node.inputs[0])
+        self.scene.evaluator.evaluate([source])
+        self.assertEqual((first.value, first.eval_count), (3, 1))
+        self.assertEqual((second.value, second.eval_count), (3, 0))
+        self.assertEqual(unshareable.eval_count, 1)
+
+        self.assertEqual(self.scene.evaluator.getIdenticalNodeGroups(), [[first, second]])
+        self.scene.evaluator.highlight_identical = True
+        self.scene.evaluator.updateIdenticalHighlight()
+        self.assertIsNotNone(first.grNode._identical_pen)
+        self.assertIsNone(source.grNode._identical_pen)
+
+    def test_sources_without_parameters_are_not_shared(self):
+        self.scene.evaluator.use_result_cache = False
+        first, second = RestorableValueNode(self.scene, 3), RestorableValueNode(self.scene, 4)
+        self.scene.evaluator.evaluate([first, second])
+        self.assertEqual((first.value, second.value), (3, 4))
+        self.assertEqual(second.eval_count, 1)
+        self.assertEqual(self.scene.evaluator.getIdenticalNodeGroups(), [])
+
+
+class TestPersistedResults(unittest.TestCase):
+    """Tests for saving and loading evaluated values next to the graph file."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "graph.json")
+        self.scene = self.createScene()
+        self.source, self.sink = PersistedValueNode(self.scene, 3), PersistedValueNode(self.scene)
+        Edge(self.scene, self.source.outputs[0], self.sink.inputs[0])
+        self.scene.evaluator.evaluate()
+        self.scene.saveToFile(self.filename)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def createScene(self):
+        scene = Scene()
+        scene.setNodeClassSelector(lambda data: PersistedValueNode)
+        scene.evaluator.persist_results = True
+        scene.evaluator.use_result_cache = False
+        return scene
+
+    def test_round_trip(self):
+        self.assertTrue(os.path.exists(self.scene.evaluator.getResultsFilename(self.filename)))
+        scene = self.createScene()
+        scene.loadFromFile(self.filename)
+        source, sink = scene.nodes
+        self.assertEqual((source.value, sink.value), (3, 3))
+        self.assertFalse(any(node.isDirty() or node.isInvalid() for node in scene.nodes))
+        scene.evaluator.evaluate()
+        self.assertEqual((source.eval_count, sink.eval_count), (0, 0))
+
+    def test_restored_values_stop_propagation(self):
+        for use_result_cache in (False, True):
+            scene = self.createScene()
+            scene.evaluator.use_result_cache = use_result_cache
+            if use_result_cache:
+                self.scene.evaluator.use_result_cache = True
+                self.scene.evaluator.evaluate([self.source, self.sink])
+                scene.deserialize(self.scene.serialize())
+                scene.evaluator.evaluate()
+            else:
+                scene.loadFromFile(self.filename)
+            source, sink = scene.nodes
+            self.assertEqual((source.eval_count, sink.eval_count, sink.value), (0, 0, 3))
+
+            # unchanged values of the source do not propagate
+            scene.evaluator.evaluate([source])
+            self.assertEqual(sink.eval_count, 0)
+            self.assertFalse(sink.isDirty())
+
+    def test_restored_nodes_are_unscheduled(self):
+        scene = self.createScene()
+        scene.deserialize(self.scene.serialize())
+        # i.e. content widgets changing their text while being deserialized
+        for node in scene.nodes:
+            node.onContentChanged()
+        self.assertTrue(scene.evaluator.hasScheduledEvaluation())
+        self.assertEqual(scene.evaluator.loadResults(self.filename), 2)
+        self.assertFalse(scene.evaluator.hasScheduledEvaluation())
+
+    def test_stale_structure_is_not_restored(self):
+        scene = self.createScene()
+        scene.deserialize(self.scene.serialize())
+        source, sink = scene.nodes
+        # the sink was computed from an input which is not connected anymore
+        scene.edges[0].remove()
+        self.assertEqual(scene.evaluator.loadResults(self.filename), 1)
+        self.assertEqual(source.value, 3)
+        self.assertTrue(sink.isDirty())
+
+    def test_missing_or_corrupt_results(self):
+        results_filename = self.scene.evaluator.getResultsFilename(self.filename)
+        for content in (None, b"{not json", b"[1, 2]", b'{"results": [1, {"id": 0}]}'):
+            if content is None:
+                os.remove(results_filename)
+            else:
+                with open(results_filename, "wb") as file:
+                    file.write(content)
+            scene = self.createScene()
+            scene.loadFromFile(self.filename)
+            self.assertEqual(len(scene.nodes), 2)
+            self.assertTrue(all(node.isDirty() for node in scene.nodes))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_result_cache` module."""
+
+import os
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_content_widget import QDMNodeContentWidget
+from nodeeditor.node_scene_evaluator import SceneEvaluator
+from nodeeditor.node_result_cache import ResultCache, hashValue, getValueSize
+
+
+class ParamContent(QDMNodeContentWidget):
+    """Content with one serialized parameter"""
+
+    def initUI(self):
+        self.param = 1
+
+    def serialize(self):
+        res = super().serialize()
+        res['param'] = self.param
+        return res
+
+    def deserialize(self, data, hashmap={}, restore_id=True):
+        self.param = data['param']
+        return super().deserialize(data, hashmap, restore_id)
+
+
+class ParamNode(Node):
+    """Node adding its parameter to the value of its input, counting its evaluations"""
+    NodeContent_class = ParamContent
+
+    def __init__(self, scene, param=1):
+        super().__init__(scene, inputs=[1], outputs=[1])
+        self.content.param = param
+        self.value = None
+        self.eval_count = 0
+        self.markDirty()
+
+    def eval(self, index=0):
+        self.eval_count += 1
+        parent = self.getInput(0)
+        self.value = self.content.param + (parent.value if parent is not None else 0)
+        return super().eval(index)
+
+    def serializeValues(self):
+        return [self.value]
+
+    def deserializeValues(self, values):
+        self.value = values[0]
+        return True
+
+
+class TestResultCache(unittest.TestCase):
+    """Tests for `ResultCache` class."""
+
+    def test_hash_is_stable_and_content_based(self):
+        self.assertEqual(hashValue([[6], {'value': 1}]), hashValue([[6], {'value': 1}]))
+        self.assertNotEqual(hashValue([6]), hashValue([7]))
+        self.assertNotEqual(hashValue(["1"]), hashValue([1]))
+        self.assertNotEqual(hashValue([1, 2]), hashValue([[1, 2]]))
+
+    def test_lru_eviction_by_size(self):
+        value_size = getValueSize([1.0])
+        cache = ResultCache(max_size=value_size * 2)
+        cache.put('a', [1.0])
+        cache.put('b', [2.0])
+        cache.get('a')
+        cache.put('c', [3.0])
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertLessEqual(cache.size, cache.max_size)
+
+    def test_too_big_value_is_not_cached(self):
+        cache = ResultCache(max_size=1)
+        cache.put('a', [1, 2, 3])
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.size, 0)
+
+
+class TestSceneResultCache(unittest.TestCase):
+    """Tests for results surviving re-creation of `Nodes` through the `SceneEvaluator` result cache."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.shared_cache = SceneEvaluator.result_cache
+        SceneEvaluator.result_cache = self.cache = ResultCache()
+        self.scene = self.createScene()
+        self.source, self.sink = ParamNode(self.scene, 2), ParamNode(self.scene, 3)
+        Edge(self.scene, self.source.outputs[0], self.sink.inputs[0])
+        self.scene.evaluator.evaluate()
+        self.assertEqual((self.sink.value, self.cache.hits), (5, 0))
+
+    def tearDown(self):
+        SceneEvaluator.result_cache = self.shared_cache
+
+    def createScene(self):
+        scene = Scene()
+        scene.setNodeClassSelector(lambda data: ParamNode)
+        return scene
+
+    def test_recreated_subgraph(self):
+        source, sink = ParamNode(self.scene, 2), ParamNode(self.scene, 3)
+        Edge(self.scene, source.outputs[0], sink.inputs[0])
+        self.scene.evaluator.evaluate()
+        self.assertEqual((source.eval_count, sink.eval_count, sink.value), (0, 0, 5))
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_undo_delete(self):
+        history_stamp = self.scene.history.createHistoryStamp("Before delete")
+        self.sink.remove()
+        # what undo does with the history stamp
+        self.scene.history.restoreHistoryStamp(history_stamp)
+        sink = self.scene.nodes[-1]
+        self.assertIsNot(sink, self.sink)
+        self.scene.evaluator.evaluate()
+        self.assertEqual((sink.eval_count, sink.value), (0, 5))
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_reopen_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.json")
+            self.scene.saveToFile(filename)
+            scene = self.createScene()
+            scene.loadFromFile(filename)
+        scene.evaluator.evaluate()
+        source, sink = scene.nodes
+        self.assertEqual((source.eval_count, sink.eval_count, sink.value), (0, 0, 5))
+        self.assertEqual(self.cache.hits, 2)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_graph_compiler` module."""
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_graph_compiler import NotCompilable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class AddNode(Node):
+    compile_expression = "{0} + {1}"
+    array_safe = True
+
+
+class ClampNode(Node):
+    """Node whose operation does not work on arrays"""
+    def getCompiledOperation(self):
+        return lambda value: [max(value, 0)]
+
+
+class OffsetNode(Node):
+    """Node whose operation depends on state which is not part of its content"""
+    offset = 0
+
+    def getCompiledOperation(self):
+        return lambda value: [value + self.offset]
+
+
+class DivModNode(Node):
+    def getCompiledOperation(self):
+        return lambda a, b: [a // b, a % b]
+
+
+class TestGraphCompiler(unittest.TestCase):
+    """Tests for `GraphCompiler` class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+        self.first = Node(self.scene, inputs=[], outputs=[1])
+        self.second = Node(self.scene, inputs=[], outputs=[1])
+        self.add = AddNode(self.scene, inputs=[1, 1], outputs=[1])
+        self.divmod = DivModNode(self.scene, inputs=[1, 1], outputs=[1, 1])
+        Edge(self.scene, self.first.outputs[0], self.add.inputs[0])
+        Edge(self.scene, self.second.outputs[0], self.add.inputs[1])
+        Edge(self.scene, self.add.outputs[0], self.divmod.inputs[0])
+        Edge(self.scene, self.second.outputs[0], self.divmod.inputs[1])
+
+    def test_compiled_function(self):
+        compiled = self.scene.compiler.compile([self.add, self.divmod], [self.first, self.second])
+        self.assertEqual(compiled(5, 3), [8, (2, 2)])
+        self.assertEqual(compiled(10, 4), [14, (3, 2)])
+
+    def test_cached_until_structure_changes(self):
+        compiled = self.scene.compiler.compile([self.divmod], [self.first, self.second])
+        self.assertIs(self.scene.compiler.compile([self.divmod], [self.first, self.second]).code, compiled.code)
+
+        self.scene.edges[-1].remove()
+        Edge(self.scene, self.first.outputs[0], self.divmod.inputs[1])
+        recompiled = self.scene.compiler.compile([self.divmod], [self.first, self.second])
+        self.assertIsNot(recompiled.code, compiled.code)
+        self.assertEqual(recompiled(5, 3), [(1, 3)])
+
+    def test_identical_subgraphs_keep_their_nodes(self):
+        graphs = []
+        for offset in (1, 10):
+            source = Node(self.scene, inputs=[], outputs=[1])
+            node = OffsetNode(self.scene, inputs=[1], outputs=[1])
+            node.offset = offset
+            Edge(self.scene, source.outputs[0], node.inputs[0])
+            graphs.append((source, node, self.scene.compiler.compile([node], [source])))
+
+        (first_source, first_node, first), (second_source, second_node, second) = graphs
+        self.assertIs(second.code, first.code)
+        self.assertEqual((second.arguments, second.results), ([second_source], [second_node]))
+        self.assertEqual((first(1), second(1)), ([2], [11]))
+
+    def test_not_compilable(self):
+        with self.assertRaises(NotCompilable):
+            self.scene.compiler.compile([self.add])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_batch_evaluation_in_chunks(self):
+        clamp = ClampNode(self.scene, inputs=[1], outputs=[1])
+        Edge(self.scene, self.add.outputs[0], clamp.inputs[0])
+        first, second = np.arange(-5, 5), np.full(10, 2)
+        chunks = list(self.scene.compiler.iterBatches([clamp, self.divmod], {self.first: first, self.second: second},
+                                                      chunk_size=4))
+        self.assertEqual([len(chunk[0]) for chunk in chunks], [4, 4, 2])
+
+        clamped, (quotient, remainder) = self.scene.compiler.evaluateBatch(
+            [clamp, self.divmod], {self.first: first, self.second: second}, chunk_size=4)
+        self.assertEqual(clamped.tolist(), [max(value + 2, 0) for value in range(-5, 5)])
+        self.assertEqual(quotient.tolist(), [(value + 2) // 2 for value in range(-5, 5)])
+        self.assertEqual(remainder.tolist(), [(value + 2) % 2 for value in range(-5, 5)])
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_sweep` module."""
+
+import os
+import csv
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_sweep import sweep, parseValues
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MulNode(Node):
+    compile_expression = "{0} * {1}"
+    array_safe = True
+    eval_sink = True
+
+
+def getNodeClass(data):
+    return MulNode if data['title'] == "Mul" else Node
+
+
+class TestSweep(unittest.TestCase):
+    """Tests for `sweep` function."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "graph.json")
+        scene = Scene()
+        self.first = Node(scene, inputs=[], outputs=[1])
+        self.second = Node(scene, inputs=[], outputs=[1])
+        mul = MulNode(scene, "Mul", inputs=[1, 1], outputs=[1])
+        Edge(scene, self.first.outputs[0], mul.inputs[0])
+        Edge(scene, self.second.outputs[0], mul.inputs[1])
+        scene.saveToFile(self.filename)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parse_values(self):
+        self.assertEqual(parseValues("0:6:2"), [0, 2, 4])
+        self.assertEqual(parseValues("1,2.5,a"), [1, 2.5, "a"])
+
+    def test_sweep_to_csv(self):
+        output = os.path.join(self.directory.name, "results.csv")
+        count = sweep(self.filename, {self.first.id: range(10), self.second.id: [1, 2, 3]}, output, jobs=1,
+                      node_class_selector=getNodeClass, shard_size=7)
+        self.assertEqual(count, 30)
+        with open(output) as file:
+            rows = list(csv.reader(file))[1:]
+        self.assertEqual([[int(value) for value in row] for row in rows],
+                         [[a, b, a * b] for a in range(10) for b in [1, 2, 3]])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_sweep_in_processes_to_npy(self):
+        output = os.path.join(self.directory.name, "results.npy")
+        sweep(self.filename, {self.first.id: range(100), self.second.id: [1, 2]}, output, jobs=2,
+              node_class_selector="tests.test_004_sweep:getNodeClass", shard_size=16)
+        results = np.load(output)
+        self.assertEqual(results.shape, (200, 3))
+        self.assertEqual(results.dtype.kind, 'i')
+        self.assertTrue((results[:, 0] * results[:, 1] == results[:, 2]).all())
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_sweep_to_npy_keeps_dtype(self):
+        output = os.path.join(self.directory.name, "results.npy")
+        sweep(self.filename, {self.first.id: range(10), self.second.id: [0.5, 2]}, output, jobs=1,
+              node_class_selector=getNodeClass, shard_size=3)
+        results = np.load(output)
+        self.assertEqual(results.dtype, np.float64)
+        self.assertEqual(results[:, 2].tolist(), [a * b for a in range(10) for b in [0.5, 2]])
+
+    def test_unknown_node_id_fails_in_processes(self):
+        output = os.path.join(self.directory.name, "results.csv")
+        with self.assertRaises(ValueError):
+            sweep(self.filename, {self.first.id: range(10), 71313200: [0]}, output, jobs=2,
+                  node_class_selector="tests.test_004_sweep:getNodeClass")
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.utils_no_qt` module."""
+
+
+import unittest
+
+from nodeeditor.utils_no_qt import readOnlyView, importObject
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestUtilsNoQt(unittest.TestCase):
+    """Tests for helper functions without Qt dependency."""
+
+    def test_import_object(self):
+        self.assertIs(importObject("nodeeditor.utils_no_qt:readOnlyView"), readOnlyView)
+
+    def test_read_only_buffer_view(self):
+        buffer = bytearray(b"abc")
+        view = readOnlyView(buffer)
+        self.assertTrue(view.readonly)
+        buffer[0] = ord("x")
+        self.assertEqual(bytes(view), b"xbc")
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_read_only_array_view(self):
+        array = np.arange(3)
+        view = readOnlyView(array)
+        self.assertTrue(np.shares_memory(view, array))
+        self.assertIs(readOnlyView(view), view)
+        with self.assertRaises(ValueError):
+            view[0] = 1
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_stream` module."""
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_stream import NotStreamable
+
+
+class SourceNode(Node):
+    def __init__(self, scene, count):
+        super().__init__(scene, inputs=[], outputs=[1])
+        self.count = count
+        self.produced = 0
+
+    def process(self):
+        for i in range(self.count):
+            self.produced += 1
+            yield bytearray([i % 256])
+
+
+class SinkNode(Node):
+    def __init__(self, scene, limit=None):
+        super().__init__(scene, inputs=[1], outputs=[])
+        self.limit = limit
+        self.chunks = []
+
+    def process(self, chunks):
+        for chunk in chunks:
+            self.chunks.append(chunk)
+            if len(self.chunks) == self.limit:
+                return
+        yield from ()
+
+
+class FailingNode(Node):
+    def __init__(self, scene):
+        super().__init__(scene, inputs=[1], outputs=[1])
+
+    def process(self, chunks):
+        for chunk in chunks:
+            raise ValueError("Broken chunk")
+            yield chunk
+
+
+class TestStreamRunner(unittest.TestCase):
+    """Tests for `StreamRunner` class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+
+    def test_fan_out_shares_read_only_chunks(self):
+        source = SourceNode(self.scene, 100)
+        first, second = SinkNode(self.scene), SinkNode(self.scene)
+        Edge(self.scene, source.outputs[0], first.inputs[0])
+        Edge(self.scene, source.outputs[0], second.inputs[0])
+        self.assertTrue(self.scene.evaluator.evaluateStream(queue_size=2))
+        self.assertEqual(len(first.chunks), 100)
+        self.assertTrue(all(a is b and a.readonly for a, b in zip(first.chunks, second.chunks)))
+
+    def test_backpressure_stops_producer(self):
+        source = SourceNode(self.scene, 10000)
+        sink = SinkNode(self.scene, limit=5)
+        Edge(self.scene, source.outputs[0], sink.inputs[0])
+        self.assertTrue(self.scene.evaluator.evaluateStream([sink], queue_size=2))
+        self.assertLess(source.produced, 100)
+
+    def test_error_marks_node_invalid(self):
+        source = SourceNode(self.scene, 10000)
+        failing = FailingNode(self.scene)
+        sink = SinkNode(self.scene)
+        Edge(self.scene, source.outputs[0], failing.inputs[0])
+        Edge(self.scene, failing.outputs[0], sink.inputs[0])
+        self.assertFalse(self.scene.evaluator.evaluateStream([sink]))
+        self.assertTrue(failing.isInvalid())
+        self.assertEqual(failing.grNode.toolTip(), "Broken chunk")
+
+    def test_not_streamable(self):
+        Node(self.scene, inputs=[], outputs=[1])
+        with self.assertRaises(NotStreamable):
+            self.scene.evaluator.evaluateStream()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_profiler` module."""
+
+import os
+import sys
+import time
+import tempfile
+import unittest
+import orjson as json
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_profiler import estimateValueSize
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge
+
+
+class WorkNode(Node):
+    """Node working for ``delay`` seconds and producing ``size`` bytes"""
+
+    def __init__(self, scene, delay, size):
+        super().__init__(scene, inputs=[1], outputs=[1])
+        self.delay = delay
+        self.size = size
+        self.result = None
+
+    def eval(self, index=0):
+        time.sleep(self.delay)
+        self.result = bytes(self.size)
+        return super().eval(index)
+
+    def serializeValues(self):
+        return self.result
+
+    def deserializeValues(self, values):
+        self.result = values
+        return True
+
+
+class TestEvaluationProfiler(unittest.TestCase):
+    """Tests for `EvaluationProfiler` class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+        self.profiler = self.scene.evaluator.profiler
+        self.profiler.enabled = True
+        self.fast, self.slow = WorkNode(self.scene, 0.0, 10), WorkNode(self.scene, 0.02, 1000)
+        Edge(self.scene, self.fast.outputs[0], self.slow.inputs[0])
+
+    def test_records_node_stats(self):
+        self.scene.evaluator.use_result_cache = False
+        self.scene.evaluator.evaluate([self.fast])
+        stats = self.profiler.getLastRun().getNodeStats()
+        self.assertEqual(stats[self.slow.id]['calls'], 1)
+        self.assertGreaterEqual(stats[self.slow.id]['wall_time'], 0.02)
+        self.assertGreater(stats[self.slow.id]['output_size'], stats[self.fast.id]['output_size'])
+        self.assertEqual(self.profiler.getHeat(self.slow), 1.0)
+        self.assertLess(self.profiler.getHeat(self.fast), 0.5)
+
+    def test_cache_hits(self):
+        self.scene.evaluator.evaluate([self.fast])
+        self.scene.evaluator.evaluate([self.fast])
+        self.assertEqual(len(self.profiler.runs), 2)
+        stats = self.profiler.getLastRun().getNodeStats()
+        self.assertEqual((stats[self.fast.id]['calls'], stats[self.fast.id]['cache_hits']), (0, 1))
+
+    def test_disabled(self):
+        self.profiler.enabled = False
+        self.scene.evaluator.evaluate([self.fast])
+        self.assertIsNone(self.profiler.getLastRun())
+
+    def test_export(self):
+        self.scene.evaluator.evaluate([self.fast])
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "profile.json")
+            self.profiler.saveJson(filename)
+            with open(filename, "rb") as file:
+                data = json.loads(file.read())
+            self.assertEqual([item['id'] for item in data['runs'][0]['nodes']], [self.fast.id, self.slow.id])
+
+            filename = os.path.join(directory, "profile.trace.json")
+            self.profiler.saveChromeTrace(filename)
+            with open(filename, "rb") as file:
+                events = json.loads(file.read())['traceEvents']
+            names = [event['name'] for event in events if event.get('cat') in ('eval', 'cache')]
+            self.assertEqual(names, ["Undefined Node #%d" % node.id for node in (self.fast, self.slow)])
+            self.assertTrue(all(event['ph'] in ('M', 'X') for event in events))
+
+    def test_estimate_value_size(self):
+        self.assertEqual(estimateValueSize(None), 0)
+        self.assertEqual(estimateValueSize(bytes(100)), 100)
+        self.assertEqual(estimateValueSize([bytes(100), memoryview(bytes(50))]), 150)
+        nested = [[bytes(1000)]]
+        self.assertLess(estimateValueSize(nested), 1000)
+        try:
+            import numpy as np
+        except ImportError:
+            return
+        self.assertEqual(estimateValueSize([np.zeros(1000)]), 8000)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_headless` module."""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+import orjson as json
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_headless import run, parseValues, UnknownNode
+
+
+class ConstantNode(Node):
+    """Node whose value is set from the command line"""
+    value = 1
+
+    def setValue(self, value):
+        self.value = int(value)
+        return True
+
+    def serializeValues(self):
+        return [self.value]
+
+
+class DoubleNode(Node):
+    eval_sink = True
+
+    def eval(self, index=0):
+        self.value = self.getInput(0).value * 2
+        return super().eval(index)
+
+    def serializeValues(self):
+        return [self.value]
+
+
+def getNodeClass(data):
+    return DoubleNode if data['title'] == "Double" else ConstantNode
+
+
+class TestHeadless(unittest.TestCase):
+    """Tests for headless evaluation."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "graph.json")
+        scene = Scene()
+        constant = ConstantNode(scene, "Constant", inputs=[], outputs=[1])
+        double = DoubleNode(scene, "Double", inputs=[1], outputs=[1])
+        Edge(scene, constant.outputs[0], double.inputs[0])
+        scene.saveToFile(self.filename)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def runGraph(self, values):
+        output = os.path.join(self.directory.name, "results.json")
+        stream = io.StringIO()
+        ok = run([self.filename], values, output, getNodeClass, stream=stream)
+        with open(output, "rb") as file:
+            return ok, json.loads(file.read()), stream.getvalue()
+
+    def test_run(self):
+        ok, data, log = self.runGraph(parseValues(["Constant=21"]))
+        self.assertTrue(ok)
+        results = data['graphs'][0]['results']
+        self.assertEqual([(item['title'], item['values']) for item in results], [("Double", [42])])
+        self.assertIn("load", log)
+        self.assertIn("evaluate", log)
+        self.assertIn("write", log)
+
+    def test_unknown_node(self):
+        with self.assertRaises(UnknownNode):
+            self.runGraph({"Missing": "1"})
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_graphics_edge` module."""
+
+import os
+import math
+import sys
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+from qtpy.QtGui import QImage, QPainter, QPainterPath
+from qtpy.QtCore import QPointF, QRectF, QSizeF
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge, EDGE_TYPE_BEZIER, EDGE_TYPE_DIRECT
+
+
+class TestGraphicsEdge(unittest.TestCase):
+    """Tests for `QDMGraphicsEdge` class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+        self.source = Node(self.scene, inputs=[], outputs=[1])
+        self.target = Node(self.scene, inputs=[1], outputs=[])
+        self.target.setPos(300, 100)
+        self.edge = Edge(self.scene, self.source.outputs[0], self.target.inputs[0], edge_type=EDGE_TYPE_BEZIER)
+        self.grEdge = self.edge.grEdge
+
+        self.calculations = 0
+        calcPath = self.grEdge.calcPath
+
+        def countedCalcPath():
+            self.calculations += 1
+            return calcPath()
+        self.grEdge.calcPath = countedCalcPath
+
+    def render(self):
+        image = QImage(400, 400, QImage.Format.Format_ARGB32_Premultiplied)
+        painter = QPainter(image)
+        self.scene.grScene.render(painter)
+        painter.end()
+
+    def test_path_is_cached(self):
+        self.render()
+        self.grEdge.boundingRect()
+        self.grEdge.shape()
+        self.render()
+        self.assertLessEqual(self.calculations, 1)
+
+    def test_path_recalculated_on_change(self):
+        path = self.grEdge.path()
+        self.edge.updatePositions()
+        self.assertIs(self.grEdge.path(), path)
+        self.assertEqual(self.calculations, 1)
+
+        self.target.setPos(300, 200)
+        self.assertNotEqual(self.grEdge.path().boundingRect(), path.boundingRect())
+        self.assertEqual(self.calculations, 2)
+
+        self.edge.edge_type = EDGE_TYPE_DIRECT
+        self.assertEqual(self.grEdge.path().elementCount(), 2)
+        self.assertEqual(self.calculations, 3)
+
+    def test_shape_is_stroked(self):
+        path = self.grEdge.path()
+        middle = path.pointAtPercent(0.5)
+        angle = math.radians(path.angleAtPercent(0.5))
+        normal = QPointF(math.sin(angle), math.cos(angle))
+        self.assertTrue(self.grEdge.contains(middle))
+        self.assertTrue(self.grEdge.contains(middle + normal * 4))
+        self.assertFalse(self.grEdge.contains(middle + normal * 20))
+        self.assertFalse(self.grEdge.contains(self.grEdge.boundingRect().topLeft() - QPointF(10, 10)))
+        # the area enclosed by the curve and its chord is not a part of the edge
+        chord = path.pointAtPercent(0.0) * 0.75 + path.pointAtPercent(1.0) * 0.25
+        self.assertFalse(self.grEdge.shape().contains(chord))
+
+        self.grEdge.shape()
+        self.grEdge.boundingRect()
+        self.assertEqual(self.calculations, 1)
+
+
+class TestEdgeBatch(unittest.TestCase):
+    """Tests for `EdgeBatch` class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+        self.source = Node(self.scene, inputs=[], outputs=[1])
+        self.target = Node(self.scene, inputs=[1, 1], outputs=[])
+        self.target.setPos(300, 100)
+        self.edges = [Edge(self.scene, self.source.outputs[0], socket, edge_type=EDGE_TYPE_BEZIER)
+                      for socket in self.target.inputs]
+        self.grScene = self.scene.grScene
+        self.grScene.setEdgeBatching(True)
+        self.batch = self.grScene.edge_batch
+
+    def test_idle_edges_are_batched(self):
+        self.assertTrue(all(edge.grEdge.scene() is None for edge in self.edges))
+        self.assertEqual(len(self.batch.layers), 1)
+        layer = list(self.batch.layers.values())[0]
+        middle = self.edges[0].grEdge.path().pointAtPercent(0.5)
+        # both edges start at the same socket, so the point can be on either of them
+        self.assertIn(layer.getEdgeAt(middle), [edge.grEdge for edge in self.edges])
+        self.assertIsNone(layer.getEdgeAt(middle + QPointF(0, 200)))
+        self.assertIn(self.edges[0].grEdge, self.grScene.getItemsInRect(QRectF(middle, middle).adjusted(-1, -1, 1, 1)))
+
+        self.grScene.setEdgeBatching(False)
+        self.assertTrue(all(edge.grEdge.scene() is self.grScene for edge in self.edges))
+        self.assertEqual(layer.scene(), None)
+
+    def test_selected_edges_are_promoted(self):
+        grEdge = self.edges[0].grEdge
+        grEdge.setSelected(True)
+        self.assertIs(grEdge.scene(), self.grScene)
+        self.assertEqual(self.grScene.selectedItems(), [grEdge])
+
+        grEdge.setSelected(False)
+        self.batch.flush()
+        self.assertIsNone(grEdge.scene())
+
+    def test_moved_and_removed_edges(self):
+        grEdge = self.edges[0].grEdge
+        layer = list(self.batch.layers.values())[0]
+        self.target.setPos(1500, 1500)
+        self.batch.flush()
+        middle = QPainterPath()
+        middle.addRect(QRectF(grEdge.path().pointAtPercent(0.5), QSizeF(1, 1)))
+        self.assertIn(grEdge, layer.getEdges(middle))
+        self.assertTrue(layer.boundingRect().contains(grEdge.boundingRect()))
+
+        self.edges[0].remove()
+        self.batch.flush()
+        self.assertNotIn(grEdge, layer.getEdges(middle))
+        self.assertEqual(sum(len(edges) for edges in layer.tiles.values()), 1)
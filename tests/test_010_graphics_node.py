@@ -0,0 +1,389 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `nodeeditor.node_graphics_node` module."""
+
+import os
+import sys
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication, QGraphicsItem
+from qtpy.QtGui import QImage, QPainter, QPainterPathStroker
+from qtpy.QtCore import Qt, QPointF, QRectF
+from qtpy.QtTest import QTest
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge, EDGE_TYPE_BEZIER
+from nodeeditor.node_graphics_node import QDMGraphicsNode, NodeChrome
+from nodeeditor.node_icon_graphics_node import QDMIconGraphicsNode
+from nodeeditor.node_graphics_view import QDMGraphicsView
+from nodeeditor.node_painted_content import QDMPaintedContent
+
+
+class TestLevelOfDetail(unittest.TestCase):
+    """Tests for rendering of zoomed out `Nodes`, `Sockets` and `Edges`."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+        self.source = Node(self.scene, inputs=[], outputs=[1])
+        self.target = Node(self.scene, inputs=[1], outputs=[])
+        self.target.setPos(300, 100)
+        self.edge = Edge(self.scene, self.source.outputs[0], self.target.inputs[0], edge_type=EDGE_TYPE_BEZIER)
+
+    def render(self, scale):
+        source = self.scene.grScene.itemsBoundingRect()
+        image = QImage(int(source.width() * scale), int(source.height() * scale),
+                       QImage.Format.Format_ARGB32_Premultiplied)
+        painter = QPainter(image)
+        self.scene.grScene.render(painter, QRectF(image.rect()), source)
+        painter.end()
+
+    def countPathCalls(self, grEdge):
+        calls = []
+        path = grEdge.path
+
+        def countedPath():
+            calls.append(1)
+            return path()
+        grEdge.path = countedPath
+        return calls
+
+    def test_details_follow_most_zoomed_in_view(self):
+        grContent = self.source.grNode.grContent
+        self.scene.grScene.setContentSnapshots(False)
+        views = [QDMGraphicsView(self.scene.grScene) for _ in range(2)]
+        near, far = views
+        for view in views:
+            view.show()
+        far.scale(0.2, 0.2)
+        far.onViewportChanged()
+        self.assertTrue(grContent.isVisible())
+
+        # painting does not change the scene
+        self.render(0.2)
+        self.assertTrue(grContent.isVisible())
+
+        near.scale(0.2, 0.2)
+        near.onViewportChanged()
+        self.assertFalse(grContent.isVisible())
+        self.assertFalse(Node(self.scene).grNode.grContent.isVisible())
+        self.render(1.0)
+        self.assertFalse(grContent.isVisible())
+
+        near.resetTransform()
+        near.onViewportChanged()
+        self.assertTrue(grContent.isVisible())
+        for view in views:
+            view.close()
+            view.setScene(None)
+
+    def test_title_without_child_item(self):
+        grNode = self.source.grNode
+        self.assertEqual([item for item in grNode.childItems() if item is not grNode.grContent
+                          and item not in [socket.grSocket for socket in self.source.outputs]], [])
+        width = grNode._title_text.size().width()
+        self.source.title = "A much longer title"
+        self.assertEqual(grNode.title, "A much longer title")
+        self.assertGreater(grNode._title_text.size().width(), width)
+        self.render(1.0)
+
+    def test_edges_straight_when_zoomed_out(self):
+        grEdge = self.edge.grEdge
+        grEdge.boundingRect()
+        calls = self.countPathCalls(grEdge)
+        self.render(0.2)
+        self.assertEqual(calls, [])
+        self.render(1.0)
+        self.assertNotEqual(calls, [])
+
+    def test_batched_edges_straight_when_zoomed_out(self):
+        self.scene.grScene.setEdgeBatching(True)
+        layer = list(self.scene.grScene.edge_batch.layers.values())[0]
+        tile = list(layer.tiles)[0]
+        self.render(0.2)
+        self.assertIn(tile, layer._tile_lines)
+        self.assertNotIn(tile, layer._tile_paths)
+        self.assertEqual(layer.getTilePath(tile, True).elementCount(), 2)
+
+
+class TestNodeChrome(unittest.TestCase):
+    """Tests for `NodeChrome` class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def test_shared_by_geometry(self):
+        scene = Scene()
+        first, second = Node(scene), Node(scene)
+        chrome = first.grNode.getChrome()
+        self.assertIs(second.grNode.getChrome(), chrome)
+        self.assertEqual(chrome.path_outline.boundingRect(),
+                         QRectF(-1, -1, first.grNode.width + 2, first.grNode.height + 2))
+
+        second.grNode.height += 40
+        self.assertIsNot(second.grNode.getChrome(), chrome)
+        self.assertIs(NodeChrome.get(first.grNode.width, first.grNode.height, first.grNode.title_height,
+                                     first.grNode.edge_roundness), chrome)
+
+    def test_cache_is_bounded(self):
+        chrome = NodeChrome.get(100, 100, 24, 10)
+        for height in range(NodeChrome.max_cached * 2):
+            NodeChrome.get(100, 200 + height, 24, 10)
+            self.assertIs(NodeChrome.get(100, 100, 24, 10), chrome)
+        self.assertEqual(len(NodeChrome._cache), NodeChrome.max_cached)
+        self.assertNotIn((NodeChrome, 100, 200, 24, 10), NodeChrome._cache)
+
+
+class IconNode(Node):
+    GraphicsNode_class = QDMIconGraphicsNode
+
+
+class TestIconGraphicsNode(unittest.TestCase):
+    """Tests for `QDMIconGraphicsNode` class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def test_shares_node_painting(self):
+        scene = Scene()
+        node = IconNode(scene, inputs=[1], outputs=[1])
+        grNode = node.grNode
+        self.assertIsInstance(grNode, QDMGraphicsNode)
+        self.assertEqual(grNode.title_height, 0)
+        self.assertTrue(grNode.boundingRect().contains(grNode.getFrozenBadgeRect()))
+
+        node.setFrozen(True)
+        grNode.hovered = True
+        source = grNode.sceneBoundingRect()
+        for scale in (1.0, 0.4, 0.2):
+            image = QImage(int(source.width() * scale), int(source.height() * scale),
+                           QImage.Format.Format_ARGB32_Premultiplied)
+            painter = QPainter(image)
+            scene.grScene.render(painter, QRectF(image.rect()), source)
+            painter.end()
+
+
+class TestNodeCaching(unittest.TestCase):
+    """Tests for cached painting of `Nodes`."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+        self.node = Node(self.scene, inputs=[1], outputs=[1])
+        self.view = QDMGraphicsView(self.scene.grScene)
+        self.view.resize(400, 400)
+        self.view.show()
+        self.view.centerOn(self.node.grNode)
+        self.app.processEvents()
+
+        self.paints = 0
+        paint = self.node.grNode.paint
+
+        def countedPaint(*args):
+            self.paints += 1
+            return paint(*args)
+        self.node.grNode.paint = countedPaint
+        self.view.viewport().repaint()
+
+    def tearDown(self):
+        self.view.close()
+        self.view.setScene(None)
+
+    def repaint(self):
+        self.paints = 0
+        self.view.viewport().repaint()
+        return self.paints
+
+    def test_cache_invalidation(self):
+        grNode = self.node.grNode
+        self.assertEqual(grNode.cacheMode(), QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.assertEqual(grNode.grContent.cacheMode(), QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        scrollbar = self.view.horizontalScrollBar()
+        scrollbar.setValue(scrollbar.value() + 5)
+        self.assertEqual(self.repaint(), 0)
+
+        self.node.markDirty()
+        self.assertEqual(self.repaint(), 1)
+        self.node.markDirty()
+        self.assertEqual(self.repaint(), 0)
+        self.node.markInvalid()
+        self.assertEqual(self.repaint(), 1)
+        self.node.title = "Renamed"
+        self.assertEqual(self.repaint(), 1)
+        grNode.setSelected(True)
+        self.assertEqual(self.repaint(), 1)
+
+    def test_outline_inside_cache(self):
+        grNode = self.node.grNode
+        stroker = QPainterPathStroker(grNode._pen_hovered)
+        outline = stroker.createStroke(grNode.getChrome().path_outline).boundingRect()
+        self.assertTrue(grNode.boundingRect().contains(outline))
+        # the margins are painted only, they are not a part of the node for the mouse
+        self.assertFalse(grNode.contains(QPointF(-1, 10)))
+        self.assertTrue(grNode.contains(QPointF(1, 10)))
+
+    def test_scene_switch(self):
+        self.scene.grScene.setNodeCaching(False)
+        self.assertEqual(self.node.grNode.cacheMode(), QGraphicsItem.CacheMode.NoCache)
+        self.assertEqual(Node(self.scene).grNode.cacheMode(), QGraphicsItem.CacheMode.NoCache)
+        self.assertEqual(self.repaint(), 1)
+
+
+class TestContentSnapshot(unittest.TestCase):
+    """Tests for `ContentSnapshot` class."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+        self.node = Node(self.scene, inputs=[1], outputs=[1])
+        self.far = Node(self.scene, inputs=[1], outputs=[1])
+        self.far.setPos(5000, 5000)
+        self.snapshot = self.node.grNode.content_snapshot
+        self.view = QDMGraphicsView(self.scene.grScene)
+        self.view.resize(400, 400)
+        self.view.show()
+        self.view.centerOn(self.node.grNode)
+        self.app.processEvents()
+        self.view.viewport().repaint()
+
+    def tearDown(self):
+        self.view.close()
+        self.view.setScene(None)
+
+    def test_idle_content_is_snapshot(self):
+        grContent = self.node.grNode.grContent
+        self.assertFalse(grContent.isVisible())
+        self.assertIsNotNone(self.snapshot.pixmap)
+        self.assertEqual(self.snapshot.pixmap.size(), self.node.content.size() * self.snapshot.pixmap.devicePixelRatio())
+
+        self.node.grNode.hoverEnterEvent(None)
+        self.assertTrue(grContent.isVisible())
+        grContent.setFocus()
+        self.node.grNode.hoverLeaveEvent(None)
+        self.assertTrue(grContent.isVisible())
+        grContent.clearFocus()
+        self.assertFalse(grContent.isVisible())
+
+        self.node.onContentChanged()
+        self.assertIsNone(self.snapshot.pixmap)
+        self.view.viewport().repaint()
+        self.assertIsNotNone(self.snapshot.pixmap)
+
+    def test_off_screen_content_is_culled(self):
+        far = self.far.grNode.content_snapshot
+        self.assertTrue(far.culled)
+        self.assertFalse(self.snapshot.culled)
+        # rendering the whole scene does not change the culling
+        image = QImage(200, 200, QImage.Format.Format_ARGB32_Premultiplied)
+        painter = QPainter(image)
+        self.scene.grScene.render(painter)
+        painter.end()
+        self.assertTrue(far.culled)
+        self.assertIsNone(far.pixmap)
+        # scrolling only schedules the culling pass, the content scrolled into view is not kept
+        self.view.centerOn(self.far.grNode)
+        self.assertTrue(self.scene.grScene.hasScheduledContentCulling())
+        self.view.viewport().repaint()
+        self.assertTrue(far.culled)
+        self.assertIsNone(far.pixmap)
+        self.scene.grScene.updateContentCulling()
+        self.assertFalse(self.scene.grScene.hasScheduledContentCulling())
+        self.assertFalse(far.culled)
+        self.assertTrue(self.snapshot.culled)
+        self.assertIsNone(self.snapshot.pixmap)
+
+        self.scene.grScene.setContentSnapshots(False)
+        self.assertTrue(self.node.grNode.grContent.isVisible())
+        self.assertFalse(self.snapshot.culled)
+
+
+class NameContent(QDMPaintedContent):
+    editable = True
+
+    def initUI(self):
+        self.setText("name")
+
+    def serialize(self):
+        return {'value': self.text()}
+
+    def deserialize(self, data, hashmap={}, restore_id=True):
+        self.setText(data['value'])
+        return True
+
+
+class NameNode(Node):
+    NodeContent_class = NameContent
+
+
+class TestPaintedContent(unittest.TestCase):
+    """Tests for `Nodes` with `QDMPaintedContent`."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+        self.node = NameNode(self.scene, inputs=[1], outputs=[1])
+        self.content = self.node.content
+        self.view = QDMGraphicsView(self.scene.grScene)
+        self.view.resize(400, 400)
+        self.view.show()
+        self.view.centerOn(self.node.grNode)
+        self.app.processEvents()
+
+    def tearDown(self):
+        self.view.close()
+        self.view.setScene(None)
+
+    def doubleClick(self, pos):
+        point = self.view.mapFromScene(self.node.grNode.mapToScene(pos))
+        QTest.mouseDClick(self.view.viewport(), Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier, point)
+
+    def test_painted_without_widget(self):
+        grNode = self.node.grNode
+        self.assertIsNone(grNode.grContent)
+        self.assertEqual([item for item in grNode.childItems()
+                          if item not in [socket.grSocket for socket in self.node.inputs + self.node.outputs]], [])
+        self.assertTrue(grNode.boundingRect().contains(self.content.geometry()))
+        self.view.viewport().repaint()
+
+        data = self.node.serialize()
+        self.assertEqual(data['content'], {'value': 'name'})
+        data['content']['value'] = "renamed"
+        copy = NameNode(self.scene)
+        copy.deserialize(data, {}, restore_id=False)
+        self.assertEqual(copy.content.text(), "renamed")
+
+    def test_editor_on_double_click(self):
+        self.doubleClick(self.content.geometry().center())
+        self.assertTrue(self.content.isEditing())
+        editor = self.content.editor_proxy.widget()
+        self.assertEqual(editor.text(), "name")
+        self.assertTrue(self.view.editingFlag)
+
+        editor.setText("edited")
+        editor.editingFinished.emit()
+        self.assertFalse(self.content.isEditing())
+        self.assertFalse(self.view.editingFlag)
+        self.assertEqual(self.content.text(), "edited")
+        self.assertTrue(self.node.isDirty())
+
+        # outside of the content the double click goes to the node
+        self.doubleClick(QPointF(5, 5))
+        self.assertFalse(self.content.isEditing())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the evaluation of the calculator example `Nodes`."""
+
+import os
+import sys
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtWidgets import QApplication
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_edge import Edge
+from examples.example_calculator.calc_conf import get_class_from_data
+from examples.example_calculator.nodes.input import CalcNode_Input
+from examples.example_calculator.nodes.operations import CalcNode_Add
+
+
+class PollingAdd(CalcNode_Add):
+    """Add doing long work in steps, checking for cancellation between them"""
+    on_step = None
+
+    def evalOperation(self, input1, input2):
+        for _ in range(5):
+            time.sleep(0.01)
+            if self.on_step is not None:
+                self.on_step()
+            self.checkCancelled()
+        return super().evalOperation(input1, input2)
+
+
+class TestCalculator(unittest.TestCase):
+    """Tests for `CalcNode` evaluation."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.scene = Scene()
+        self.scene.setNodeClassSelector(get_class_from_data)
+        self.scene.evaluator.use_result_cache = False
+        first, second = CalcNode_Input(self.scene), CalcNode_Input(self.scene)
+        self.add = PollingAdd(self.scene)
+        Edge(self.scene, first.outputs[0], self.add.inputs[0])
+        Edge(self.scene, second.outputs[0], self.add.inputs[1])
+
+    def test_evaluate(self):
+        self.scene.evaluator.evaluate()
+        self.assertEqual(self.add.getOutputValue(), 2)
+        self.assertFalse(self.add.isDirty() or self.add.isInvalid())
+
+    def test_cancelled_node_stays_dirty(self):
+        self.add.on_step = self.scene.evaluator.cancel
+        self.scene.evaluator.evaluate()
+        self.assertTrue(self.add.isDirty())
+        self.assertFalse(self.add.isInvalid())
+
+        self.add.on_step = None
+        self.scene.evaluator.evaluate()
+        self.assertEqual(self.add.getOutputValue(), 2)
+
+    def test_timed_out_node(self):
+        self.add.eval_timeout = 0.02
+        self.scene.evaluator.evaluate()
+        self.assertTrue(self.add.isInvalid())
+        self.assertEqual(self.add.grNode.toolTip(), "Evaluation timed out after 0.02s")
+
+
+    def test_array_input(self):
+        try:
+            from examples.example_calculator.nodes.arrays import CalcNode_ArrayInput
+        except ImportError:
+            self.skipTest("numpy is not available")
+        node = CalcNode_ArrayInput(self.scene)
+        self.assertEqual(node.getOutputValue().tolist(), list(range(10)))
+
+        node.content.edit.setText("1,2.5")
+        self.scene.evaluator.evaluate([node])
+        self.assertEqual(node.getOutputValue().tolist(), [1.0, 2.5])
+        self.assertFalse(node.getOutputValue().flags.writeable)
+
+        node.content.edit.setText("1:x")
+        self.scene.evaluator.evaluate([node])
+        self.assertTrue(node.isInvalid())
+        self.assertIn("start:stop", node.grNode.toolTip())